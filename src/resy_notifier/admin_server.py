@@ -0,0 +1,144 @@
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+from src.resy_notifier.model.watch import GroupWatch, Watch
+from src.resy_notifier.watch_engine import WatchEngine
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class AdminRequestHandler(BaseHTTPRequestHandler):
+    """
+    Controls a running WatchEngine.
+
+    GET    /watches                    list every watch with its schedule, last poll and state
+    POST   /watches                    add a watch; the body is one `--watches` file entry
+    DELETE /watches/<key>              remove a watch
+    POST   /watches/<key>/pause        stop polling a watch, keeping its state
+    POST   /watches/<key>/resume       poll a paused watch again
+    POST   /watches/<key>/weight       reprioritize; the body is {"weight": 3}
+
+    Keys are the URL-encoded `Watch.key`, as listed by GET /watches.
+    """
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def engine(self) -> WatchEngine:
+        return self.server.engine
+
+    def log_message(self, format, *args):
+        logger.debug(f"Admin {self.address_string()} {format % args}")
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/watches":
+            self._reply(200, {"watches": self._describe_all()})
+        else:
+            self._reply(404, {"error": "Not found."})
+
+    def do_POST(self):
+        parts = self._parts()
+        try:
+            if parts == ["watches"]:
+                watch = self.server.build_watch(self._body())
+                self.engine.add_watch(watch)
+                logger.info(f"Admin added {watch}")
+                self._reply(201, self._describe(watch))
+            elif len(parts) == 3 and parts[0] == "watches" and parts[2] in ("pause", "resume"):
+                action = self.engine.pause if parts[2] == "pause" else self.engine.resume
+                watch = action(parts[1])
+                logger.info(f"Admin {parts[2]}d {watch.key}")
+                self._reply(200, self._describe(watch))
+            elif len(parts) == 3 and parts[0] == "watches" and parts[2] == "weight":
+                self.engine.set_weight(parts[1], float(self._body().get("weight", 0)))
+                logger.info(f"Admin reweighted {parts[1]}")
+                self._reply(200, self._describe(self.engine.watches[parts[1]]))
+            else:
+                self._reply(404, {"error": "Not found."})
+        except KeyError as e:
+            self._reply(404 if len(parts) == 3 else 400, {"error": f"Unknown watch or missing field: {e}"})
+        except (TypeError, ValueError) as e:
+            self._reply(400, {"error": str(e)})
+
+    def do_DELETE(self):
+        parts = self._parts()
+        if len(parts) != 2 or parts[0] != "watches":
+            self._reply(404, {"error": "Not found."})
+            return
+        try:
+            watch = self.engine.remove_watch(parts[1])
+        except KeyError:
+            self._reply(404, {"error": f"Unknown watch {parts[1]}"})
+            return
+        logger.info(f"Admin removed {watch.key}")
+        self._reply(200, self._describe(watch))
+
+    def _parts(self) -> list[str]:
+        return [unquote(part) for part in urlparse(self.path).path.strip("/").split("/")]
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("The request body must be a JSON object.")
+        return body
+
+    def _describe_all(self) -> list[dict]:
+        watches = self.engine.list_watches()
+        intervals = self.engine.effective_intervals()
+        return [self._describe(watch, intervals) for watch in watches]
+
+    def _describe(self, watch: Watch, intervals: dict = None) -> dict:
+        if intervals is None:
+            intervals = self.engine.effective_intervals()
+        description = {
+            "key": watch.key,
+            "venue_name": watch.venue_name,
+            "party_size": watch.party_size,
+            "start_date": watch.start_date,
+            "end_date": watch.end_date,
+            "request_interval": watch.request_interval,
+            "weight": watch.weight,
+            "paused": watch.paused,
+            "effective_interval": intervals.get(watch.key),
+            "last_poll_at": watch.last_poll_at,
+            "last_latency_ms": watch.last_latency_ms,
+            "polls": watch.polls,
+            "errors": watch.errors,
+        }
+        if isinstance(watch, GroupWatch):
+            description["venues"] = [venue_name for _, venue_name in watch.members]
+            description["satisfied"] = watch.satisfied
+        else:
+            description["venue_id"] = watch.venue_id
+            description["available_dates"] = [
+                day.date for day in watch.last_snapshot or [] if day.inventory.reservation == "available"
+            ]
+        return description
+
+    def _reply(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class AdminServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server exposing admin controls for a WatchEngine. It has no authentication, so bind it
+    to localhost only.
+    """
+    daemon_threads = True
+
+    def __init__(self, engine: WatchEngine, build_watch, host: str = "127.0.0.1", port: int = 8086):
+        """
+        Args:
+            engine (WatchEngine): The engine to control.
+            build_watch (callable): Turns a `--watches` file entry (dict) into a Watch.
+        """
+        self.engine = engine
+        self.build_watch = build_watch
+        super().__init__((host, port), AdminRequestHandler)
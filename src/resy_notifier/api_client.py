@@ -1,44 +1,168 @@
-from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+import json
+import re
+import time
 import httpx
-from src.resy_notifier.model.availability import parse_response
+from src.resy_notifier.chunking import resolve_date_range, split_date_range
+from src.resy_notifier.model.availability import AvailabilityResult, parse_response
+from src.resy_notifier.model.slot import parse_slots
 from src.resy_notifier.email_helper import EmailHelper
+from src.resy_notifier.profiling import timed
+from src.resy_notifier.rate_limiter import SharedRateLimiter
+
+# Booking endpoints live under different API versions than the calendar
+FIND_PATH = "/4/find"
+DETAILS_PATH = "/3/details"
+BOOK_PATH = "/3/book"
+USER_PATH = "/2/user"
+VENUE_PATH = "/3/venue"
+
+# Default of ResyAPIClient(rate_limiter=...): build the limiter from RESY_SHARED_RPM
+_FROM_ENV = object()
 
 class ResyAPIClient:
-    def __init__(self, api_key=None, base_url=None):
+    def __init__(self, api_key=None, base_url=None, timeout=10.0, email_helper=None, transport=None,
+                 max_connections=32, rate_limiter=_FROM_ENV):
         self.api_key = api_key
         self.base_url = base_url
-        self.email_helper = EmailHelper()
+        self.email_helper = email_helper or EmailHelper()
+        # Optional StageTimer; when set, fetch/parse/notify durations are recorded on it
+        self.stage_timer = None
+        # Optional ChunkSizer; when set, long date ranges are fetched as concurrent chunks
+        self.chunk_sizer = None
+        self.chunk_workers = 4
         if not self.api_key:
             raise ValueError("API key is required.")
         if not self.base_url:
             raise ValueError("Base URL is required.")
 
+        # Host-wide limit per API key shared with other processes, from RESY_SHARED_RPM unless given;
+        # None or False turns it off, e.g. for clients that never reach the real API
+        self._owns_rate_limiter = rate_limiter is _FROM_ENV
+        if rate_limiter is _FROM_ENV:
+            rate_limiter = SharedRateLimiter.from_env(self.api_key)
+        self.rate_limiter = rate_limiter or None
+
+        # Root of the API without the version suffix, e.g. https://api.resy.com
+        self.api_root = re.sub(r"/\d+/?$", "", self.base_url.rstrip("/"))
+
+        # One pooled client so repeated polls and booking calls reuse warm connections
+        self.http = httpx.Client(
+            headers={
+                "Authorization": f'ResyAPI api_key="{self.api_key}"',
+                "User-Agent": "Mozilla/5.0",
+                "Accept": "application/json",
+            },
+            timeout=timeout,
+            transport=transport,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def close(self):
+        """Close the pooled HTTP connections."""
+        self.http.close()
+        if self.rate_limiter and self._owns_rate_limiter:
+            self.rate_limiter.close()
+
     def get_availability(self, venue_id, venue_name="", party_size=2, start_date=None, end_date=None):
         """
-        Fetch availability for a venue within a date range.
+        Fetch availability for a venue within a date range and notify if any is found.
 
         Args:
             venue_id (int): The ID of the venue.
+            venue_name (str): The name of the venue, used in notifications.
+            party_size (int): Number of guests.
             start_date (str): Start date in 'YYYY-MM-DD' format. Defaults to today.
             end_date (str): End date in 'YYYY-MM-DD' format. Defaults to a week from today.
 
         Returns:
-            dict: Parsed JSON response from the API.
-        """
-        # Compute default dates if not provided
-        if not start_date:
-            start_date = datetime.now().strftime("%Y-%m-%d")
-        if not end_date:
-            end_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-
-        # Define headers
-        headers = {
-            "Authorization": f'ResyAPI api_key="{self.api_key}"',
-            "User-Agent": "Mozilla/5.0",
-            "Accept": "application/json",
-        }
+            list<Availability>: The parsed availability.
+        """
+        availability = self.fetch_availability(venue_id, party_size, start_date, end_date)
+        print(availability)
+        with timed(self.stage_timer, "notify"):
+            self.email_helper.check_and_notify_availability(venue_name, availability, party_size=party_size)
+        return availability
+
+    def fetch_availability(self, venue_id, party_size=2, start_date=None, end_date=None):
+        """
+        Fetch availability for a venue within a date range without notifying anyone.
+
+        Args:
+            venue_id (int): The ID of the venue.
+            party_size (int): Number of guests.
+            start_date (str): Start date in 'YYYY-MM-DD' format. Defaults to today.
+            end_date (str): End date in 'YYYY-MM-DD' format. Defaults to a week from today.
+
+        Returns:
+            list<Availability>: The parsed availability.
+        """
+        if self.chunk_sizer is not None:
+            chunks = self.iter_availability_chunks(venue_id, party_size, start_date, end_date)
+            return [day for chunk in chunks for day in chunk]
+        return self._fetch_range(venue_id, party_size, start_date, end_date)
+
+    def iter_availability_chunks(self, venue_id, party_size=2, start_date=None, end_date=None):
+        """
+        Fetch a date range as consecutive chunks on `chunk_workers` threads and yield them nearest first.
+
+        Chunks are requested in date order, so near-term dates are usually back first, and each chunk is
+        yielded as soon as it and every earlier chunk have arrived. The chunk size comes from `chunk_sizer`,
+        which is updated with every chunk's latency. Without a `chunk_sizer` the range is one chunk.
+
+        Yields:
+            list<Availability>: The parsed availability of one chunk.
+
+        Raises:
+            ValueError: As for `fetch_availability`; chunks not yet requested are cancelled.
+        """
+        start_date, end_date = resolve_date_range(start_date, end_date)
+        if self.chunk_sizer is None:
+            yield self._fetch_range(venue_id, party_size, start_date, end_date)
+            return
+        chunks = split_date_range(start_date, end_date, self.chunk_sizer.days)
+        if len(chunks) == 1:
+            yield self._fetch_chunk(venue_id, party_size, *chunks[0])
+            return
 
-        # Send request
+        with ThreadPoolExecutor(max_workers=min(self.chunk_workers, len(chunks))) as executor:
+            futures = [
+                executor.submit(self._fetch_chunk, venue_id, party_size, chunk_start, chunk_end)
+                for chunk_start, chunk_end in chunks
+            ]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _fetch_chunk(self, venue_id, party_size, start_date, end_date):
+        started = time.perf_counter()
+        availability = self._fetch_range(venue_id, party_size, start_date, end_date)
+        days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days + 1
+        self.chunk_sizer.observe(days, time.perf_counter() - started)
+        return availability
+
+    def _fetch_range(self, venue_id, party_size, start_date, end_date):
+        url, params = self._calendar_request(venue_id, party_size, start_date, end_date)
+        return self._request("GET", url, f"Venue ID {venue_id} not found.", parse_response, params=params)
+
+    def fetch_calendar(self, venue_id, party_size=2, start_date=None, end_date=None):
+        """
+        Fetch the raw calendar JSON for a venue, leaving `parse_response` to the caller.
+
+        Takes the same arguments as `fetch_availability`.
+
+        Returns:
+            dict: The decoded response body.
+        """
+        url, params = self._calendar_request(venue_id, party_size, start_date, end_date)
+        return self._request("GET", url, f"Venue ID {venue_id} not found.", params=params)
+
+    def _calendar_request(self, venue_id, party_size, start_date, end_date):
+        start_date, end_date = resolve_date_range(start_date, end_date)
         url = f"{self.base_url}/venue/calendar"
         params = {
             "venue_id": venue_id,
@@ -46,22 +170,196 @@ class ResyAPIClient:
             "start_date": start_date,
             "end_date": end_date,
         }
+        return url, params
+
+    def get_availability_many(self, requests, max_workers=16):
+        """
+        Fetch availability for a batch of queries concurrently on a bounded thread pool.
+
+        All workers share this client's connection pool. A failing query does not affect the others;
+        its error is reported on its result instead.
 
+        Args:
+            requests (iterable<tuple>): (venue_id, party_size, start_date, end_date) per query.
+            max_workers (int): Maximum number of requests in flight at once.
+
+        Returns:
+            list<AvailabilityResult>: One result per query, in input order.
+        """
+        results = list(self.iter_availability_many(requests, max_workers))
+        results.sort(key=lambda result: result.index)
+        return results
+
+    def iter_availability_many(self, requests, max_workers=16):
+        """
+        Like `get_availability_many`, but yield each result as soon as its request completes.
+
+        Each result's `index` is the position of its query in `requests`. Queries are submitted in order and
+        at most `max_workers` are pending at a time, so a caller that stops iterating early (e.g. once it has
+        found what it needs) never sends the queries that were still waiting.
+
+        Yields:
+            AvailabilityResult: Results in completion order.
+        """
+        pending_requests = iter(enumerate(requests))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            in_flight = set()
+            try:
+                while True:
+                    # Top up the window before waiting on it
+                    for index, request in pending_requests:
+                        in_flight.add(executor.submit(self._fetch_result, index, tuple(request)))
+                        if len(in_flight) >= max_workers:
+                            break
+                    if not in_flight:
+                        return
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in sorted(done, key=lambda future: future.result().index):
+                        yield future.result()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    def _fetch_result(self, index, request):
         try:
-            response = httpx.get(url, headers=headers, params=params)
-            response.raise_for_status()
+            return AvailabilityResult(index, request, self.fetch_availability(*request))
+        except ValueError as e:
+            return AvailabilityResult(index, request, error=e)
+
+    def find_slots(self, venue_id, day, party_size=2):
+        """
+        Fetch the bookable slots for a venue on one day.
+
+        Args:
+            venue_id (int): The ID of the venue.
+            day (str): Date in 'YYYY-MM-DD' format.
+            party_size (int): Number of guests.
+
+        Returns:
+            list<Slot>: The slots, in the order returned by the API.
+        """
+        params = {"venue_id": venue_id, "day": day, "party_size": party_size, "lat": 0, "long": 0}
+        return self._request(
+            "GET", f"{self.api_root}{FIND_PATH}", f"Venue ID {venue_id} not found.", parse_slots, params=params
+        )
+
+    def get_book_token(self, config_id, day, party_size, auth_token):
+        """
+        Exchange a slot's config token for a short-lived booking token.
+
+        Args:
+            config_id (str): The slot's config token.
+            day (str): Date in 'YYYY-MM-DD' format.
+            party_size (int): Number of guests.
+            auth_token (str): The user's Resy auth token.
+
+        Returns:
+            str: The booking token.
+        """
+        params = {"config_id": config_id, "day": day, "party_size": party_size}
+        return self._request(
+            "GET", f"{self.api_root}{DETAILS_PATH}", "Slot no longer available.", _parse_book_token,
+            params=params, headers=self._auth_headers(auth_token),
+        )
+
+    def book(self, book_token, auth_token, payment_method_id):
+        """
+        Submit a reservation.
+
+        Args:
+            book_token (str): Token returned by `get_book_token`.
+            auth_token (str): The user's Resy auth token.
+            payment_method_id (int): The saved payment method to hold the reservation with.
+
+        Returns:
+            dict: The booking response, including `resy_token` on success.
+        """
+        form = {
+            "book_token": book_token,
+            "struct_payment_method": json.dumps({"id": payment_method_id}),
+            "source_id": "resy.com-venue-details",
+        }
+        return self._request(
+            "POST", f"{self.api_root}{BOOK_PATH}", "Booking token expired.",
+            data=form, headers=self._auth_headers(auth_token),
+        )
+
+    def get_user(self, auth_token):
+        """
+        Fetch the profile behind an auth token, including its saved payment methods.
+
+        Args:
+            auth_token (str): The user's Resy auth token.
+
+        Returns:
+            dict: The user profile.
+        """
+        return self._request(
+            "GET", f"{self.api_root}{USER_PATH}", "User not found.", headers=self._auth_headers(auth_token)
+        )
+
+    def find_venue(self, url_name, location="ny"):
+        """
+        Look up a venue by the slug in its Resy URL, e.g. resy.com/cities/ny/una-pizza-napoletana.
+
+        Args:
+            url_name (str): The venue name in url format. example: una-pizza-napoletana
+            location (str): The city code from the venue URL.
+
+        Returns:
+            tuple: (venue_id: int, venue_name: str), or None if Resy has no such venue.
+        """
+        params = {"url_slug": url_name, "location": location}
+        return self._request("GET", f"{self.api_root}{VENUE_PATH}", None, _parse_venue, params=params)
+
+    @staticmethod
+    def _auth_headers(auth_token):
+        return {"X-Resy-Auth-Token": auth_token, "X-Resy-Universal-Auth": auth_token}
+
+    def _request(self, method, url, not_found_message, parse=None, **kwargs):
+        """
+        Send a request over the pooled client and decode (and optionally parse) the JSON body.
+
+        A 404 raises `not_found_message`, or returns None when `not_found_message` is None.
+
+        Raises:
+            ValueError: For network, HTTP and parsing errors.
+        """
+        if self.rate_limiter:
+            with timed(self.stage_timer, "throttle"):
+                self.rate_limiter.acquire()
+        try:
+            with timed(self.stage_timer, "fetch"):
+                if method == "GET":
+                    response = self.http.get(url, **kwargs)
+                else:
+                    response = self.http.post(url, **kwargs)
+                response.raise_for_status()
 
             # Parse the response
-            availability = parse_response(response.json())
-            print(availability)
-            self.email_helper.check_and_notify_availability(venue_name, availability)
-            return availability
+            with timed(self.stage_timer, "parse"):
+                data = response.json()
+                return parse(data) if parse else data
 
         except httpx.RequestError as e:
             raise ValueError(f"Network error occurred: {e}")
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
-                raise ValueError(f"Venue ID {venue_id} not found.")
+                if not_found_message is None:
+                    return None
+                raise ValueError(not_found_message)
             raise ValueError(f"HTTP error occurred: {e}")
         except ValueError as e:
             raise ValueError(f"Error parsing response: {e}")
+
+
+def _parse_book_token(data: dict) -> str:
+    if not isinstance(data, dict) or "value" not in data.get("book_token", {}):
+        raise ValueError("Invalid response format: 'book_token' key missing.")
+    return data["book_token"]["value"]
+
+
+def _parse_venue(data: dict) -> tuple:
+    if not isinstance(data, dict) or "resy" not in data.get("id", {}) or "name" not in data:
+        raise ValueError("Invalid response format: venue 'id' or 'name' key missing.")
+    return int(data["id"]["resy"]), data["name"]
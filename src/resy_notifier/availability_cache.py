@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class CacheEntry:
+    def __init__(self, value, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+
+class _Flight:
+    """An upstream fetch in progress that concurrent readers of the same key wait on."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+class AvailabilityCache:
+    """
+    Thread-safe read-through cache with TTL expiry, LRU eviction and single-flight upstream fetches.
+
+    However many readers ask for a key at once, at most one upstream fetch per key is in progress, and a
+    fresh entry is served without any upstream call.
+    """
+    def __init__(self, fetch, ttl: float = 30.0, max_entries: int = 1024, clock=time.monotonic):
+        """
+        Args:
+            fetch (callable): Called with the key's items to load a value, e.g. ResyAPIClient.fetch_availability.
+            ttl (float): Seconds an entry is served before it is refreshed.
+            max_entries (int): Least recently used entries beyond this are evicted.
+            clock (callable): Monotonic time source.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "upstream_fetches": 0, "upstream_errors": 0, "evictions": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: tuple) -> CacheEntry:
+        """
+        Return a fresh entry for `key`, fetching it upstream on a miss or when stale.
+
+        If the upstream fetch fails and a stale entry exists, the stale entry is served instead.
+
+        Raises:
+            Exception: Whatever `fetch` raised, when there is nothing cached to fall back on.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry.fetched_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+            self.stats["misses"] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats["upstream_fetches"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry
+
+        try:
+            flight.entry = CacheEntry(self.fetch(*key), self.clock())
+            with self._lock:
+                self._entries[key] = flight.entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+            return flight.entry
+        except Exception as e:
+            with self._lock:
+                self.stats["upstream_errors"] += 1
+            if entry is not None:
+                logger.warning(f"Upstream fetch for {key} failed, serving stale entry: {e}")
+                flight.entry = entry
+                return entry
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
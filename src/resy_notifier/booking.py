@@ -0,0 +1,169 @@
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.model.availability import Availability
+from src.resy_notifier.model.slot import Slot, parse_time
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class BookingConfig:
+    """
+    Credentials used to book on the user's behalf, loaded from environment variables.
+    """
+    def __init__(self, auth_token: str = None, payment_method_id: int = None):
+        """
+        Raises:
+            ValueError: If the auth token or payment method is not set.
+        """
+        load_dotenv()
+
+        self.auth_token = auth_token or os.getenv("RESY_AUTH_TOKEN")
+        payment_method_id = payment_method_id or os.getenv("RESY_PAYMENT_METHOD_ID")
+        if not self.auth_token or not payment_method_id:
+            raise ValueError("Booking credentials are not set in environment variables.")
+        try:
+            self.payment_method_id = int(payment_method_id)
+        except ValueError:
+            raise ValueError("RESY_PAYMENT_METHOD_ID must be an integer.")
+
+
+class BookingGuardrails:
+    """
+    Per-watch limits on what the auto-booker is allowed to reserve.
+    """
+    def __init__(self, max_bookings: int = 1, earliest_time: str = None, latest_time: str = None):
+        """
+        Args:
+            max_bookings (int): Stop booking once this many reservations were made.
+            earliest_time (str): Earliest acceptable slot time in 'HH:MM' format, or None.
+            latest_time (str): Latest acceptable slot time in 'HH:MM' format, or None.
+
+        Raises:
+            ValueError: If max_bookings is below 1, a time is not 'HH:MM', or the window is empty.
+        """
+        if max_bookings < 1:
+            raise ValueError("max_bookings must be at least 1.")
+        self.max_bookings = max_bookings
+        self.earliest_time = earliest_time
+        self.latest_time = latest_time
+        self._earliest = parse_time(earliest_time)
+        self._latest = parse_time(latest_time)
+        if self._earliest and self._latest and self._earliest > self._latest:
+            raise ValueError("earliest_time must not be after latest_time.")
+        self.bookings_made = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.bookings_made >= self.max_bookings
+
+    def allows(self, slot: Slot) -> bool:
+        """Check whether a slot may be booked under these guardrails."""
+        if self.exhausted:
+            return False
+        slot_time = parse_time(slot.time)
+        if self._earliest and slot_time < self._earliest:
+            return False
+        if self._latest and slot_time > self._latest:
+            return False
+        return True
+
+    def record(self):
+        self.bookings_made += 1
+
+
+class BookingResult:
+    """
+    Outcome of a successful booking, with latencies measured from detection.
+    """
+    def __init__(self, slot: Slot, resy_token: str, request_latency_ms: float, total_latency_ms: float):
+        self.slot = slot
+        self.resy_token = resy_token
+        self.request_latency_ms = request_latency_ms
+        self.total_latency_ms = total_latency_ms
+
+    def __repr__(self):
+        return (
+            f"BookingResult(slot={self.slot}, request_latency_ms={self.request_latency_ms:.1f}, "
+            f"total_latency_ms={self.total_latency_ms:.1f})"
+        )
+
+
+class AutoBooker:
+    """
+    Books the first allowed slot as soon as a watch detects availability.
+    """
+    def __init__(self, client: ResyAPIClient, config: BookingConfig, guardrails: BookingGuardrails,
+                 clock=time.perf_counter):
+        self.client = client
+        self.config = config
+        self.guardrails = guardrails
+        self.clock = clock
+
+    def prepare(self):
+        """
+        Validate the profile and payment method up front so nothing is looked up on the hot path.
+
+        This also opens a connection in the client's pool before the first booking attempt.
+
+        Raises:
+            ValueError: If the auth token is rejected or the payment method is not on the profile.
+        """
+        user = self.client.get_user(self.config.auth_token)
+        payment_method_ids = {method.get("id") for method in user.get("payment_methods", [])}
+        if self.config.payment_method_id not in payment_method_ids:
+            raise ValueError(f"Payment method {self.config.payment_method_id} is not on the Resy profile.")
+
+    def try_book(self, venue_id: int, party_size: int, availabilities: list[Availability],
+                 detected_at: float = None) -> BookingResult | None:
+        """
+        Attempt to book one slot on the earliest newly available day.
+
+        Slots that disappear between lookup and booking are skipped and the next allowed slot is tried.
+
+        Args:
+            venue_id (int): The ID of the venue.
+            party_size (int): Number of guests.
+            availabilities (list<Availability>): Days that just became available.
+            detected_at (float): `clock()` reading when the change was detected. Defaults to now.
+
+        Returns:
+            BookingResult: The booking, or None if nothing allowed could be booked.
+        """
+        if self.guardrails.exhausted:
+            return None
+        if detected_at is None:
+            detected_at = self.clock()
+
+        days = sorted(day.date for day in availabilities if day.inventory.reservation == "available")
+        for day in days:
+            try:
+                slots = self.client.find_slots(venue_id, day, party_size)
+            except ValueError as e:
+                logger.warning(f"Failed to fetch slots for venue_id={venue_id} on {day}: {e}")
+                continue
+
+            for slot in slots:
+                if not self.guardrails.allows(slot):
+                    continue
+                try:
+                    book_token = self.client.get_book_token(slot.config_id, day, party_size, self.config.auth_token)
+                    sent_at = self.clock()
+                    response = self.client.book(book_token, self.config.auth_token, self.config.payment_method_id)
+                except ValueError as e:
+                    logger.warning(f"Booking attempt for {slot} failed: {e}")
+                    continue
+
+                self.guardrails.record()
+                result = BookingResult(
+                    slot,
+                    response.get("resy_token", ""),
+                    (sent_at - detected_at) * 1000,
+                    (self.clock() - detected_at) * 1000,
+                )
+                logger.info(f"Booked venue_id={venue_id}: {result}")
+                return result
+        return None
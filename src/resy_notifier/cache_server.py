@@ -0,0 +1,85 @@
+import json
+import logging
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.resy_notifier.availability_cache import AvailabilityCache
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves cached calendars to internal readers.
+
+    GET /availability?venue_id=6066&party_size=2&start_date=2024-12-01&end_date=2024-12-07
+        returns the calendar in the same `scheduled` shape as the Resy API, plus `fetched_at` and `age_seconds`.
+    GET /stats
+        returns cache hit/miss/upstream counters.
+    """
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def cache(self) -> AvailabilityCache:
+        return self.server.cache
+
+    def log_message(self, format, *args):
+        logger.debug(f"Cache service {self.address_string()} {format % args}")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/availability":
+            self._get_availability({key: values[0] for key, values in parse_qs(url.query).items()})
+        elif url.path == "/stats":
+            self._reply(200, dict(self.cache.stats, entries=len(self.cache)))
+        else:
+            self._reply(404, {"error": "Not found."})
+
+    def _get_availability(self, params: dict):
+        try:
+            venue_id = int(params["venue_id"])
+            party_size = int(params.get("party_size", 2))
+        except (KeyError, ValueError):
+            self._reply(400, {"error": "venue_id and party_size must be integers."})
+            return
+
+        # Resolve default dates here so equivalent requests share a cache key
+        start_date = params.get("start_date") or datetime.now().strftime("%Y-%m-%d")
+        end_date = params.get("end_date") or (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+
+        try:
+            entry = self.cache.get((venue_id, party_size, start_date, end_date))
+        except ValueError as e:
+            self._reply(502, {"error": str(e)})
+            return
+
+        age = self.cache.clock() - entry.fetched_at
+        self._reply(200, {
+            "venue_id": venue_id,
+            "party_size": party_size,
+            "start_date": start_date,
+            "end_date": end_date,
+            "fetched_at": datetime.now().timestamp() - age,
+            "age_seconds": round(age, 3),
+            "scheduled": [day.to_dict() for day in entry.value],
+        })
+
+    def _reply(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class CacheServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server exposing an AvailabilityCache.
+    """
+    daemon_threads = True
+
+    def __init__(self, cache: AvailabilityCache, host: str = "127.0.0.1", port: int = 8085):
+        self.cache = cache
+        super().__init__((host, port), CacheRequestHandler)
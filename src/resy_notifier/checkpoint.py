@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+import tempfile
+
+from src.resy_notifier.model.availability import Availability, Inventory
+
+logger = logging.getLogger("ResyNotifier")
+
+CHECKPOINT_VERSION = 1
+
+
+class WatchState:
+    """
+    The part of a watch's state needed to resume without re-notifying or bursting.
+    """
+    def __init__(self, available_dates=(), last_state: bool = None, next_due_at: float = None):
+        """
+        Args:
+            available_dates (iterable<str>): Dates already seen (and notified) as available.
+            last_state (bool): The last availability state logged by the watch loop.
+            next_due_at (float): Epoch seconds at which the next poll is due.
+        """
+        self.available_dates = sorted(set(available_dates))
+        self.last_state = last_state
+        self.next_due_at = next_due_at
+
+    def snapshot(self) -> list[Availability]:
+        """Rebuild a calendar snapshot that diffs the same way as the one the state was taken from."""
+        return [Availability(day, Inventory("available", "unknown", "unknown")) for day in self.available_dates]
+
+    def to_dict(self) -> dict:
+        return {"dates": self.available_dates, "state": self.last_state, "due": self.next_due_at}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WatchState":
+        return cls(data.get("dates", ()), data.get("state"), data.get("due"))
+
+    def __repr__(self):
+        return (
+            f"WatchState(available_dates={self.available_dates}, last_state={self.last_state}, "
+            f"next_due_at={self.next_due_at})"
+        )
+
+
+class CheckpointStore:
+    """
+    Stores WatchState per watch key in a small JSON file that is replaced atomically on every save.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> dict:
+        """
+        Read the checkpoint file.
+
+        A missing, unreadable or incompatible file is treated as empty so a bad checkpoint never
+        prevents startup.
+
+        Returns:
+            dict: watch key -> WatchState
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            logger.warning(f"Ignoring checkpoint {self.path} with unsupported version")
+            return {}
+        return {key: WatchState.from_dict(state) for key, state in data.get("watches", {}).items()}
+
+    def save(self, states: dict):
+        """
+        Write every WatchState to a temporary file and atomically replace the checkpoint with it.
+
+        Args:
+            states (dict): watch key -> WatchState
+        """
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "watches": {key: state.to_dict() for key, state in states.items()},
+        }
+        atomic_write_json(self.path, payload, ".checkpoint-")
+
+
+def atomic_write_json(path: str, payload, prefix: str):
+    """
+    Write JSON to a temporary file next to `path`, flush it to disk and atomically replace `path` with it, so a
+    crash leaves either the old file or the new one, never a torn write. Missing directories are created.
+
+    Args:
+        path (str): The file to replace.
+        payload: Anything `json.dump` accepts.
+        prefix (str): Prefix of the temporary file, e.g. ".checkpoint-".
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
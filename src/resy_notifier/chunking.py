@@ -0,0 +1,82 @@
+import threading
+from datetime import date, datetime, timedelta
+
+
+def resolve_date_range(start_date: str = None, end_date: str = None) -> tuple:
+    """Fill in the calendar defaults: today through a week from today."""
+    if not start_date:
+        start_date = datetime.now().strftime("%Y-%m-%d")
+    if not end_date:
+        end_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+    return start_date, end_date
+
+
+def split_date_range(start_date: str, end_date: str, chunk_days: int) -> list[tuple]:
+    """
+    Split an inclusive date range into consecutive chunks of at most `chunk_days` days, nearest first.
+
+    Args:
+        start_date (str): Start date in 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY-MM-DD' format.
+        chunk_days (int): Maximum days per chunk.
+
+    Returns:
+        list<tuple>: (start_date, end_date) per chunk, in date order.
+
+    Raises:
+        ValueError: If chunk_days is below 1 or the end is before the start.
+    """
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be at least 1.")
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    if end < start:
+        raise ValueError("end_date must not be before start_date.")
+    chunks = []
+    while start <= end:
+        chunk_end = min(start + timedelta(days=chunk_days - 1), end)
+        chunks.append((start.isoformat(), chunk_end.isoformat()))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class ChunkSizer:
+    """
+    Tunes the calendar chunk size from measured request latency.
+
+    Each observed chunk suggests the size that would have taken `target_seconds`; the size moves halfway
+    toward that suggestion. Small chunks return near-term dates quickly but pay the per-request overhead
+    more often, so the target keeps chunks as large as they can be while still coming back promptly.
+    """
+    def __init__(self, initial_days: int = 14, target_seconds: float = 0.5, min_days: int = 3, max_days: int = 31):
+        """
+        Args:
+            initial_days (int): Chunk size before any latency has been measured.
+            target_seconds (float): Latency a single chunk should have.
+            min_days (int): Smallest chunk size.
+            max_days (int): Largest chunk size.
+
+        Raises:
+            ValueError: If the bounds are inconsistent.
+        """
+        if not 1 <= min_days <= max_days or target_seconds <= 0:
+            raise ValueError("Chunk sizes must satisfy 1 <= min_days <= max_days and target_seconds > 0.")
+        self.target_seconds = target_seconds
+        self.min_days = min_days
+        self.max_days = max_days
+        self._days = float(min(max(initial_days, min_days), max_days))
+        self._lock = threading.Lock()
+
+    @property
+    def days(self) -> int:
+        return int(round(self._days))
+
+    def observe(self, days: int, seconds: float):
+        """Record that a chunk of `days` days took `seconds` to fetch and parse."""
+        if days < 1:
+            return
+        suggested = days * self.target_seconds / max(seconds, 1e-3)
+        with self._lock:
+            self._days = min(max((self._days + suggested) / 2, self.min_days), self.max_days)
+
+    def __repr__(self):
+        return f"ChunkSizer(days={self.days}, target_seconds={self.target_seconds})"
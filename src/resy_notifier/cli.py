@@ -1,31 +1,99 @@
+import json
 import sys
+import threading
 import time
+from datetime import datetime
 
 from dotenv import load_dotenv
 from src.resy_notifier.api_client import ResyAPIClient
 import os
+from src.resy_notifier.admin_server import AdminServer
+from src.resy_notifier.availability_cache import AvailabilityCache
+from src.resy_notifier.booking import AutoBooker, BookingConfig, BookingGuardrails
+from src.resy_notifier.cache_server import CacheServer
+from src.resy_notifier.checkpoint import CheckpointStore, WatchState
+from src.resy_notifier.chunking import ChunkSizer
 from src.resy_notifier.db_manager import DatabaseManager
+from src.resy_notifier.event_feed import EventFeed, EventStreamServer, availability_events
 from src.resy_notifier.logger_config import setup_logger
+from src.resy_notifier.migration_runner import MigrationRunner
+from src.resy_notifier.model.availability import get_newly_available
+from src.resy_notifier.model.watch import GroupWatch, Watch
+from src.resy_notifier.pipeline import PollItem, availability_pipeline
+from src.resy_notifier.profiling import Profiler, StageTimer, timed
+from src.resy_notifier.request_budget import BudgetAllocator
+from src.resy_notifier.simulation import CalendarTimeline, Simulator, synthetic_timeline
+from src.resy_notifier.subscription_index import SubscriptionIndex
+from src.resy_notifier.subscription_poller import SubscriptionPoller
+from src.resy_notifier.venue_resolver import VenueResolver
+from src.resy_notifier.watch_engine import WatchEngine, iter_chunk_diffs
 
 load_dotenv()
 
 # Initialize logger
 logger = setup_logger()
 
+def parse_options(argv):
+    """
+    Split `--name` / `--name=value` options from positional arguments.
+
+    Returns:
+        tuple: (positional: list<str>, options: dict) where flag options map to True.
+    """
+    positional, options = [], {}
+    for arg in argv:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value or True
+        else:
+            positional.append(arg)
+    return positional, options
+
+
 def main(loop_limit=None):
+    args, options = parse_options(sys.argv[1:])
+
+    if "migrate" in options:
+        run_migrations(options)
+        return
+
+    if "resolve-venues" in options:
+        run_venue_resolver(args, options)
+        return
+
+    if "subscriptions" in options:
+        request_interval = int(args[0]) if args else 60
+        checkpoint_path = options.get("checkpoint")
+        if checkpoint_path is True:
+            checkpoint_path = "logs/checkpoint-subscriptions.json"
+        run_subscriptions(request_interval, loop_limit, checkpoint_path)
+        return
+
+    if "simulate" in options:
+        run_simulation(args, options)
+        return
+
+    if "serve" in options:
+        run_cache_service(options)
+        return
+
+    if "watches" in options:
+        run_watches(options, loop_limit)
+        return
+
     # Ensure correct number of arguments
-    if len(sys.argv) < 2:
+    if len(args) < 1:
         # venue_url_name is mandatory
         print("Usage: python main.py <venue_url_name>")
         sys.exit(1)
 
     # Parse command-line arguments
     try:
-        venue_url_name = sys.argv[1]
-        party_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2  # Default to 2
-        start_date = sys.argv[3] if len(sys.argv) > 3 else None    # Default to today
-        end_date = sys.argv[4] if len(sys.argv) > 4 else None      # Default to today + 14
-        request_interval = sys.argv[5] if len(sys.argv) > 5 else 60 # Default to 1 Request/min
+        venue_url_name = args[0]
+        party_size = int(args[1]) if len(args) > 1 else 2            # Default to 2
+        start_date = args[2] if len(args) > 2 else None              # Default to today
+        end_date = args[3] if len(args) > 3 else None                # Default to today + 14
+        request_interval = float(args[4]) if len(args) > 4 else 60   # Default to 1 Request/min
     except ValueError:
         print("Invalid party size. It must be an integer.")
         sys.exit(1)
@@ -34,44 +102,467 @@ def main(loop_limit=None):
     venue_id, venue_name = db_manager.get_venue_info(venue_url_name)
     base_url = os.getenv("BASE_URL")
     client = ResyAPIClient(api_key, base_url)
+    client.chunk_sizer = chunk_sizer_from_options(options)
+
+    # Opt-in auto-booking, validated before the first poll
+    booker = None
+    if "auto-book" in options:
+        try:
+            guardrails = BookingGuardrails(
+                int(options.get("max-bookings", 1)), options.get("earliest"), options.get("latest")
+            )
+        except ValueError as e:
+            print(f"Invalid booking guardrails: {e}")
+            sys.exit(1)
+        booker = AutoBooker(client, BookingConfig(), guardrails)
+        booker.prepare()
+
+    # Opt-in profiling: cProfile/tracemalloc dumps plus per-stage timings every iteration
+    profiler = None
+    timer = None
+    if "profile" in options:
+        directory = options["profile"] if options["profile"] is not True else "logs/profile"
+        profiler = Profiler(directory, int(options.get("profile-every", 100)))
+        timer = StageTimer()
+        client.stage_timer = timer
+        profiler.start()
+
+    # Opt-in machine-readable feed of status changes (NDJSON and/or Server-Sent Events)
+    feed, event_server = start_event_feed(options)
 
     # Initialize state for availability tracking
     last_availability_state = None
+    last_snapshot = None
     iterations = 0
 
-    while True:
-        try:
-            logger.info(
-                f"Sending request for venue_id={venue_id}, party_size={party_size}, start_date={start_date}, end_date={end_date}"
-            )
-            availability = client.get_availability(
-                venue_id, venue_name, party_size, start_date, end_date
-            )
+    # Opt-in warm restart: resume the notified set and poll schedule from the last checkpoint
+    store = None
+    watch_key = f"{venue_id}:{party_size}:{start_date}:{end_date}"
+    if "checkpoint" in options:
+        path = options["checkpoint"]
+        if path is True:
+            path = f"logs/checkpoint-{venue_url_name}-{party_size}.json"
+        store = CheckpointStore(path)
+        state = store.load().get(watch_key)
+        if state:
+            last_snapshot = state.snapshot()
+            last_availability_state = state.last_state
+            delay = min(state.next_due_at - time.time(), request_interval) if state.next_due_at else 0
+            logger.info(f"Resuming {venue_name} from checkpoint, next poll in {max(delay, 0):.0f}s: {state}")
+            if delay > 0:
+                time.sleep(delay)
+
+    try:
+        while True:
+            try:
+                logger.info(
+                    f"Sending request for venue_id={venue_id}, party_size={party_size}, start_date={start_date}, end_date={end_date}"
+                )
+                if booker or store or feed or client.chunk_sizer:
+                    # Long ranges come in chunks, nearest first: each is handled as soon as it arrives
+                    availability = []
+                    diffs = iter_chunk_diffs(
+                        client, venue_id, party_size, start_date, end_date, last_snapshot,
+                        chunked=client.chunk_sizer is not None,
+                    )
+                    for previous, chunk, merged in diffs:
+                        availability.extend(chunk)
+                        detected_at = time.perf_counter()
+                        with timed(timer, "diff"):
+                            if feed:
+                                feed.publish(availability_events(previous, chunk, venue_id, venue_name, party_size))
+                            newly_available = get_newly_available(previous, chunk)
+                        # Book before notifying so the slower email never sits on the booking path
+                        if booker and newly_available and not booker.guardrails.exhausted:
+                            with timed(timer, "book"):
+                                result = booker.try_book(venue_id, party_size, newly_available, detected_at)
+                            if result:
+                                client.email_helper.send_email(
+                                    f"Reservation booked at {venue_name}",
+                                    f"Booked {venue_name} for {party_size} at {result.slot.start}.",
+                                )
+                        with timed(timer, "notify"):
+                            # With a checkpoint only new dates are notified, so restarts never repeat an email
+                            client.email_helper.check_and_notify_availability(
+                                venue_name, newly_available if store else chunk, party_size=party_size
+                            )
+                            client.email_helper.observe_availability(venue_name, chunk, party_size=party_size)
+                        last_snapshot = merged
+                    last_snapshot = availability
+                else:
+                    availability = client.get_availability(
+                        venue_id, venue_name, party_size, start_date, end_date
+                    )
 
-            # Determine current availability state
-            current_state = len(availability) > 0
+                client.email_helper.flush_pending()
 
-            # Log state transitions
-            if current_state and last_availability_state is None:
-                logger.info(f"Availability detected for the first time at {venue_name}: {availability}")
-            elif current_state and not last_availability_state:
-                logger.info(f"Availability returned for {venue_name}: {availability}")
-            elif not current_state and last_availability_state:
-                logger.info(f"Availability disappeared for {venue_name}")
-            elif not current_state:
-                logger.info(f"No availability for {venue_name} (no change from last check).")
+                # Determine current availability state and the transition to log
+                with timed(timer, "diff"):
+                    current_state = len(availability) > 0
+                    message = None
+                    if current_state and last_availability_state is None:
+                        message = f"Availability detected for the first time at {venue_name}: {availability}"
+                    elif current_state and not last_availability_state:
+                        message = f"Availability returned for {venue_name}: {availability}"
+                    elif not current_state and last_availability_state:
+                        message = f"Availability disappeared for {venue_name}"
+                    elif not current_state:
+                        message = f"No availability for {venue_name} (no change from last check)."
 
-            # Update last state
-            last_availability_state = current_state
+                # Log state transitions
+                with timed(timer, "log"):
+                    if message:
+                        logger.info(message)
+
+                # Update last state
+                last_availability_state = current_state
+                if store:
+                    store.save({watch_key: WatchState(
+                        (day.date for day in last_snapshot if day.inventory.reservation == "available"),
+                        last_availability_state,
+                        time.time() + request_interval,
+                    )})
+
+                # Increment iteration counter and exit if limit is reached
+                iterations += 1
+                if profiler:
+                    timings = ", ".join(f"{name}={ms:.2f}ms" for name, ms in timer.report().items())
+                    logger.info(f"Stage timings for iteration {iterations}: {timings}")
+                    profiler.end_iteration(iterations)
+                if loop_limit is not None and iterations >= loop_limit:
+                    break
+
+                # Wait before next request
+                time.sleep(request_interval)
+
+            except Exception as e:
+                logger.error(f"Error occurred: {e}", exc_info=True)
+                sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
+        stop_event_feed(feed, event_server)
+
+
+def run_subscriptions(request_interval=60, loop_limit=None, checkpoint_path=None):
+    """
+    Poll every active subscription from the database, one request per distinct feed.
+
+    Args:
+        request_interval (int): Seconds between polling rounds.
+        loop_limit (int): Stop after this many rounds (used in tests).
+        checkpoint_path (str): Where to checkpoint per-feed notified dates, or None to disable.
+    """
+    db_manager = DatabaseManager()
+    api_key = db_manager.get_active_api_key()
+    index = SubscriptionIndex(db_manager.get_active_subscriptions())
+    client = ResyAPIClient(api_key, os.getenv("BASE_URL"))
+    poller = SubscriptionPoller(client, index)
+    logger.info(f"Loaded {len(index)} subscriptions across {len(index.feeds())} feeds")
+
+    store = CheckpointStore(checkpoint_path) if checkpoint_path else None
+    if store:
+        poller.restore_state(store.load())
+
+    iterations = 0
+    while True:
+        try:
+            notifications = poller.poll_once()
+            logger.info(f"Subscription round complete, {notifications} notifications sent")
+            if store:
+                store.save(poller.export_state())
 
-            # Increment iteration counter and exit if limit is reached
             iterations += 1
             if loop_limit is not None and iterations >= loop_limit:
                 break
 
-            # Wait before next request
             time.sleep(request_interval)
 
         except Exception as e:
             logger.error(f"Error occurred: {e}", exc_info=True)
             sys.exit(1)
+
+
+def run_simulation(args, options):
+    """
+    Replay a recorded (`--simulate=timeline.ndjson`) or synthetic (`--simulate`) calendar under a virtual clock
+    and print the resulting report.
+
+    Args:
+        args (list<str>): Optional positional request_interval in seconds.
+        options (dict): `simulate`, plus `duration`, `days`, `openings-per-day`, `seed` for synthetic runs.
+    """
+    duration = float(options.get("duration", 86400))
+    request_interval = float(args[0]) if args else 60
+    if options["simulate"] is True:
+        timeline = synthetic_timeline(
+            datetime.now().strftime("%Y-%m-%d"),
+            int(options.get("days", 14)),
+            duration,
+            float(options.get("openings-per-day", 1)),
+            seed=int(options["seed"]) if "seed" in options else None,
+        )
+    else:
+        timeline = CalendarTimeline.load(options["simulate"])
+
+    report = Simulator(timeline).run(duration, request_interval, track_memory="track-memory" in options)
+    logger.info(f"Simulation finished: {report}")
+    print(report)
+    return report
+
+
+def run_cache_service(options):
+    """
+    Serve the latest calendars to internal consumers from a read-through cache (`--serve[=host:port]`).
+
+    Args:
+        options (dict): `serve`, plus `ttl` (seconds) and `max-entries`.
+    """
+    address = options["serve"] if options["serve"] is not True else "127.0.0.1:8085"
+    host, _, port = address.rpartition(":")
+
+    db_manager = DatabaseManager()
+    client = ResyAPIClient(db_manager.get_active_api_key(), os.getenv("BASE_URL"))
+    cache = AvailabilityCache(
+        client.fetch_availability,
+        ttl=float(options.get("ttl", 30)),
+        max_entries=int(options.get("max-entries", 1024)),
+    )
+    server = CacheServer(cache, host or "127.0.0.1", int(port))
+    logger.info(f"Serving cached availability on {address} (ttl={cache.ttl}s, max_entries={cache.max_entries})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        client.close()
+
+
+def run_migrations(options):
+    """
+    Apply pending database migrations, or list them with `--dry-run`.
+    """
+    runner = MigrationRunner(DatabaseManager())
+    try:
+        migrations = runner.migrate(dry_run="dry-run" in options)
+    except Exception as e:
+        logger.error(f"Migration failed: {e}", exc_info=True)
+        sys.exit(1)
+    verb = "Pending" if "dry-run" in options else "Applied"
+    if not migrations:
+        print("Database is up to date.")
+    for migration in migrations:
+        print(f"{verb}: {migration.version:03d} {migration.name}")
+
+
+def run_venue_resolver(args, options):
+    """
+    Resolve venue url names given as arguments (or one per line in `--resolve-venues=path`) into `t_venue`.
+
+    Args:
+        args (list<str>): Venue url names.
+        options (dict): `resolve-venues`, and optional `location` (default ny) and `workers` (default 8).
+    """
+    url_names = list(args)
+    if options["resolve-venues"] is not True:
+        with open(options["resolve-venues"]) as f:
+            url_names.extend(line for line in f.read().splitlines() if line.strip())
+    if not url_names:
+        print("Usage: python main.py --resolve-venues[=names.txt] [venue_url_name ...]")
+        sys.exit(1)
+
+    db_manager = DatabaseManager()
+    client = ResyAPIClient(db_manager.get_active_api_key(), os.getenv("BASE_URL"))
+    resolver = VenueResolver(
+        client, db_manager, options.get("location", "ny"), int(options.get("workers", 8)),
+        cache_path="logs/venue-cache.json",
+    )
+    try:
+        result = resolver.resolve(url_names)
+    finally:
+        client.close()
+    for url_name, (venue_id, venue_name) in result.resolved.items():
+        print(f"Resolved: {url_name} -> {venue_id} {venue_name}")
+    for url_name in result.not_found + result.skipped:
+        print(f"Not found: {url_name}")
+    for url_name, error in result.failed.items():
+        print(f"Failed: {url_name}: {error}")
+    return result
+
+
+def load_watches(path, db_manager):
+    """
+    Build Watch objects from a JSON file holding a list of `watch_from_entry` entries.
+
+    Args:
+        path (str): Path to the JSON file.
+        db_manager (DatabaseManager): Used to resolve venue url names.
+
+    Returns:
+        list<Watch>: One watch per entry.
+    """
+    with open(path) as f:
+        entries = json.load(f)
+    return [watch_from_entry(entry, db_manager) for entry in entries]
+
+
+def watch_from_entry(entry, db_manager):
+    """
+    Build a Watch from one `--watches` file entry (also the body of an admin POST /watches).
+
+    An entry has `venue` (url name) and optional `party_size`, `start_date`, `end_date`, `interval` (seconds)
+    and `weight`. An entry with `group` (display name) and `venues` (url names in order of preference)
+    instead becomes a GroupWatch, with optional `concurrency` and `stop_on_match` as well.
+
+    Args:
+        entry (dict): The entry.
+        db_manager (DatabaseManager): Used to resolve venue url names.
+
+    Returns:
+        Watch: The watch, or a GroupWatch.
+    """
+    if "group" in entry:
+        return GroupWatch(
+            entry["group"],
+            [db_manager.get_venue_info(url_name) for url_name in entry["venues"]],
+            int(entry.get("party_size", 2)),
+            entry.get("start_date"),
+            entry.get("end_date"),
+            float(entry.get("interval", 60)),
+            float(entry.get("weight", 1)),
+            int(entry.get("concurrency", 2)),
+            bool(entry.get("stop_on_match", True)),
+        )
+    venue_id, venue_name = db_manager.get_venue_info(entry["venue"])
+    return Watch(
+        venue_id,
+        venue_name,
+        int(entry.get("party_size", 2)),
+        entry.get("start_date"),
+        entry.get("end_date"),
+        float(entry.get("interval", 60)),
+        float(entry.get("weight", 1)),
+    )
+
+
+def run_watches(options, loop_limit=None):
+    """
+    Run every watch from `--watches=path.json` in this process under one `--rpm` request budget.
+
+    With `--pipeline[=fetch_workers]`, due watches are streamed through the staged pipeline instead of being
+    polled one at a time, so slow fetches or emails no longer delay the next slot. With `--admin[=port]`,
+    watches can be listed, added, paused, resumed and reweighted over HTTP while the engine runs.
+
+    With `--chunk-days[=initial]`, each watch's date range is fetched as concurrent chunks and near-term chunks
+    are diffed and notified first. `--events` and `--events-port` publish status changes as for a single watch.
+    With `--checkpoint[=path.json]`, every watch resumes from its notified dates and next due time after a restart.
+
+    Args:
+        options (dict): `watches` and optional `rpm` (requests per minute, default 60), `pipeline`, `admin`
+            `chunk-days`, `events`, `events-port` and `checkpoint`.
+        loop_limit (int): Stop after this many polls (used in tests).
+    """
+    db_manager = DatabaseManager()
+    client = ResyAPIClient(db_manager.get_active_api_key(), os.getenv("BASE_URL"))
+    client.chunk_sizer = chunk_sizer_from_options(options)
+    if client.chunk_sizer and "pipeline" in options:
+        # The pipeline's fetch stage downloads raw calendars, which are not chunked
+        logger.warning("--chunk-days is not supported with --pipeline; fetching whole ranges.")
+        client.chunk_sizer = None
+    feed, event_server = start_event_feed(options)
+    checkpoint = None
+    if "checkpoint" in options:
+        path = options["checkpoint"] if options["checkpoint"] is not True else "logs/checkpoint-watches.json"
+        checkpoint = CheckpointStore(path)
+    engine = WatchEngine(
+        client, BudgetAllocator(float(options.get("rpm", 60))), chunked=client.chunk_sizer is not None,
+        event_feed=feed, checkpoint=checkpoint,
+    )
+    if options["watches"] is not True:
+        for watch in load_watches(options["watches"], db_manager):
+            engine.add_watch(watch)
+
+    admin = None
+    if "admin" in options:
+        port = int(options["admin"]) if options["admin"] is not True else 8086
+        admin = AdminServer(engine, lambda entry: watch_from_entry(entry, db_manager), port=port)
+        threading.Thread(target=admin.serve_forever, name="admin", daemon=True).start()
+        logger.info(f"Admin API listening on http://127.0.0.1:{admin.server_address[1]}/watches")
+
+    try:
+        if "pipeline" in options:
+            fetch_workers = int(options["pipeline"]) if options["pipeline"] is not True else 4
+            pipeline = availability_pipeline(
+                client, engine.email_helper, fetch_workers=fetch_workers, event_feed=feed
+            )
+            pipeline.drain(_poll_items(engine, loop_limit))
+            engine.save_checkpoint()
+            logger.info(f"Pipeline stage stats: {pipeline.report()}")
+        else:
+            engine.run(loop_limit)
+    except Exception as e:
+        logger.error(f"Error occurred: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        if admin:
+            admin.shutdown()
+            admin.server_close()
+        stop_event_feed(feed, event_server)
+        client.close()
+    return engine
+
+
+def chunk_sizer_from_options(options):
+    """
+    Build the ChunkSizer requested by `--chunk-days[=initial_days]`, or return None when chunking is off.
+    """
+    if "chunk-days" not in options:
+        return None
+    if options["chunk-days"] is True:
+        return ChunkSizer()
+    return ChunkSizer(initial_days=int(options["chunk-days"]))
+
+
+def start_event_feed(options):
+    """
+    Set up the availability event feed requested by `--events[=path]` and `--events-port[=port]`.
+
+    `--events` writes NDJSON to stdout, or appends it to `path`; `--events-port` serves Server-Sent Events on
+    localhost (default port 8087).
+
+    Returns:
+        tuple: (EventFeed, EventStreamServer), either of which is None when not requested.
+    """
+    if "events" not in options and "events-port" not in options:
+        return None, None
+    stream = None
+    if "events" in options:
+        path = options["events"]
+        stream = sys.stdout if path is True or path == "-" else open(path, "a")
+    feed = EventFeed(stream)
+
+    server = None
+    if "events-port" in options:
+        port = int(options["events-port"]) if options["events-port"] is not True else 8087
+        server = EventStreamServer(feed, port=port)
+        threading.Thread(target=server.serve_forever, name="events", daemon=True).start()
+        logger.info(f"Event stream listening on http://127.0.0.1:{server.server_address[1]}/events")
+    return feed, server
+
+
+def stop_event_feed(feed, server):
+    if server:
+        server.shutdown()
+        server.server_close()
+    if feed and feed.stream not in (None, sys.stdout):
+        feed.stream.close()
+
+
+def _poll_items(engine, loop_limit):
+    for watch in engine.due_watches(loop_limit):
+        if isinstance(watch, GroupWatch):
+            # Groups cancel their own members, so they are polled directly rather than staged
+            engine.poll(watch)
+        else:
+            yield PollItem.for_watch(watch)
+        # Covers the items the pipeline has finished since the last slot
+        engine.save_checkpoint()
@@ -1,15 +1,60 @@
 # constants/queries.py
 
+# Effective-window filters are written as `IS NULL OR >` rather than IFNULL(...) so the
+# range can be read from the indexes added in db_migrations/versions/002_add_lookup_indexes.sql
+
 # Query to get the most recent active API key
 GET_ACTIVE_API_KEY = """
     SELECT API_KEY FROM resy.t_api_keys
     WHERE EFFECTIVE_DATE <= CURDATE()
-    AND IFNULL(TERMINATED_DATE, '3000-01-01') > CURDATE()
+    AND (TERMINATED_DATE IS NULL OR TERMINATED_DATE > CURDATE())
 """
 
 GET_VENUE_INFO = """
     SELECT VENUE_ID, VENUE_NAME FROM resy.t_venue
     WHERE URL_NAME = %s
     AND EFFECTIVE_DATE <= CURDATE()
-    AND IFNULL(TERMINATED_DATE, '3000-01-01') > CURDATE()
+    AND (TERMINATED_DATE IS NULL OR TERMINATED_DATE > CURDATE())
+"""
+
+GET_ACTIVE_SUBSCRIPTIONS = """
+    SELECT s.RECIPIENT_EMAIL, s.VENUE_ID, v.VENUE_NAME, s.PARTY_SIZE, s.START_DATE, s.END_DATE,
+           s.WEEKDAYS, s.EARLIEST_TIME, s.LATEST_TIME
+    FROM resy.t_subscription s
+    JOIN resy.t_venue v ON v.VENUE_ID = s.VENUE_ID
+    WHERE s.EFFECTIVE_DATE <= CURDATE()
+    AND (s.TERMINATED_DATE IS NULL OR s.TERMINATED_DATE > CURDATE())
+    AND s.END_DATE >= CURDATE()
+"""
+
+# Insert or refresh a venue resolved from the Resy API; reactivates terminated rows
+UPSERT_VENUE = """
+    INSERT INTO resy.t_venue (VENUE_ID, VENUE_NAME, URL_NAME, EFFECTIVE_DATE)
+    VALUES (%s, %s, %s, CURDATE())
+    ON DUPLICATE KEY UPDATE
+        VENUE_NAME = VALUES(VENUE_NAME),
+        URL_NAME = VALUES(URL_NAME),
+        TERMINATED_DATE = NULL,
+        MODIFIED_DATETIME = NOW()
+"""
+
+# Migration runner bookkeeping
+CREATE_SCHEMA = "CREATE SCHEMA IF NOT EXISTS resy"
+
+CREATE_MIGRATION_TABLE = """
+    CREATE TABLE IF NOT EXISTS resy.t_schema_migration (
+        VERSION INT NOT NULL PRIMARY KEY,
+        NAME VARCHAR(255) NOT NULL,
+        CHECKSUM CHAR(64) NOT NULL,
+        APPLIED_DATETIME DATETIME DEFAULT NOW()
+    )
+"""
+
+GET_APPLIED_MIGRATIONS = "SELECT VERSION, CHECKSUM FROM resy.t_schema_migration"
+
+INSERT_MIGRATION = "INSERT INTO resy.t_schema_migration (VERSION, NAME, CHECKSUM) VALUES (%s, %s, %s)"
+
+INDEX_EXISTS = """
+    SELECT COUNT(*) FROM information_schema.statistics
+    WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) AND TABLE_NAME = %s AND INDEX_NAME = %s
 """
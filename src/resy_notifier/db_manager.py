@@ -1,7 +1,13 @@
+import logging
 import os
 from dotenv import load_dotenv
 import mysql.connector
-from src.resy_notifier.constants.queries import GET_ACTIVE_API_KEY, GET_VENUE_INFO
+from src.resy_notifier.constants.queries import (
+    GET_ACTIVE_API_KEY, GET_VENUE_INFO, GET_ACTIVE_SUBSCRIPTIONS, UPSERT_VENUE
+)
+from src.resy_notifier.model.subscription import Subscription
+
+logger = logging.getLogger("ResyNotifier")
 
 class DatabaseManager:
     def __init__(self):
@@ -20,7 +26,7 @@ class DatabaseManager:
         try:
             return mysql.connector.connect(**self.db_config)
         except mysql.connector.Error as e:
-            print(f"Error connecting to the database: {e}")
+            logger.error(f"Error connecting to the database: {e}")
             raise
 
     def get_active_api_key(self) -> str:
@@ -40,7 +46,7 @@ class DatabaseManager:
                     raise ValueError("API key not found")
                 return result[0]
         except mysql.connector.Error as e:
-            print(f"Database error occurred: {e}")
+            logger.error(f"Database error occurred: {e}")
             raise
 
     def get_venue_info(self, url_name: str) -> tuple:
@@ -66,3 +72,67 @@ class DatabaseManager:
                 return result
         except mysql.connector.Error as e:
             raise e
+
+    def upsert_venues(self, venues: list[tuple]) -> int:
+        """
+        Insert or refresh many venues in a single transaction.
+
+        Args:
+            venues (list<tuple>): (venue_id, venue_name, url_name) rows.
+
+        Returns:
+            int: Number of rows written.
+        """
+        if not venues:
+            return 0
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.executemany(UPSERT_VENUE, venues)
+                    conn.commit()
+                except mysql.connector.Error:
+                    conn.rollback()
+                    raise
+                return len(venues)
+        except mysql.connector.Error as e:
+            logger.error(f"Database error occurred: {e}")
+            raise
+
+    def get_active_subscriptions(self) -> list[Subscription]:
+        """
+        Retrieve every active subscription.
+
+        Returns:
+            list<Subscription>: The active subscriptions, possibly empty.
+        """
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(GET_ACTIVE_SUBSCRIPTIONS)
+                return [
+                    Subscription(
+                        recipient_email=recipient_email,
+                        venue_id=venue_id,
+                        party_size=party_size,
+                        start_date=str(start_date),
+                        end_date=str(end_date),
+                        venue_name=venue_name,
+                        weekdays={int(day) for day in weekdays.split(",")} if weekdays else None,
+                        earliest_time=_format_time(earliest_time),
+                        latest_time=_format_time(latest_time),
+                    )
+                    for (recipient_email, venue_id, venue_name, party_size, start_date, end_date,
+                         weekdays, earliest_time, latest_time) in cursor.fetchall()
+                ]
+        except mysql.connector.Error as e:
+            logger.error(f"Database error occurred: {e}")
+            raise
+
+
+def _format_time(value) -> str | None:
+    """Convert a MySQL TIME value (returned as a timedelta) to 'HH:MM'."""
+    if value is None:
+        return None
+    minutes = int(value.total_seconds()) // 60
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
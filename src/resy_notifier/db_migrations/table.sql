@@ -13,4 +13,25 @@ CREATE TABLE t_venue (
     EFFECTIVE_DATE DATE NOT NULL,
     TERMINATED_DATE DATE DEFAULT NULL,
     MODIFIED_DATETIME DATETIME DEFAULT NOW()
-);
\ No newline at end of file
+);
+
+CREATE TABLE t_subscription (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    RECIPIENT_EMAIL VARCHAR(255) NOT NULL,
+    VENUE_ID INT NOT NULL,
+    PARTY_SIZE INT NOT NULL,
+    START_DATE DATE NOT NULL,
+    END_DATE DATE NOT NULL,
+    WEEKDAYS VARCHAR(13) DEFAULT NULL,   -- comma separated, Monday=0 ... Sunday=6
+    EARLIEST_TIME TIME DEFAULT NULL,
+    LATEST_TIME TIME DEFAULT NULL,
+    EFFECTIVE_DATE DATE NOT NULL,
+    TERMINATED_DATE DATE DEFAULT NULL,
+    MODIFIED_DATETIME DATETIME DEFAULT NOW()
+);
+
+-- Lookup indexes, see versions/002_add_lookup_indexes.sql
+CREATE INDEX IX_VENUE_URL_NAME ON t_venue (URL_NAME, EFFECTIVE_DATE, TERMINATED_DATE, VENUE_NAME);
+CREATE INDEX IX_API_KEYS_EFFECTIVE ON t_api_keys (EFFECTIVE_DATE, TERMINATED_DATE, API_KEY);
+CREATE INDEX IX_SUBSCRIPTION_ACTIVE ON t_subscription (END_DATE, EFFECTIVE_DATE, TERMINATED_DATE);
+CREATE INDEX IX_SUBSCRIPTION_VENUE ON t_subscription (VENUE_ID, PARTY_SIZE);
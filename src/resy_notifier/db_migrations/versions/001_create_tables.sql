@@ -0,0 +1,32 @@
+-- Baseline tables. IF NOT EXISTS lets databases built by hand from table.sql adopt the runner.
+CREATE TABLE IF NOT EXISTS resy.t_api_keys (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    API_KEY VARCHAR(255) NOT NULL,
+    EFFECTIVE_DATE DATE NOT NULL,
+    TERMINATED_DATE DATE DEFAULT NULL,
+    MODIFIED_DATETIME DATETIME DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS resy.t_venue (
+    VENUE_ID INT NOT NULL PRIMARY KEY,
+    VENUE_NAME VARCHAR(255) NOT NULL,
+    URL_NAME VARCHAR(255) NOT NULL,
+    EFFECTIVE_DATE DATE NOT NULL,
+    TERMINATED_DATE DATE DEFAULT NULL,
+    MODIFIED_DATETIME DATETIME DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS resy.t_subscription (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    RECIPIENT_EMAIL VARCHAR(255) NOT NULL,
+    VENUE_ID INT NOT NULL,
+    PARTY_SIZE INT NOT NULL,
+    START_DATE DATE NOT NULL,
+    END_DATE DATE NOT NULL,
+    WEEKDAYS VARCHAR(13) DEFAULT NULL,   -- comma separated, Monday=0 ... Sunday=6
+    EARLIEST_TIME TIME DEFAULT NULL,
+    LATEST_TIME TIME DEFAULT NULL,
+    EFFECTIVE_DATE DATE NOT NULL,
+    TERMINATED_DATE DATE DEFAULT NULL,
+    MODIFIED_DATETIME DATETIME DEFAULT NOW()
+);
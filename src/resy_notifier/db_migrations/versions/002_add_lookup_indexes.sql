@@ -0,0 +1,14 @@
+-- Covering indexes for the lookups in constants/queries.py.
+-- Secondary indexes carry the primary key, so VENUE_ID does not need to be listed.
+
+-- GET_VENUE_INFO: equality on URL_NAME, then the effective window; VENUE_NAME avoids the row lookup
+CREATE INDEX IX_VENUE_URL_NAME ON resy.t_venue (URL_NAME, EFFECTIVE_DATE, TERMINATED_DATE, VENUE_NAME);
+
+-- GET_ACTIVE_API_KEY
+CREATE INDEX IX_API_KEYS_EFFECTIVE ON resy.t_api_keys (EFFECTIVE_DATE, TERMINATED_DATE, API_KEY);
+
+-- GET_ACTIVE_SUBSCRIPTIONS: most rows are excluded by END_DATE once their window has passed
+CREATE INDEX IX_SUBSCRIPTION_ACTIVE ON resy.t_subscription (END_DATE, EFFECTIVE_DATE, TERMINATED_DATE);
+
+-- Subscribers of one venue feed, e.g. when a venue is terminated
+CREATE INDEX IX_SUBSCRIPTION_VENUE ON resy.t_subscription (VENUE_ID, PARTY_SIZE);
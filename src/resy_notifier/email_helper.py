@@ -1,12 +1,19 @@
+import logging
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import smtplib
 from dotenv import load_dotenv
 from src.resy_notifier.model.availability import Availability, get_available_days
+from src.resy_notifier.notification_store import NotificationStore
+
+logger = logging.getLogger("ResyNotifier")
 
 
 class EmailHelper:
+    # Dedup and cooldown for availability emails; None sends everything
+    notification_store = None
+
     def __init__(self):
         """
         Initialize the EmailHelper by loading credentials from environment variables.
@@ -28,13 +35,16 @@ class EmailHelper:
         if not self.smtp_server or not self.smtp_server:
             raise ValueError("SMTP Configuration is not set in environment variables.")
 
-    def send_email(self, subject: str, body: str):
+        self.notification_store = NotificationStore.from_env()
+
+    def send_email(self, subject: str, body: str, recipient: str = None):
         """
         Send an email using the loaded credentials.
 
         Args:
             subject (str): The subject of the email.
             body (str): The body of the email.
+            recipient (str): Overrides RECIPIENT_EMAIL, e.g. for a subscriber.
 
         Raises:
             ValueError: If any required parameter is missing.
@@ -47,7 +57,7 @@ class EmailHelper:
             # Create the email message
             msg = MIMEMultipart()
             msg["From"] = self.sender_email
-            msg["To"] = self.recipient_email
+            msg["To"] = recipient or self.recipient_email
             msg["Subject"] = subject
             msg.attach(MIMEText(body, "plain"))
 
@@ -57,19 +67,25 @@ class EmailHelper:
                 server.login(self.sender_email, self.sender_password)
                 server.send_message(msg)
 
-            print(f"Email sent successfully")
+            logger.info(f"Email sent successfully to {msg['To']}")
 
         except Exception as e:
             raise Exception(f"Error sending email: {e}")
 
-    def check_and_notify_availability(self, venue_name: str, availabilities: list[Availability]):
+    def check_and_notify_availability(self, venue_name: str, availabilities: list[Availability], recipient: str = None,
+                                      party_size: int = None):
         """
         Check availability in the calendar and send email notifications if available.
 
+        Dates already sent to the recipient are skipped, as decided by the notification store.
+
         Args:
             venue_name (str): The name of the venue.
             availabilities (list<Availability>): The parsed availability data returned by the API.
+            recipient (str): Overrides RECIPIENT_EMAIL, e.g. for a subscriber.
+            party_size (int): Part of the dedup key, if known.
         """
+        availabilities = self._admit(recipient, venue_name, party_size, availabilities)
         available_days = get_available_days(availabilities)
 
         # If no days are available, do nothing
@@ -82,4 +98,93 @@ class EmailHelper:
                 f"Good news! There are available reservations for {venue_name}.\n\n"
                 f"Details:\n\n" + "\n\n".join(available_days)
         )
-        self.send_email(subject, body)
\ No newline at end of file
+        self._send_admitted(subject, body, recipient, party_size, [(venue_name, availabilities)])
+
+    def notify_group_availability(self, group_name: str, venues: list[tuple], recipient: str = None,
+                                  party_size: int = None):
+        """
+        Send one email covering every venue of a group that has availability.
+
+        Args:
+            group_name (str): The name of the venue group.
+            venues (list<tuple>): (venue_name, list<Availability>) pairs.
+            recipient (str): Overrides RECIPIENT_EMAIL, e.g. for a subscriber.
+            party_size (int): Part of the dedup key, if known.
+        """
+        sections = []
+        admitted = []
+        for venue_name, availabilities in venues:
+            availabilities = self._admit(recipient, venue_name, party_size, availabilities)
+            available_days = get_available_days(availabilities)
+            if available_days:
+                sections.append(f"{venue_name}:\n\n" + "\n\n".join(available_days))
+                admitted.append((venue_name, availabilities))
+
+        # If no venue has available days, do nothing
+        if not sections:
+            return
+
+        subject = f"Reservation Availability for {group_name}"
+        body = (
+                f"Good news! There are available reservations for {group_name}.\n\n"
+                f"Details:\n\n" + "\n\n".join(sections)
+        )
+        self._send_admitted(subject, body, recipient, party_size, admitted)
+
+    def observe_availability(self, venue_name: str, availabilities: list[Availability], recipient: str = None,
+                             party_size: int = None):
+        """
+        Tell the notification store which days are still available, so dates that stay open are not emailed
+        again after a brief sell-out. Call it with every polled calendar, after notifying its new days.
+
+        Args:
+            venue_name (str): The name of the venue.
+            availabilities (list<Availability>): The parsed availability data returned by the API.
+            recipient (str): Overrides RECIPIENT_EMAIL, e.g. for a subscriber.
+            party_size (int): Part of the dedup key, if known.
+        """
+        if self.notification_store is not None:
+            self.notification_store.observe(recipient or self.recipient_email, venue_name, party_size, availabilities)
+
+    def flush_pending(self) -> int:
+        """
+        Send the dates the notification store held back (hourly limit or a failed send) to every recipient
+        that has room again. Call it regularly, e.g. once per poll.
+
+        Returns:
+            int: Number of emails attempted.
+        """
+        if self.notification_store is None:
+            return 0
+        attempted = 0
+        for recipient, venue_name, party_size in self.notification_store.pending():
+            try:
+                self.check_and_notify_availability(venue_name, [], recipient, party_size)
+            except Exception as e:
+                logger.error(f"Failed to send held-back dates for {venue_name} to {recipient}: {e}")
+            attempted += 1
+        return attempted
+
+    def _send_admitted(self, subject, body, recipient, party_size, admitted):
+        """Send, then record the admitted days as sent, or queue them again if sending fails."""
+        try:
+            self.send_email(subject, body, recipient)
+        except Exception:
+            if self.notification_store is not None:
+                for venue_name, availabilities in admitted:
+                    self.notification_store.release(
+                        recipient or self.recipient_email, venue_name, party_size, availabilities
+                    )
+            raise
+        if self.notification_store is not None:
+            for venue_name, availabilities in admitted:
+                self.notification_store.commit(
+                    recipient or self.recipient_email, venue_name, party_size, availabilities
+                )
+
+    def _admit(self, recipient, venue_name, party_size, availabilities):
+        if self.notification_store is None:
+            return availabilities
+        return self.notification_store.admit(
+            recipient or self.recipient_email, venue_name, party_size, availabilities
+        )
@@ -0,0 +1,264 @@
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from src.resy_notifier.model.availability import Availability
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class AvailabilityEvent:
+    """
+    A change in the reservation status of one date at one venue.
+    """
+    def __init__(self, venue_id: int, venue_name: str, party_size: int, date: str, old_status: str | None,
+                 new_status: str, observed_at: float):
+        """
+        Args:
+            old_status (str): The previous reservation status, or None the first time the date is seen.
+            new_status (str): The reservation status now, e.g. "available" or "sold-out".
+            observed_at (float): Epoch seconds at which the calendar showing the change was received.
+        """
+        self.venue_id = venue_id
+        self.venue_name = venue_name
+        self.party_size = party_size
+        self.date = date
+        self.old_status = old_status
+        self.new_status = new_status
+        self.observed_at = observed_at
+        # Assigned by EventFeed.publish
+        self.id = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "venue_id": self.venue_id,
+            "venue_name": self.venue_name,
+            "party_size": self.party_size,
+            "date": self.date,
+            "old_status": self.old_status,
+            "new_status": self.new_status,
+            "observed_at": round(self.observed_at, 3),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def __repr__(self):
+        return (f"AvailabilityEvent(venue_id={self.venue_id}, date={self.date}, party_size={self.party_size}, "
+                f"old_status={self.old_status}, new_status={self.new_status})")
+
+
+def availability_events(previous: list[Availability] | None, current: list[Availability], venue_id: int,
+                        venue_name: str, party_size: int, observed_at: float = None) -> list[AvailabilityEvent]:
+    """
+    Compare two calendars and describe every date whose reservation status changed.
+
+    Only dates in `current` are compared, so `current` may be one chunk of a longer range, and dates that
+    roll out of the window produce no event.
+
+    Args:
+        previous (list<Availability>): The last calendar, or None if this is the first poll.
+        current (list<Availability>): The calendar just fetched.
+        observed_at (float): Epoch seconds the calendar was received. Defaults to now.
+
+    Returns:
+        list<AvailabilityEvent>: One event per changed date, in calendar order.
+    """
+    observed_at = time.time() if observed_at is None else observed_at
+    before = {day.date: day.inventory.reservation for day in previous or []}
+    return [
+        AvailabilityEvent(venue_id, venue_name, party_size, day.date, before.get(day.date),
+                          day.inventory.reservation, observed_at)
+        for day in current
+        if before.get(day.date) != day.inventory.reservation
+    ]
+
+
+class EventSubscription:
+    """
+    A consumer's bounded buffer of events. Closed by the feed if the consumer falls behind.
+    """
+    def __init__(self, max_buffer: int = 256):
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._closed = threading.Event()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def get(self, timeout: float = None) -> AvailabilityEvent | None:
+        """
+        Returns:
+            AvailabilityEvent: The next event, or None on timeout or once the subscription is closed.
+        """
+        if self.closed:
+            return None
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._closed.set()
+
+    def _offer(self, event: AvailabilityEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+
+class EventFeed:
+    """
+    Fans availability change events out to an NDJSON stream and to any number of subscribers.
+
+    Publishing never blocks on a consumer. Each subscriber has its own bounded buffer; a subscriber whose
+    buffer is full when an event arrives is dropped rather than slowing the poller down or growing memory.
+    """
+    def __init__(self, stream=None, max_buffer: int = 256):
+        """
+        Args:
+            stream (file): Optional text stream, e.g. sys.stdout or an open file; every event is written to it
+                as one JSON line and flushed.
+            max_buffer (int): Default buffer size of a subscription, in events.
+        """
+        if max_buffer < 1:
+            raise ValueError("max_buffer must be at least 1.")
+        self.stream = stream
+        self.max_buffer = max_buffer
+        self._ids = itertools.count(1)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.stats = {"published": 0, "dropped_subscribers": 0}
+
+    def publish(self, events: list[AvailabilityEvent]):
+        """Number the events, write them to the stream and hand them to every subscriber."""
+        if not events:
+            return
+        with self._lock:
+            for event in events:
+                event.id = next(self._ids)
+            self.stats["published"] += len(events)
+            if self.stream is not None:
+                try:
+                    self.stream.write("".join(event.to_json() + "\n" for event in events))
+                    self.stream.flush()
+                except (OSError, ValueError) as e:
+                    logger.error(f"Event stream closed, no longer writing events: {e}")
+                    self.stream = None
+            for subscription in list(self._subscribers):
+                if not all(subscription._offer(event) for event in events):
+                    self._drop(subscription)
+
+    def subscribe(self, max_buffer: int = None) -> EventSubscription:
+        """Register a consumer for events published from now on."""
+        subscription = EventSubscription(max_buffer or self.max_buffer)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+        subscription.close()
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def _drop(self, subscription: EventSubscription):
+        self._subscribers.discard(subscription)
+        subscription.close()
+        self.stats["dropped_subscribers"] += 1
+        logger.warning("Dropped a slow event subscriber whose buffer was full")
+
+
+class EventStreamHandler(BaseHTTPRequestHandler):
+    """
+    Serves an EventFeed to downstream consumers.
+
+    GET /events
+        streams every event as Server-Sent Events (`id`, `event: availability`, `data: <json>`), with a
+        comment line as a keep-alive. The stream ends if the client falls behind its buffer.
+    GET /stats
+        returns published and dropped-subscriber counters and the number of subscribers.
+    """
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def feed(self) -> EventFeed:
+        return self.server.feed
+
+    def log_message(self, format, *args):
+        logger.debug(f"Event stream {self.address_string()} {format % args}")
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/events":
+            self._stream()
+        elif path == "/stats":
+            self._reply(200, dict(self.feed.stats, subscribers=self.feed.subscriber_count()))
+        else:
+            self._reply(404, {"error": "Not found."})
+
+    def _stream(self):
+        subscription = self.feed.subscribe()
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(b": connected\n\n")
+            self.wfile.flush()
+            while not self.server.stopping.is_set():
+                event = subscription.get(timeout=self.server.heartbeat)
+                if subscription.closed:
+                    break
+                if event is None:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    self.wfile.write(f"id: {event.id}\nevent: availability\ndata: {event.to_json()}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.feed.unsubscribe(subscription)
+
+    def _reply(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class EventStreamServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server exposing an EventFeed over Server-Sent Events.
+    """
+    daemon_threads = True
+
+    def __init__(self, feed: EventFeed, host: str = "127.0.0.1", port: int = 8087, heartbeat: float = 15.0):
+        """
+        Args:
+            heartbeat (float): Seconds of silence after which a keep-alive comment is sent to each client.
+        """
+        self.feed = feed
+        self.heartbeat = heartbeat
+        self.stopping = threading.Event()
+        super().__init__((host, port), EventStreamHandler)
+
+    def shutdown(self):
+        # Open streams would otherwise run until their next keep-alive fails
+        self.stopping.set()
+        super().shutdown()
@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import os
+import re
+
+from src.resy_notifier.constants.queries import (
+    CREATE_MIGRATION_TABLE, CREATE_SCHEMA, GET_APPLIED_MIGRATIONS, INDEX_EXISTS, INSERT_MIGRATION
+)
+from src.resy_notifier.db_manager import DatabaseManager
+
+logger = logging.getLogger("ResyNotifier")
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(__file__), "db_migrations", "versions")
+_FILE_NAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+_CREATE_INDEX = re.compile(r"^CREATE\s+(?:UNIQUE\s+)?INDEX\s+`?(\w+)`?\s+ON\s+(?:`?(\w+)`?\.)?`?(\w+)`?", re.I)
+
+
+class Migration:
+    """
+    One versioned script, e.g. `002_add_lookup_indexes.sql`.
+    """
+    def __init__(self, version: int, name: str, sql: str):
+        self.version = version
+        self.name = name
+        self.sql = sql
+        self.checksum = hashlib.sha256(sql.encode()).hexdigest()
+
+    @property
+    def statements(self) -> list[str]:
+        """The script split into statements, with `--` comments removed. Quoted text is kept as is."""
+        return split_statements(self.sql)
+
+    def __repr__(self):
+        return f"Migration(version={self.version}, name={self.name})"
+
+
+def split_statements(sql: str) -> list[str]:
+    """
+    Split a script on `;`, dropping `--` comments, except inside quoted strings and identifiers.
+
+    Returns:
+        list<str>: The non-empty statements, stripped.
+    """
+    statements, current = [], []
+    quote = None
+    index = 0
+    while index < len(sql):
+        char = sql[index]
+        if quote:
+            current.append(char)
+            if char == "\\" and quote != "`" and index + 1 < len(sql):
+                current.append(sql[index + 1])
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in "'\"`":
+            quote = char
+            current.append(char)
+        elif sql.startswith("--", index):
+            newline = sql.find("\n", index)
+            index = len(sql) if newline == -1 else newline
+            continue
+        elif char == ";":
+            statements.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+        index += 1
+    statements.append("".join(current))
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def load_migrations(directory: str = MIGRATIONS_DIRECTORY) -> list[Migration]:
+    """
+    Read every `<version>_<name>.sql` script in a directory.
+
+    Returns:
+        list<Migration>: Sorted by version.
+
+    Raises:
+        ValueError: If two scripts share a version.
+    """
+    migrations = {}
+    for file_name in os.listdir(directory):
+        match = _FILE_NAME.match(file_name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {file_name}")
+        with open(os.path.join(directory, file_name)) as f:
+            migrations[version] = Migration(version, match.group(2), f.read())
+    return [migrations[version] for version in sorted(migrations)]
+
+
+class MigrationRunner:
+    """
+    Applies versioned SQL scripts that have not yet been recorded in `resy.t_schema_migration`.
+
+    Each script is recorded with a checksum once it succeeds. MySQL commits DDL implicitly, so a script
+    that fails halfway is not rolled back; it stays pending and must be fixed up by hand before rerunning.
+
+    MySQL has no `CREATE INDEX IF NOT EXISTS`, so a `CREATE INDEX` whose index already exists (e.g. in a
+    database built by hand from table.sql) is skipped rather than failing the script.
+    """
+    def __init__(self, db_manager: DatabaseManager, directory: str = MIGRATIONS_DIRECTORY):
+        self.db_manager = db_manager
+        self.directory = directory
+
+    def pending(self) -> list[Migration]:
+        """
+        Returns:
+            list<Migration>: Scripts not yet applied, in version order.
+
+        Raises:
+            ValueError: If an applied script has been edited since it ran.
+        """
+        with self.db_manager.connect() as conn:
+            cursor = conn.cursor()
+            return self._pending(cursor)
+
+    def migrate(self, dry_run: bool = False) -> list[Migration]:
+        """
+        Apply every pending script in version order.
+
+        Args:
+            dry_run (bool): Only report what would be applied.
+
+        Returns:
+            list<Migration>: The scripts applied (or that would be applied).
+
+        Raises:
+            ValueError: If an applied script has been edited since it ran.
+        """
+        with self.db_manager.connect() as conn:
+            cursor = conn.cursor()
+            pending = self._pending(cursor)
+            if dry_run:
+                return pending
+            for migration in pending:
+                logger.info(f"Applying migration {migration.version} {migration.name}")
+                for statement in migration.statements:
+                    if self._index_exists(cursor, statement):
+                        logger.info(f"Skipping existing index in migration {migration.version}: {statement}")
+                        continue
+                    cursor.execute(statement)
+                cursor.execute(INSERT_MIGRATION, (migration.version, migration.name, migration.checksum))
+                conn.commit()
+            return pending
+
+    @staticmethod
+    def _index_exists(cursor, statement: str) -> bool:
+        match = _CREATE_INDEX.match(statement)
+        if not match:
+            return False
+        index_name, schema, table = match.groups()
+        cursor.execute(INDEX_EXISTS, (schema, table, index_name))
+        return cursor.fetchone()[0] > 0
+
+    def _pending(self, cursor) -> list[Migration]:
+        cursor.execute(CREATE_SCHEMA)
+        cursor.execute(CREATE_MIGRATION_TABLE)
+        cursor.execute(GET_APPLIED_MIGRATIONS)
+        applied = dict(cursor.fetchall())
+
+        pending = []
+        for migration in load_migrations(self.directory):
+            checksum = applied.get(migration.version)
+            if checksum is None:
+                pending.append(migration)
+            elif checksum != migration.checksum:
+                raise ValueError(
+                    f"Migration {migration.version} {migration.name} was changed after it was applied. "
+                    f"Add a new migration instead."
+                )
+        return pending
@@ -25,6 +25,37 @@ class Availability:
     def __repr__(self):
         return f"Availability(date={self.date}, inventory={self.inventory})"
 
+    def to_dict(self) -> dict:
+        """Serialize back to the `scheduled` entry shape used by the calendar API."""
+        return {
+            "date": self.date,
+            "inventory": {
+                "reservation": self.inventory.reservation,
+                "event": self.inventory.event,
+                "walk-in": self.inventory.walk_in,
+            },
+        }
+
+
+class AvailabilityResult:
+    """
+    Outcome of one query in a batch: either the parsed availability or the error it raised.
+    """
+    def __init__(self, index: int, request: tuple, availability: List[Availability] = None,
+                 error: Exception = None):
+        self.index = index
+        self.request = request
+        self.availability = availability
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        outcome = f"error={self.error}" if self.error else f"availability={self.availability}"
+        return f"AvailabilityResult(index={self.index}, request={self.request}, {outcome})"
+
 
 def parse_response(data: dict) -> List[Availability]:
     """
@@ -60,3 +91,22 @@ def get_available_days(availabilities: list[Availability]) -> list[str] :
                 f"- Walk-in: {day.inventory.walk_in}\n"
             )
     return available_days
+
+def get_newly_available(previous: list[Availability] | None, current: list[Availability]) -> list[Availability]:
+    """
+    Diff two calendar snapshots and return the days that became available.
+
+    Args:
+        previous (list<Availability>): The last snapshot, or None if there is none yet.
+        current (list<Availability>): The snapshot just fetched.
+
+    Returns:
+        list<Availability>: Days available in `current` that were not available in `previous`.
+    """
+    previously_available = set()
+    if previous:
+        previously_available = {day.date for day in previous if day.inventory.reservation == "available"}
+    return [
+        day for day in current
+        if day.inventory.reservation == "available" and day.date not in previously_available
+    ]
@@ -0,0 +1,63 @@
+from datetime import datetime, time
+from typing import List, Optional
+
+
+class Slot:
+    """
+    Represents a single bookable time slot returned by the find endpoint.
+    """
+    def __init__(self, config_id: str, start: str, seating_type: str = ""):
+        self.config_id = config_id
+        self.start = start
+        self.seating_type = seating_type
+
+    @property
+    def day(self) -> str:
+        """The slot's date in 'YYYY-MM-DD' format."""
+        return self.start[:10]
+
+    @property
+    def time(self) -> str:
+        """The slot's start time in 'HH:MM' format."""
+        return self.start[11:16]
+
+    def __repr__(self):
+        return f"Slot(start={self.start}, seating_type={self.seating_type})"
+
+
+def parse_slots(data: dict) -> List[Slot]:
+    """
+    Parse the find endpoint JSON into a list of Slot objects.
+    """
+    if not isinstance(data, dict) or "results" not in data:
+        raise ValueError("Invalid response format: 'results' key missing.")
+
+    slots = []
+    for venue in data["results"].get("venues", []):
+        for item in venue.get("slots", []):
+            if "config" not in item or "date" not in item:
+                raise ValueError("Invalid response format: Missing 'config' or 'date' key.")
+            slots.append(Slot(
+                config_id=item["config"]["token"],
+                start=item["date"]["start"],
+                seating_type=item["config"].get("type", ""),
+            ))
+    return slots
+
+
+def parse_time(value: Optional[str]) -> Optional[time]:
+    """
+    Parse a time of day in 'HH:MM' format, as used by slot times and time filters.
+
+    Returns:
+        time: The parsed time, or None if `value` is empty.
+
+    Raises:
+        ValueError: If the value is not 'HH:MM'.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%H:%M").time()
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}'. Use 'HH:MM', e.g. 18:30.")
@@ -0,0 +1,86 @@
+from datetime import date
+from typing import Optional
+
+from src.resy_notifier.model.slot import parse_time
+
+
+class Subscription:
+    """
+    Represents one subscriber's interest in a (venue_id, party_size) feed.
+    """
+    def __init__(
+            self,
+            recipient_email: str,
+            venue_id: int,
+            party_size: int,
+            start_date: str,
+            end_date: str,
+            venue_name: str = "",
+            weekdays: Optional[set[int]] = None,
+            earliest_time: Optional[str] = None,
+            latest_time: Optional[str] = None,
+    ):
+        """
+        Args:
+            recipient_email (str): Where notifications for this subscription are sent.
+            venue_id (int): The ID of the venue.
+            party_size (int): Number of guests.
+            start_date (str): First date of interest in 'YYYY-MM-DD' format.
+            end_date (str): Last date of interest in 'YYYY-MM-DD' format (inclusive).
+            venue_name (str): Display name used in notifications.
+            weekdays (set<int>): Allowed weekdays (Monday=0 ... Sunday=6). None allows every day.
+            earliest_time (str): Earliest acceptable slot time in 'HH:MM' format, or None.
+            latest_time (str): Latest acceptable slot time in 'HH:MM' format, or None.
+
+        Raises:
+            ValueError: If the date window is empty, a weekday is out of range or a time is not 'HH:MM'.
+        """
+        self.recipient_email = recipient_email
+        self.venue_id = venue_id
+        self.party_size = party_size
+        self.start_date = start_date
+        self.end_date = end_date
+        self.venue_name = venue_name
+        self.weekdays = set(weekdays) if weekdays else None
+        self.earliest_time = earliest_time
+        self.latest_time = latest_time
+
+        self.start_ordinal = date.fromisoformat(start_date).toordinal()
+        self.end_ordinal = date.fromisoformat(end_date).toordinal()
+        if self.end_ordinal < self.start_ordinal:
+            raise ValueError("Subscription end_date must not be before start_date.")
+        if self.weekdays and not self.weekdays <= set(range(7)):
+            raise ValueError("Subscription weekdays must be between 0 (Monday) and 6 (Sunday).")
+        self._earliest = parse_time(earliest_time)
+        self._latest = parse_time(latest_time)
+
+    @property
+    def feed_key(self) -> tuple:
+        """The (venue_id, party_size) feed this subscription attaches to."""
+        return self.venue_id, self.party_size
+
+    @property
+    def has_time_filter(self) -> bool:
+        """Whether only some slot times are of interest, which the day-level calendar cannot tell."""
+        return self._earliest is not None or self._latest is not None
+
+    def matches_time(self, slot_time: str) -> bool:
+        """
+        Check whether a slot time is inside this subscription's time filter.
+
+        Args:
+            slot_time (str): Time in 'HH:MM' (or 'HH:MM:SS') format.
+        """
+        parsed = parse_time(slot_time[:5])
+        if self._earliest and parsed < self._earliest:
+            return False
+        if self._latest and parsed > self._latest:
+            return False
+        return True
+
+    def __repr__(self):
+        return (
+            f"Subscription(recipient_email={self.recipient_email}, venue_id={self.venue_id}, "
+            f"party_size={self.party_size}, start_date={self.start_date}, end_date={self.end_date})"
+        )
+
@@ -0,0 +1,95 @@
+class Watch:
+    """
+    Represents one venue/party size/date range being polled by the watch engine.
+    """
+    def __init__(self, venue_id: int, venue_name: str, party_size: int = 2, start_date: str = None,
+                 end_date: str = None, request_interval: float = 60.0, weight: float = 1.0):
+        """
+        Args:
+            venue_id (int): The ID of the venue.
+            venue_name (str): Display name used in notifications and logs.
+            party_size (int): Number of guests.
+            start_date (str): Start date in 'YYYY-MM-DD' format, or None for today.
+            end_date (str): End date in 'YYYY-MM-DD' format, or None for the client default.
+            request_interval (float): Shortest interval (seconds) the watch wants to be polled at.
+            weight (float): Priority weight when the request budget is shared.
+
+        Raises:
+            ValueError: If the weight or interval is not positive.
+        """
+        if weight <= 0:
+            raise ValueError("Watch weight must be positive.")
+        if request_interval <= 0:
+            raise ValueError("Watch request_interval must be positive.")
+        self.venue_id = venue_id
+        self.venue_name = venue_name
+        self.party_size = party_size
+        self.start_date = start_date
+        self.end_date = end_date
+        self.request_interval = request_interval
+        self.weight = weight
+
+        # Runtime state
+        self.last_snapshot = None
+        self.last_poll_at = None
+        self.last_latency_ms = None
+        self.polls = 0
+        self.errors = 0
+        self.paused = False
+
+    @property
+    def key(self) -> str:
+        return f"{self.venue_id}:{self.party_size}:{self.start_date}:{self.end_date}"
+
+    @property
+    def cost(self) -> int:
+        """Requests one poll of this watch can send."""
+        return 1
+
+    def __repr__(self):
+        return (
+            f"Watch(venue_id={self.venue_id}, party_size={self.party_size}, start_date={self.start_date}, "
+            f"end_date={self.end_date}, request_interval={self.request_interval}, weight={self.weight})"
+        )
+
+
+class GroupWatch(Watch):
+    """
+    Watches several venues for the same party size and dates, and is satisfied by the first one with availability.
+    """
+    def __init__(self, name: str, members: list[tuple], party_size: int = 2, start_date: str = None,
+                 end_date: str = None, request_interval: float = 60.0, weight: float = 1.0,
+                 concurrency: int = 2, stop_on_match: bool = True):
+        """
+        Args:
+            name (str): Display name of the group, e.g. "Pizza on Friday".
+            members (list<tuple>): (venue_id, venue_name) pairs in order of preference.
+            concurrency (int): Member requests in flight at once; queued members are cancelled on a match.
+            stop_on_match (bool): Remove the watch once a member has availability.
+
+        Raises:
+            ValueError: If there are no members.
+        """
+        if not members:
+            raise ValueError("A group watch needs at least one venue.")
+        super().__init__(None, name, party_size, start_date, end_date, request_interval, weight)
+        self.name = name
+        self.members = list(members)
+        self.concurrency = max(1, concurrency)
+        self.stop_on_match = stop_on_match
+        self.snapshots = {}
+        self.satisfied = False
+
+    @property
+    def key(self) -> str:
+        return f"group:{self.name}:{self.party_size}:{self.start_date}:{self.end_date}"
+
+    @property
+    def cost(self) -> int:
+        return len(self.members)
+
+    def __repr__(self):
+        return (
+            f"GroupWatch(name={self.name}, venues={[venue_name for _, venue_name in self.members]}, "
+            f"party_size={self.party_size}, start_date={self.start_date}, end_date={self.end_date})"
+        )
@@ -0,0 +1,267 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from src.resy_notifier.checkpoint import atomic_write_json
+from src.resy_notifier.model.availability import Availability
+
+logger = logging.getLogger("ResyNotifier")
+
+STORE_VERSION = 1
+
+
+class _Sent:
+    __slots__ = ("notified_at", "seen_at")
+
+    def __init__(self, notified_at: float, seen_at: float):
+        self.notified_at = notified_at
+        self.seen_at = seen_at
+
+
+class NotificationStore:
+    """
+    Remembers which (recipient, venue, date, party size) have been emailed, so the same opening is sent once.
+
+    A date that was notified is only notified again once both hold:
+    - `cooldown` seconds have passed since it was last notified, and
+    - it has not been reported available for `rearm_after` seconds (hysteresis), so a date that flips between
+      available and sold-out on every poll does not cause an email each time it comes back.
+
+    Sending is two-phase: `admit` picks the dates to send, and the caller reports the outcome with `commit`
+    (sent) or `release` (the send failed). Only committed dates are recorded. On top of that, each recipient
+    gets at most `max_per_hour` emails in any rolling hour. Dates held back by that limit or by a failed send
+    are queued in memory for `pending_ttl` seconds; `pending` lists the ones whose recipient has room again,
+    and the next `admit` for the same recipient, venue and party size includes them.
+
+    Callers usually pass only newly available days to `admit`, so they must also report every calendar they
+    poll with `observe`; otherwise a date that stays open is never seen again and the rearm window never moves.
+
+    Entries are kept in an LRU bounded by `max_entries`, and optionally persisted to a JSON file.
+    """
+    def __init__(self, cooldown: float = 3600.0, rearm_after: float = 900.0, max_per_hour: int = 20,
+                 max_entries: int = 10000, path: str = None, clock=time.time, pending_ttl: float = 7200.0):
+        """
+        Args:
+            cooldown (float): Minimum seconds between two notifications of the same key.
+            rearm_after (float): Seconds a date must go unreported before it can be notified again.
+            max_per_hour (int): Emails per recipient per rolling hour, or None for no limit.
+            max_entries (int): Least recently seen keys beyond this are forgotten; also bounds the pending queue.
+            path (str): Optional JSON file the store is loaded from and saved to.
+            clock (callable): Wall-clock time source; persisted times must survive restarts.
+            pending_ttl (float): Seconds a held-back date stays queued before it is considered stale. Longer
+                than an hour, so a date held back by `max_per_hour` is still queued when room comes back.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.cooldown = cooldown
+        self.rearm_after = rearm_after
+        self.max_per_hour = max_per_hour
+        self.max_entries = max_entries
+        self.path = path
+        self.clock = clock
+        self.pending_ttl = pending_ttl
+        self._entries = OrderedDict()
+        self._recent = {}
+        # key -> (Availability, queued_at) for dates held back; key -> reserved send time for dates being sent
+        self._pending = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.stats = {"admitted": 0, "duplicates": 0, "rate_limited": 0, "failed": 0}
+        if path:
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> "NotificationStore":
+        """
+        Build a store from `NOTIFY_COOLDOWN_MINUTES`, `NOTIFY_REARM_MINUTES`, `NOTIFY_MAX_PER_HOUR` and
+        `NOTIFY_STORE_PATH`, falling back to the defaults.
+        """
+        max_per_hour = os.getenv("NOTIFY_MAX_PER_HOUR")
+        return cls(
+            cooldown=float(os.getenv("NOTIFY_COOLDOWN_MINUTES", 60)) * 60,
+            rearm_after=float(os.getenv("NOTIFY_REARM_MINUTES", 15)) * 60,
+            max_per_hour=int(max_per_hour) if max_per_hour else 20,
+            path=os.getenv("NOTIFY_STORE_PATH") or None,
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def admit(self, recipient: str, venue: str, party_size, availabilities: list[Availability]) -> list[Availability]:
+        """
+        Pick the available days that should be emailed now, including days queued for the same recipient,
+        venue and party size.
+
+        Call this right before sending, and then `commit` or `release` the result if it is not empty. Until
+        then the days count as being sent, so a concurrent caller does not send them too.
+
+        Args:
+            recipient (str): Who the email goes to.
+            venue (str): Venue identifier, e.g. its name.
+            party_size (int): Number of guests, or None if unknown.
+            availabilities (list<Availability>): The days about to be notified; days that are not available
+                are ignored.
+
+        Returns:
+            list<Availability>: The days to notify, possibly empty.
+        """
+        now = self.clock()
+        with self._lock:
+            candidates = OrderedDict(
+                (day.date, day) for day in availabilities if day.inventory.reservation == "available"
+            )
+            for key, (day, queued_at) in list(self._pending.items()):
+                if key[0] == recipient and key[1] == venue and key[3] == party_size:
+                    if now - queued_at >= self.pending_ttl:
+                        del self._pending[key]
+                    else:
+                        candidates.setdefault(day.date, day)
+
+            due, keys = [], []
+            for day in candidates.values():
+                key = (recipient, venue, day.date, party_size)
+                entry = self._entries.get(key)
+                if key in self._in_flight:
+                    self.stats["duplicates"] += 1
+                elif entry is None or (now - entry.notified_at >= self.cooldown
+                                       and now - entry.seen_at >= self.rearm_after):
+                    due.append(day)
+                    keys.append(key)
+                else:
+                    # Still (or again) available: push the rearm point out
+                    entry.seen_at = now
+                    self._entries.move_to_end(key)
+                    self._pending.pop(key, None)
+                    self.stats["duplicates"] += 1
+            if not due:
+                return []
+
+            recent = self._recent.setdefault(recipient, deque())
+            while recent and now - recent[0] >= 3600:
+                recent.popleft()
+            if self.max_per_hour is not None and len(recent) >= self.max_per_hour:
+                self.stats["rate_limited"] += len(due)
+                logger.warning(f"Holding back {len(due)} dates for {recipient}: {self.max_per_hour} emails/hour")
+                for key, day in zip(keys, due):
+                    self._queue(key, day, now)
+                return []
+
+            # Reserve the send so concurrent emails to the recipient count against the limit
+            recent.append(now)
+            for key in keys:
+                self._pending.pop(key, None)
+                self._in_flight[key] = now
+        return due
+
+    def observe(self, recipient: str, venue: str, party_size, availabilities: list[Availability]):
+        """
+        Report days that are available right now, so notified days that stay open keep being held back.
+
+        Call it with every calendar polled, after notifying the newly available days of that poll; days that
+        were never notified to the recipient are ignored.
+
+        Args:
+            recipient (str): Who the email goes to.
+            venue (str): Venue identifier, e.g. its name.
+            party_size (int): Number of guests, or None if unknown.
+            availabilities (list<Availability>): The polled calendar, or the part of it the recipient follows.
+        """
+        now = self.clock()
+        with self._lock:
+            for day in availabilities:
+                if day.inventory.reservation != "available":
+                    continue
+                entry = self._entries.get((recipient, venue, day.date, party_size))
+                if entry is not None:
+                    entry.seen_at = now
+                    self._entries.move_to_end((recipient, venue, day.date, party_size))
+
+    def commit(self, recipient: str, venue: str, party_size, availabilities: list[Availability]):
+        """Record days returned by `admit` as sent."""
+        now = self.clock()
+        with self._lock:
+            for day in availabilities:
+                key = (recipient, venue, day.date, party_size)
+                self._in_flight.pop(key, None)
+                self._entries[key] = _Sent(now, now)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats["admitted"] += len(availabilities)
+        if self.path:
+            self.save()
+
+    def release(self, recipient: str, venue: str, party_size, availabilities: list[Availability]):
+        """Queue days returned by `admit` again because their email could not be sent."""
+        now = self.clock()
+        with self._lock:
+            reserved = None
+            for day in availabilities:
+                key = (recipient, venue, day.date, party_size)
+                reserved = self._in_flight.pop(key, reserved)
+                self._queue(key, day, now)
+            recent = self._recent.get(recipient)
+            if recent and reserved in recent:
+                recent.remove(reserved)
+            self.stats["failed"] += len(availabilities)
+
+    def pending(self) -> list[tuple]:
+        """
+        List the queued notifications that can be sent now because their recipient has room again.
+
+        Returns:
+            list<tuple>: Distinct (recipient, venue, party_size); pass each to `admit` with no days.
+        """
+        now = self.clock()
+        with self._lock:
+            ready = []
+            for key, (day, queued_at) in list(self._pending.items()):
+                if now - queued_at >= self.pending_ttl:
+                    del self._pending[key]
+                    continue
+                recipient, venue, _, party_size = key
+                sent_last_hour = sum(1 for sent_at in self._recent.get(recipient, ()) if now - sent_at < 3600)
+                room = self.max_per_hour is None or sent_last_hour < self.max_per_hour
+                if room and (recipient, venue, party_size) not in ready:
+                    ready.append((recipient, venue, party_size))
+            return ready
+
+    def _queue(self, key: tuple, day: Availability, now: float):
+        _, queued_at = self._pending.get(key, (None, now))
+        self._pending[key] = (day, queued_at)
+        while len(self._pending) > self.max_entries:
+            self._pending.popitem(last=False)
+
+    def save(self):
+        """Write the store to `path` through a temporary file and atomically replace it."""
+        with self._lock:
+            payload = {
+                "version": STORE_VERSION,
+                "entries": [[*key, entry.notified_at, entry.seen_at] for key, entry in self._entries.items()],
+            }
+        atomic_write_json(self.path, payload, ".notifications-")
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable notification store {self.path}: {e}")
+            return
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION:
+            logger.warning(f"Ignoring notification store {self.path} with unsupported version")
+            return
+
+        now = self.clock()
+        for recipient, venue, date, party_size, notified_at, seen_at in data.get("entries", []):
+            # Entries that could be notified again anyway carry no information
+            if now - notified_at >= self.cooldown and now - seen_at >= self.rearm_after:
+                continue
+            self._entries[(recipient, venue, date, party_size)] = _Sent(notified_at, seen_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,358 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+import weakref
+
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.email_helper import EmailHelper
+from src.resy_notifier.event_feed import EventFeed, availability_events
+from src.resy_notifier.model.availability import get_newly_available, parse_response
+
+logger = logging.getLogger("ResyNotifier")
+
+# Marks the end of the stream in a stage's input queue
+_DONE = object()
+_POLL_TIMEOUT = 0.1
+
+
+class Stage:
+    """
+    One step of a Pipeline: a function applied to every item by its own pool of worker threads.
+    """
+    def __init__(self, name: str, fn, workers: int = 1, buffer_size: int = 16):
+        """
+        Args:
+            name (str): Used in logs and stats.
+            fn (callable): Called with an item; returns the item to pass on, or None to drop it.
+            workers (int): Threads running `fn` concurrently. Items may be reordered when above 1.
+            buffer_size (int): Capacity of the queue feeding this stage. A full queue blocks the stage
+                before it, so a slow stage applies backpressure upstream instead of buffering without bound.
+
+        Raises:
+            ValueError: If workers or buffer_size is below 1.
+        """
+        if workers < 1 or buffer_size < 1:
+            raise ValueError("Stage workers and buffer_size must be at least 1.")
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.buffer_size = buffer_size
+        self.stats = {"processed": 0, "dropped": 0, "errors": 0, "busy_seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def _count(self, outcome: str, busy_seconds: float):
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats["busy_seconds"] += busy_seconds
+
+    def __repr__(self):
+        return f"Stage(name={self.name}, workers={self.workers}, buffer_size={self.buffer_size})"
+
+
+class Pipeline:
+    """
+    Streams items through a chain of stages connected by bounded queues.
+
+    Every stage runs on its own threads, so a slow notify never holds up the next fetch until the queue in
+    front of it fills. An exception in a stage is logged and counted, and drops only that item.
+    """
+    def __init__(self, stages: list[Stage], output_buffer: int = 16):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.stages = list(stages)
+        self.output_buffer = output_buffer
+
+    def run(self, source):
+        """
+        Feed `source` through the stages.
+
+        The source is consumed on a background thread. Closing the returned generator early stops every stage.
+
+        Args:
+            source (iterable): Items for the first stage.
+
+        Yields:
+            Items that came out of the last stage.
+        """
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=stage.buffer_size) for stage in self.stages]
+        queues.append(queue.Queue(maxsize=self.output_buffer))
+
+        workers = []
+        for index, stage in enumerate(self.stages):
+            # The next stage's workers (or the caller) each need their own end marker
+            downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for number in range(stage.workers):
+                workers.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[index], queues[index + 1], downstream, remaining, lock, stop),
+                    name=f"pipeline-{stage.name}-{number}",
+                    daemon=True,
+                ))
+        feeder = threading.Thread(
+            target=self._feed, args=(source, queues[0], self.stages[0].workers, stop), name="pipeline-source",
+            daemon=True,
+        )
+        for thread in [feeder] + workers:
+            thread.start()
+
+        try:
+            while True:
+                item = _get(queues[-1], stop)
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            stop.set()
+            for thread in workers:
+                thread.join()
+
+    def drain(self, source) -> int:
+        """
+        Run `source` through the pipeline and discard the output.
+
+        Returns:
+            int: Number of items that came out of the last stage.
+        """
+        return sum(1 for _ in self.run(source))
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: stage name -> counters (processed, dropped, errors, busy_seconds).
+        """
+        return {stage.name: dict(stage.stats) for stage in self.stages}
+
+    @staticmethod
+    def _feed(source, out, downstream, stop):
+        try:
+            for item in source:
+                if not _put(out, item, stop):
+                    return
+        except Exception as e:
+            logger.error(f"Pipeline source failed: {e}", exc_info=True)
+        for _ in range(downstream):
+            _put(out, _DONE, stop)
+
+    @staticmethod
+    def _work(stage, inbox, out, downstream, remaining, lock, stop):
+        while True:
+            item = _get(inbox, stop)
+            if item is _DONE:
+                break
+            started = time.perf_counter()
+            try:
+                result = stage.fn(item)
+            except Exception as e:
+                stage._count("errors", time.perf_counter() - started)
+                logger.error(f"Pipeline stage {stage.name} failed on {item}: {e}")
+                continue
+            if result is None:
+                stage._count("dropped", time.perf_counter() - started)
+                continue
+            stage._count("processed", time.perf_counter() - started)
+            if not _put(out, result, stop):
+                return
+
+        # The last worker of a stage to finish passes the end of the stream on
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            for _ in range(downstream):
+                _put(out, _DONE, stop)
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Block until there is room for `item`, or return False once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Block until an item arrives, or return _DONE once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=_POLL_TIMEOUT)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+class PollItem:
+    """
+    One availability query moving through the stages of `availability_pipeline`.
+    """
+    _sequence = itertools.count()
+
+    def __init__(self, key: str, venue_id: int, venue_name: str, party_size: int = 2, start_date: str = None,
+                 end_date: str = None, recipient: str = None, watch=None):
+        """
+        Args:
+            key (str): Identifies the query for diffing, e.g. Watch.key.
+            recipient (str): Overrides RECIPIENT_EMAIL for the notification.
+            watch (Watch): If set, poll counters and latency are recorded on it.
+        """
+        self.key = key
+        self.venue_id = venue_id
+        self.venue_name = venue_name
+        self.party_size = party_size
+        self.start_date = start_date
+        self.end_date = end_date
+        self.recipient = recipient
+        self.watch = watch
+        self.sequence = next(PollItem._sequence)
+
+        # Filled in by the stages
+        self.raw = None
+        self.observed_at = None
+        self.availability = None
+        self.newly_available = None
+
+    @classmethod
+    def for_watch(cls, watch) -> "PollItem":
+        return cls(watch.key, watch.venue_id, watch.venue_name, watch.party_size, watch.start_date,
+                   watch.end_date, watch=watch)
+
+    def __repr__(self):
+        return f"PollItem(key={self.key}, venue_name={self.venue_name}, sequence={self.sequence})"
+
+
+def fetch_stage(client: ResyAPIClient, workers: int = 4, buffer_size: int = 16) -> Stage:
+    """Download the raw calendar. Fetches are I/O bound, so this is the stage to scale out."""
+    def fetch(item: PollItem) -> PollItem:
+        started = time.perf_counter()
+        try:
+            item.raw = client.fetch_calendar(item.venue_id, item.party_size, item.start_date, item.end_date)
+            item.observed_at = time.time()
+        except ValueError:
+            if item.watch:
+                item.watch.errors += 1
+            raise
+        finally:
+            if item.watch:
+                item.watch.last_poll_at = time.time()
+                item.watch.last_latency_ms = (time.perf_counter() - started) * 1000
+                item.watch.polls += 1
+        return item
+    return Stage("fetch", fetch, workers, buffer_size)
+
+
+def parse_stage(workers: int = 1, buffer_size: int = 16) -> Stage:
+    def parse(item: PollItem) -> PollItem:
+        item.availability = parse_response(item.raw)
+        item.raw = None
+        return item
+    return Stage("parse", parse, workers, buffer_size)
+
+
+def diff_stage(buffer_size: int = 16, event_feed: EventFeed = None, email_helper: EmailHelper = None) -> Stage:
+    """
+    Set `newly_available` against the previous snapshot for the item's key.
+
+    Items with a watch attached diff against and update `watch.last_snapshot`, so the state is shared with
+    the WatchEngine and the admin API and goes away with the watch. Other items are tracked by key here.
+
+    Diffing is stateful, so it always runs on a single worker. A parallel fetch stage can deliver an older
+    poll after a newer one for the same key; the older one is dropped.
+
+    Args:
+        event_feed (EventFeed): If set, every change in a date's reservation status is published to it.
+        email_helper (EmailHelper): If set, the dates that stay available are reported to it, so they keep
+            being held back by its notification store. Newly available dates are left to the notify stage.
+    """
+    snapshots = {}
+    sequences = {}
+    watch_sequences = weakref.WeakKeyDictionary()
+
+    def diff(item: PollItem) -> PollItem | None:
+        seen = watch_sequences if item.watch is not None else sequences
+        owner = item.watch if item.watch is not None else item.key
+        if seen.get(owner, -1) > item.sequence:
+            return None
+        seen[owner] = item.sequence
+
+        previous = item.watch.last_snapshot if item.watch is not None else snapshots.get(item.key)
+        if event_feed is not None:
+            event_feed.publish(availability_events(
+                previous, item.availability, item.venue_id, item.venue_name, item.party_size, item.observed_at,
+            ))
+        item.newly_available = get_newly_available(previous, item.availability)
+        if email_helper is not None:
+            new_dates = {day.date for day in item.newly_available}
+            email_helper.observe_availability(
+                item.venue_name, [day for day in item.availability if day.date not in new_dates], item.recipient,
+                party_size=item.party_size,
+            )
+        if item.watch is not None:
+            item.watch.last_snapshot = item.availability
+        else:
+            snapshots[item.key] = item.availability
+        return item
+    return Stage("diff", diff, 1, buffer_size)
+
+
+def filter_stage(*predicates, buffer_size: int = 16) -> Stage:
+    """
+    Keep only the newly available days that pass every predicate, and drop items left with none.
+
+    Args:
+        predicates (callable): Called with an Availability, e.g. `lambda day: day.date.endswith("-06")`.
+    """
+    def keep(item: PollItem) -> PollItem | None:
+        item.newly_available = [
+            day for day in item.newly_available or [] if all(predicate(day) for predicate in predicates)
+        ]
+        return item if item.newly_available else None
+    return Stage("filter", keep, 1, buffer_size)
+
+
+def notify_stage(email_helper: EmailHelper, workers: int = 2, buffer_size: int = 16) -> Stage:
+    def notify(item: PollItem) -> PollItem:
+        logger.info(f"Availability returned for {item.venue_name}: {item.newly_available}")
+        email_helper.check_and_notify_availability(
+            item.venue_name, item.newly_available, item.recipient, party_size=item.party_size
+        )
+        return item
+    return Stage("notify", notify, workers, buffer_size)
+
+
+def record_stage(record, buffer_size: int = 16) -> Stage:
+    """
+    Args:
+        record (callable): Called with every notified item, e.g. to persist history or checkpoints.
+    """
+    def apply(item: PollItem) -> PollItem:
+        record(item)
+        return item
+    return Stage("record", apply, 1, buffer_size)
+
+
+def availability_pipeline(client: ResyAPIClient, email_helper: EmailHelper = None, predicates=(), record=None,
+                          fetch_workers: int = 4, notify_workers: int = 2, buffer_size: int = 16,
+                          event_feed: EventFeed = None) -> Pipeline:
+    """
+    Build the standard fetch -> parse -> diff -> filter -> notify (-> record) pipeline.
+
+    Returns:
+        Pipeline: Yields every PollItem that was notified.
+    """
+    stages = [
+        fetch_stage(client, fetch_workers, buffer_size),
+        parse_stage(buffer_size=buffer_size),
+        diff_stage(buffer_size, event_feed, email_helper or client.email_helper),
+        filter_stage(*predicates, buffer_size=buffer_size),
+        notify_stage(email_helper or client.email_helper, notify_workers, buffer_size),
+    ]
+    if record:
+        stages.append(record_stage(record, buffer_size))
+    return Pipeline(stages, buffer_size)
@@ -0,0 +1,120 @@
+import cProfile
+import logging
+import os
+import signal
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class StageTimer:
+    """
+    Accumulates wall-clock time per named stage for the current iteration.
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (self.clock() - started)
+
+    def report(self) -> dict:
+        """
+        Return the stage timings in milliseconds and reset them for the next iteration.
+        """
+        timings = {name: seconds * 1000 for name, seconds in self.timings.items()}
+        self.timings = {}
+        return timings
+
+
+def timed(timer: StageTimer | None, name: str):
+    """Time a block under `name` if a timer is active, otherwise do nothing."""
+    return timer.stage(name) if timer else nullcontext()
+
+
+class Profiler:
+    """
+    Records cProfile stats and tracemalloc snapshots for a long-running polling loop.
+
+    Dumps happen every `every` iterations, or at the end of the next iteration after SIGUSR1.
+    """
+    def __init__(self, directory: str, every: int = 100, top: int = 10):
+        """
+        Args:
+            directory (str): Where `.pstats` and `.snapshot` files are written.
+            every (int): Dump interval in iterations.
+            top (int): Number of memory growth lines to log per dump.
+        """
+        if every < 1:
+            raise ValueError("Profile interval must be at least 1 iteration.")
+        self.directory = directory
+        self.every = every
+        self.top = top
+        self.profile = cProfile.Profile()
+        self._dump_requested = False
+        self._previous_snapshot = None
+        self._previous_handler = None
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tracemalloc.start()
+        self.profile.enable()
+        if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGUSR1, self.request_dump)
+        logger.info(f"Profiling enabled, dumping to {self.directory} every {self.every} iterations")
+
+    def stop(self):
+        """Write a final dump and stop profiling."""
+        self.dump("final")
+        self.profile.disable()
+        tracemalloc.stop()
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGUSR1, self._previous_handler)
+            self._previous_handler = None
+
+    def request_dump(self, *_):
+        """Signal handler: dump at the end of the current iteration."""
+        self._dump_requested = True
+
+    def end_iteration(self, iteration: int):
+        if self._dump_requested or iteration % self.every == 0:
+            self._dump_requested = False
+            self.dump(f"{iteration:06d}")
+
+    def dump(self, label: str) -> tuple:
+        """
+        Write the cumulative profile and a memory snapshot, logging the largest allocation growth.
+
+        Returns:
+            tuple: (stats_path, snapshot_path)
+        """
+        stats_path = os.path.join(self.directory, f"profile-{label}.pstats")
+        snapshot_path = os.path.join(self.directory, f"tracemalloc-{label}.snapshot")
+
+        self.profile.disable()
+        try:
+            self.profile.dump_stats(stats_path)
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(False, tracemalloc.__file__),)
+            )
+            snapshot.dump(snapshot_path)
+        finally:
+            self.profile.enable()
+
+        current, peak = tracemalloc.get_traced_memory()
+        logger.info(
+            f"Profile dump {label}: traced memory current={current / 1024:.1f}KiB peak={peak / 1024:.1f}KiB"
+        )
+        if self._previous_snapshot is not None:
+            for stat in snapshot.compare_to(self._previous_snapshot, "lineno")[:self.top]:
+                logger.info(f"Memory growth since last dump: {stat}")
+        self._previous_snapshot = snapshot
+        return stats_path, snapshot_path
@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: the limiter still works, but only within one process
+    fcntl = None
+
+logger = logging.getLogger("ResyNotifier")
+
+# tokens (float), refilled_at (monotonic seconds)
+_STATE = struct.Struct("dd")
+
+
+class SharedRateLimiter:
+    """
+    Token bucket shared by every process on the host that uses the same API key.
+
+    The bucket lives in a small memory-mapped file, and each acquire holds an exclusive `flock` on it only
+    while the two numbers are read and written, so acquiring costs a few microseconds. The clock is
+    `time.monotonic`, which is system-wide on Linux and macOS, so processes agree on elapsed time.
+    """
+    def __init__(self, path: str, requests_per_minute: float, burst: int = 5, clock=time.monotonic, sleep=None):
+        """
+        Args:
+            path (str): The bucket file. Created if missing.
+            requests_per_minute (float): Refill rate, shared by all processes using the file.
+            burst (int): Bucket capacity, i.e. how many requests may go out back to back.
+            clock (callable): Monotonic time source.
+            sleep (callable): Used to wait for a token.
+
+        Raises:
+            ValueError: If the rate or burst is not positive.
+        """
+        if requests_per_minute <= 0 or burst < 1:
+            raise ValueError("requests_per_minute and burst must be positive.")
+        self.path = path
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep or time.sleep
+        self._thread_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            if os.fstat(self._fd).st_size < _STATE.size:
+                os.ftruncate(self._fd, _STATE.size)
+        self._map = mmap.mmap(self._fd, _STATE.size)
+
+    @classmethod
+    def for_api_key(cls, api_key: str, requests_per_minute: float, burst: int = 5, directory: str = None):
+        """
+        Open the bucket for an API key. The file name is a hash of the key, so the key never touches disk.
+        """
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        path = os.path.join(directory or tempfile.gettempdir(), f"resy-notifier-{digest}.bucket")
+        return cls(path, requests_per_minute, burst)
+
+    @classmethod
+    def from_env(cls, api_key: str):
+        """
+        Build the limiter configured by `RESY_SHARED_RPM` (and optional `RESY_SHARED_BURST` and
+        `RESY_RATE_LIMIT_DIR`), or return None when it is not set.
+        """
+        requests_per_minute = os.getenv("RESY_SHARED_RPM")
+        if not requests_per_minute:
+            return None
+        if fcntl is None:
+            logger.warning("File locking is unavailable; RESY_SHARED_RPM only limits this process.")
+        return cls.for_api_key(
+            api_key, float(requests_per_minute), int(os.getenv("RESY_SHARED_BURST", 5)),
+            os.getenv("RESY_RATE_LIMIT_DIR"),
+        )
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until the next one.
+        """
+        with self._locked():
+            now = self.clock()
+            tokens, refilled_at = _STATE.unpack_from(self._map)
+            if refilled_at <= 0 or refilled_at > now:
+                # New file, or written before a reboot reset the monotonic clock
+                tokens, refilled_at = self.burst, now
+            tokens = min(self.burst, tokens + (now - refilled_at) * self.rate)
+            if tokens >= 1:
+                _STATE.pack_into(self._map, 0, tokens - 1, now)
+                return 0.0
+            _STATE.pack_into(self._map, 0, tokens, now)
+            return (1 - tokens) / self.rate
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Block until a token is available.
+
+        Args:
+            timeout (float): Give up after this many seconds (wait forever if None).
+
+        Returns:
+            bool: True if a token was taken, False on timeout.
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            self.sleep(wait)
+
+    @contextmanager
+    def _locked(self):
+        # flock does not exclude threads sharing one file descriptor, hence the thread lock as well
+        with self._thread_lock:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -0,0 +1,166 @@
+import threading
+import time
+
+
+class _Budget:
+    __slots__ = ("key", "weight", "min_interval", "cost", "tag", "last_dispatch")
+
+    def __init__(self, key, weight, min_interval, cost, tag):
+        self.key = key
+        self.weight = weight
+        self.min_interval = min_interval
+        self.cost = cost
+        self.tag = tag
+        self.last_dispatch = None
+
+
+class BudgetAllocator:
+    """
+    Shares a global requests-per-minute ceiling between watches by weighted fair queueing.
+
+    Requests are issued in evenly spaced global slots. Each slot goes to the eligible watch with the smallest
+    virtual start tag, and a watch's tag advances by 1/weight per request, so over time every watch receives
+    slots in proportion to its weight. A watch never runs faster than its own `min_interval`; the slots it
+    leaves unused go to the others. When the ceiling is tight, low-weight watches are the first to slow down.
+
+    A watch whose poll sends several requests (e.g. a venue group) declares a `cost`; it then occupies that
+    many slots per poll and advances its tag by cost/weight, so the ceiling holds in requests, not polls.
+    """
+    def __init__(self, requests_per_minute: float, clock=time.monotonic):
+        """
+        Args:
+            requests_per_minute (float): Global ceiling across every watch.
+            clock (callable): Monotonic time source.
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive.")
+        self.requests_per_minute = requests_per_minute
+        self.slot_seconds = 60.0 / requests_per_minute
+        self.clock = clock
+        self._budgets = {}
+        self._virtual_time = 0.0
+        self._next_slot_at = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._budgets
+
+    def __len__(self):
+        return len(self._budgets)
+
+    def add(self, key, weight: float = 1.0, min_interval: float = 0.0, cost: int = 1, due_at: float = None):
+        """
+        Register a watch. New watches start at the current virtual time, so they neither starve others
+        nor inherit credit.
+
+        Args:
+            due_at (float): Clock time before which the watch is not polled, e.g. its next poll carried over
+                a restart. Defaults to now.
+
+        Raises:
+            ValueError: If the key is already registered or the weight is not positive.
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive.")
+        if cost < 1:
+            raise ValueError("cost must be at least 1.")
+        with self._lock:
+            if key in self._budgets:
+                raise ValueError(f"Watch {key} is already registered.")
+            budget = _Budget(key, weight, min_interval, cost, self._virtual_time)
+            if due_at is not None:
+                budget.last_dispatch = due_at - min_interval
+            self._budgets[key] = budget
+
+    def remove(self, key):
+        with self._lock:
+            self._budgets.pop(key, None)
+
+    def set_weight(self, key, weight: float):
+        """
+        Raises:
+            KeyError: If the key is not registered.
+            ValueError: If the weight is not positive.
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive.")
+        with self._lock:
+            self._budgets[key].weight = weight
+
+    def set_cost(self, key, cost: int):
+        """
+        Raises:
+            KeyError: If the key is not registered.
+            ValueError: If the cost is below 1.
+        """
+        if cost < 1:
+            raise ValueError("cost must be at least 1.")
+        with self._lock:
+            self._budgets[key].cost = cost
+
+    def next_slot(self) -> tuple | None:
+        """
+        Reserve the next global slot.
+
+        Returns:
+            tuple: (key, at) where `at` is the clock time the request should be sent, or None when no
+            watches are registered.
+        """
+        with self._lock:
+            if not self._budgets:
+                return None
+            now = self.clock()
+            at = now if self._next_slot_at is None else max(now, self._next_slot_at)
+
+            # If every watch is still inside its own min_interval, wait for the first one to become due
+            due_at = {budget.key: self._due_at(budget) for budget in self._budgets.values()}
+            at = max(at, min(due_at.values()))
+            eligible = [budget for budget in self._budgets.values() if due_at[budget.key] <= at]
+
+            chosen = min(eligible, key=lambda budget: (max(budget.tag, self._virtual_time), str(budget.key)))
+            start_tag = max(chosen.tag, self._virtual_time)
+            self._virtual_time = start_tag
+            chosen.tag = start_tag + chosen.cost / chosen.weight
+            chosen.last_dispatch = at
+            self._next_slot_at = at + self.slot_seconds * chosen.cost
+            return chosen.key, at
+
+    @staticmethod
+    def _due_at(budget: _Budget) -> float:
+        if budget.last_dispatch is None:
+            return float("-inf")
+        return budget.last_dispatch + budget.min_interval
+
+    def effective_intervals(self) -> dict:
+        """
+        Compute the steady-state interval each watch receives under the current ceiling and weights.
+
+        Request rates are assigned by weighted max-min fairness: a watch capped by its own min_interval keeps
+        that rate, and the remaining budget is split among the others by weight. A poll costs `cost` requests.
+
+        Returns:
+            dict: key -> seconds between polls
+        """
+        with self._lock:
+            remaining = self.requests_per_minute / 60.0
+            uncapped = dict(self._budgets)
+            rates = {}
+            while uncapped:
+                total_weight = sum(budget.weight for budget in uncapped.values())
+                capped = {
+                    key: budget for key, budget in uncapped.items()
+                    if budget.min_interval > 0
+                    and remaining * budget.weight / total_weight >= budget.cost / budget.min_interval
+                }
+                if not capped:
+                    for key, budget in uncapped.items():
+                        rates[key] = remaining * budget.weight / total_weight
+                    break
+                for key, budget in capped.items():
+                    rates[key] = budget.cost / budget.min_interval
+                    remaining -= rates[key]
+                    del uncapped[key]
+            return {
+                key: self._budgets[key].cost / rate if rate > 0 else float("inf")
+                for key, rate in rates.items()
+            }
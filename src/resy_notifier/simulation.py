@@ -0,0 +1,263 @@
+import bisect
+import json
+import random
+import tracemalloc
+from datetime import date, timedelta
+
+import httpx
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.email_helper import EmailHelper
+from src.resy_notifier.model.availability import get_newly_available, parse_response
+from src.resy_notifier.notification_store import NotificationStore
+
+
+class VirtualClock:
+    """
+    Clock whose time only moves when `sleep` is called.
+    """
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(0.0, seconds)
+
+
+class CalendarTimeline:
+    """
+    A sequence of raw calendar responses, each valid from its offset (in seconds) until the next one.
+    """
+    def __init__(self, events: list[tuple]):
+        """
+        Args:
+            events (list<tuple>): (at_seconds, response_dict) pairs, where the response has the same
+                shape as the `/venue/calendar` API body.
+
+        Raises:
+            ValueError: If there are no events.
+        """
+        if not events:
+            raise ValueError("A timeline needs at least one calendar event.")
+        events = sorted(events, key=lambda event: event[0])
+        self._offsets = [at for at, _ in events]
+        self._responses = [response for _, response in events]
+
+    @classmethod
+    def load(cls, path: str) -> "CalendarTimeline":
+        """
+        Load a recorded timeline from NDJSON lines of the form {"at": seconds, "response": {...}}.
+        """
+        with open(path) as f:
+            return cls([(record["at"], record["response"]) for record in map(json.loads, f) if record])
+
+    def response_at(self, at: float) -> dict:
+        index = bisect.bisect_right(self._offsets, at) - 1
+        return self._responses[max(index, 0)]
+
+    def openings(self) -> list[tuple]:
+        """
+        List every period in which a date was available.
+
+        Returns:
+            list<tuple>: (date, opened_at, closed_at) with closed_at None if it never closed.
+        """
+        openings = []
+        open_since = {}
+        for at, response in zip(self._offsets, self._responses):
+            available = {
+                item["date"] for item in response.get("scheduled", [])
+                if item.get("inventory", {}).get("reservation") == "available"
+            }
+            for day in available - open_since.keys():
+                open_since[day] = at
+            for day in list(open_since.keys() - available):
+                openings.append((day, open_since.pop(day), at))
+        openings.extend((day, opened_at, None) for day, opened_at in open_since.items())
+        return sorted(openings, key=lambda opening: opening[1])
+
+
+def synthetic_timeline(start_date: str, days: int, duration: float, openings_per_day: float = 1.0,
+                       mean_open_seconds: float = 300.0, seed: int = None) -> CalendarTimeline:
+    """
+    Generate a timeline where each date opens at random (Poisson) times for exponentially distributed periods.
+
+    Args:
+        start_date (str): First calendar date in 'YYYY-MM-DD' format.
+        days (int): Number of calendar dates.
+        duration (float): Simulated wall-clock length in seconds.
+        openings_per_day (float): Expected openings per date per 24 simulated hours.
+        mean_open_seconds (float): Mean time a date stays available once opened.
+        seed (int): Random seed for reproducible runs.
+    """
+    rng = random.Random(seed)
+    first = date.fromisoformat(start_date)
+    dates = [(first + timedelta(days=offset)).isoformat() for offset in range(days)]
+    rate = openings_per_day / 86400
+
+    changes = {0.0: {}}
+    for day in dates:
+        changes[0.0][day] = "sold-out"
+        at = rng.expovariate(rate) if rate > 0 else duration
+        while at < duration:
+            closes = at + rng.expovariate(1 / mean_open_seconds)
+            changes.setdefault(at, {})[day] = "available"
+            changes.setdefault(closes, {})[day] = "sold-out"
+            at = closes + rng.expovariate(rate)
+
+    state = {}
+    events = []
+    for at in sorted(changes):
+        state.update(changes[at])
+        events.append((at, {"scheduled": [
+            {"date": day, "inventory": {"reservation": state[day], "event": "not available", "walk-in": "not available"}}
+            for day in dates
+        ]}))
+    return CalendarTimeline(events)
+
+
+class RecordingEmailHelper(EmailHelper):
+    """
+    EmailHelper that keeps sent messages in memory instead of talking to SMTP.
+    """
+    def __init__(self, keep_messages: bool = False):
+        self.sender_email = "simulation@localhost"
+        self.recipient_email = "simulation@localhost"
+        self.sent = 0
+        self.keep_messages = keep_messages
+        self.messages = []
+
+    def send_email(self, subject: str, body: str, recipient: str = None):
+        if not subject or not body:
+            raise ValueError("Subject and Body are required.")
+        self.sent += 1
+        if self.keep_messages:
+            self.messages.append((recipient or self.recipient_email, subject, body))
+
+
+class SimulationReport:
+    def __init__(self):
+        self.iterations = 0
+        self.requests = 0
+        self.notifications = 0
+        self.detection_delays = []
+        self.missed_openings = 0
+        self.simulated_seconds = 0.0
+        self.peak_memory_bytes = None
+
+    @property
+    def mean_detection_delay(self) -> float | None:
+        if not self.detection_delays:
+            return None
+        return sum(self.detection_delays) / len(self.detection_delays)
+
+    @property
+    def max_detection_delay(self) -> float | None:
+        return max(self.detection_delays) if self.detection_delays else None
+
+    def __repr__(self):
+        return (
+            f"SimulationReport(simulated_seconds={self.simulated_seconds:.0f}, requests={self.requests}, "
+            f"notifications={self.notifications}, detections={len(self.detection_delays)}, "
+            f"missed_openings={self.missed_openings}, mean_detection_delay={self.mean_detection_delay}, "
+            f"max_detection_delay={self.max_detection_delay}, peak_memory_bytes={self.peak_memory_bytes})"
+        )
+
+
+class Simulator:
+    """
+    Replays a calendar timeline through the real parse/diff/notify code under a virtual clock.
+
+    By default responses are handed straight to `parse_response`; with `use_client=True` every poll also goes
+    through ResyAPIClient and httpx (over an in-memory transport), which is slower but covers the client too.
+    """
+    def __init__(self, timeline: CalendarTimeline, venue_id: int = 1, venue_name: str = "Simulated Venue",
+                 party_size: int = 2, use_client: bool = False):
+        self.timeline = timeline
+        self.use_client = use_client
+        self.venue_id = venue_id
+        self.venue_name = venue_name
+        self.party_size = party_size
+        self.clock = VirtualClock()
+        self.email_helper = RecordingEmailHelper()
+        # Dedup and hourly limits as in production, on simulated time
+        self.email_helper.notification_store = NotificationStore(clock=self.clock.time)
+        self.client = ResyAPIClient(
+            api_key="simulation",
+            base_url="http://simulation.invalid/4",
+            email_helper=self.email_helper,
+            transport=httpx.MockTransport(self._handle),
+            # Requests never leave the process, so they must not take tokens from the real API key's bucket
+            rate_limiter=None,
+        )
+        self.report = SimulationReport()
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.report.requests += 1
+        return httpx.Response(200, json=self.timeline.response_at(self.clock.time()))
+
+    def run(self, duration: float, request_interval=60.0, track_memory: bool = False) -> SimulationReport:
+        """
+        Poll the timeline until `duration` simulated seconds have passed.
+
+        Args:
+            duration (float): Simulated seconds to run for.
+            request_interval (float | callable): Seconds between polls, or a strategy called with
+                (now, availability) that returns the next interval.
+            track_memory (bool): Record the tracemalloc peak over the run.
+
+        Returns:
+            SimulationReport: Requests made, notifications sent and detection delays.
+        """
+        openings = {}
+        for day, opened_at, closed_at in self.timeline.openings():
+            openings.setdefault(day, []).append((opened_at, closed_at))
+        detected = set()
+
+        if track_memory:
+            tracemalloc.start()
+        try:
+            last_snapshot = None
+            while self.clock.time() < duration:
+                now = self.clock.time()
+                # Same fetch/parse/notify path as ResyAPIClient.get_availability, minus the console print
+                if self.use_client:
+                    availability = self.client.fetch_availability(self.venue_id, self.party_size)
+                else:
+                    self.report.requests += 1
+                    availability = parse_response(self.timeline.response_at(now))
+                self.email_helper.check_and_notify_availability(
+                    self.venue_name, availability, party_size=self.party_size
+                )
+                self.email_helper.flush_pending()
+                for day in get_newly_available(last_snapshot, availability):
+                    opened_at = self._opened_at(openings.get(day.date, []), now)
+                    if opened_at is not None and (day.date, opened_at) not in detected:
+                        detected.add((day.date, opened_at))
+                        self.report.detection_delays.append(now - opened_at)
+                last_snapshot = availability
+                self.report.iterations += 1
+
+                interval = request_interval(now, availability) if callable(request_interval) else request_interval
+                self.clock.sleep(interval)
+            if track_memory:
+                self.report.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            if track_memory:
+                tracemalloc.stop()
+
+        self.report.simulated_seconds = self.clock.time()
+        self.report.notifications = self.email_helper.sent
+        self.report.missed_openings = sum(
+            1 for day, periods in openings.items() for opened_at, _ in periods
+            if opened_at < duration and (day, opened_at) not in detected
+        )
+        return self.report
+
+    @staticmethod
+    def _opened_at(periods: list[tuple], now: float) -> float | None:
+        for opened_at, closed_at in reversed(periods):
+            if opened_at <= now and (closed_at is None or now < closed_at):
+                return opened_at
+        return None
@@ -0,0 +1,196 @@
+from datetime import date
+
+from src.resy_notifier.model.availability import Availability
+from src.resy_notifier.model.subscription import Subscription
+
+
+class _Node:
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center, by_start, by_end, left, right):
+        self.center = center
+        self.by_start = by_start
+        self.by_end = by_end
+        self.left = left
+        self.right = right
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed integer intervals.
+
+    A stabbing query costs O(log n + k) for k matching intervals.
+    """
+    def __init__(self, intervals: list[tuple]):
+        """
+        Args:
+            intervals (list<tuple>): (start, end, item) triples with start <= end.
+        """
+        self._root = self._build(list(intervals))
+
+    def _build(self, intervals):
+        if not intervals:
+            return None
+        endpoints = sorted(point for start, end, _ in intervals for point in (start, end))
+        center = endpoints[len(endpoints) // 2]
+
+        left, right, overlapping = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                overlapping.append(interval)
+
+        return _Node(
+            center,
+            sorted(overlapping, key=lambda interval: interval[0]),
+            sorted(overlapping, key=lambda interval: interval[1], reverse=True),
+            self._build(left),
+            self._build(right),
+        )
+
+    def query(self, point: int) -> list:
+        """
+        Return the items of every interval containing `point`.
+        """
+        results = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for start, _, item in node.by_start:
+                    if start > point:
+                        break
+                    results.append(item)
+                node = node.left
+            elif point > node.center:
+                for _, end, item in node.by_end:
+                    if end < point:
+                        break
+                    results.append(item)
+                node = node.right
+            else:
+                results.extend(item for _, _, item in node.by_start)
+                break
+        return results
+
+
+class SubscriptionIndex:
+    """
+    Index of subscriptions grouped by (venue_id, party_size) feed.
+
+    Each feed is polled once regardless of how many subscribers it has; an interval tree
+    over the subscribers' date windows maps a changed date to the interested subscribers.
+    """
+    def __init__(self, subscriptions: list[Subscription] = None):
+        self._subscriptions = {}
+        self._trees = {}
+        for subscription in subscriptions or []:
+            self.add(subscription)
+
+    def add(self, subscription: Subscription):
+        """Attach a subscription to its feed."""
+        self._subscriptions.setdefault(subscription.feed_key, []).append(subscription)
+        self._trees.pop(subscription.feed_key, None)
+
+    def remove(self, subscription: Subscription):
+        """
+        Detach a subscription from its feed.
+
+        Raises:
+            ValueError: If the subscription is not in the index.
+        """
+        subscriptions = self._subscriptions.get(subscription.feed_key, [])
+        if subscription not in subscriptions:
+            raise ValueError(f"{subscription} is not in the index.")
+        subscriptions.remove(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.feed_key]
+        self._trees.pop(subscription.feed_key, None)
+
+    def __len__(self):
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def feeds(self) -> list[tuple]:
+        """
+        List the distinct feeds to poll.
+
+        Returns:
+            list<tuple>: (venue_id, party_size, start_date, end_date) per feed, where the date
+            range covers every subscriber's window.
+        """
+        feeds = []
+        for (venue_id, party_size), subscriptions in self._subscriptions.items():
+            start = min(subscription.start_ordinal for subscription in subscriptions)
+            end = max(subscription.end_ordinal for subscription in subscriptions)
+            feeds.append((
+                venue_id,
+                party_size,
+                date.fromordinal(start).isoformat(),
+                date.fromordinal(end).isoformat(),
+            ))
+        return feeds
+
+    def venue_name(self, venue_id: int, party_size: int) -> str:
+        """Return the display name recorded on a feed's subscriptions."""
+        for subscription in self._subscriptions.get((venue_id, party_size), []):
+            if subscription.venue_name:
+                return subscription.venue_name
+        return ""
+
+    def subscribers_for(self, venue_id: int, party_size: int, day: str) -> list[Subscription]:
+        """
+        Find the subscriptions on a feed that are interested in a given date.
+
+        Args:
+            venue_id (int): The ID of the venue.
+            party_size (int): Number of guests.
+            day (str): Date in 'YYYY-MM-DD' format.
+
+        Returns:
+            list<Subscription>: Matching subscriptions, after weekday filtering.
+        """
+        key = (venue_id, party_size)
+        if key not in self._subscriptions:
+            return []
+        tree = self._trees.get(key)
+        if tree is None:
+            tree = IntervalTree([
+                (subscription.start_ordinal, subscription.end_ordinal, subscription)
+                for subscription in self._subscriptions[key]
+            ])
+            self._trees[key] = tree
+
+        parsed = date.fromisoformat(day)
+        return [
+            subscription for subscription in tree.query(parsed.toordinal())
+            if subscription.weekdays is None or parsed.weekday() in subscription.weekdays
+        ]
+
+    def match(self, venue_id: int, party_size: int, availabilities: list[Availability], slots_for=None) -> dict:
+        """
+        Match an availability diff against every subscriber on the feed.
+
+        Args:
+            venue_id (int): The ID of the venue.
+            party_size (int): Number of guests.
+            availabilities (list<Availability>): Days that changed, typically newly available ones.
+            slots_for (callable): Called with a date; returns its list<Slot>, or None if unknown. Only called
+                for days that a subscriber with a time filter is interested in, and that subscriber gets the
+                day only if one of its slots is inside the filter (or the slots are unknown).
+
+        Returns:
+            dict: recipient_email -> list<Availability> of days that recipient cares about.
+        """
+        matches = {}
+        for day in availabilities:
+            for subscription in self.subscribers_for(venue_id, party_size, day.date):
+                if slots_for is not None and subscription.has_time_filter:
+                    slots = slots_for(day.date)
+                    if slots is not None and not any(subscription.matches_time(slot.time) for slot in slots):
+                        continue
+                days = matches.setdefault(subscription.recipient_email, [])
+                if day not in days:
+                    days.append(day)
+        return matches
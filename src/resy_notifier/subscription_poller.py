@@ -0,0 +1,89 @@
+import functools
+import logging
+
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.checkpoint import WatchState
+from src.resy_notifier.email_helper import EmailHelper
+from src.resy_notifier.model.availability import get_newly_available
+from src.resy_notifier.subscription_index import SubscriptionIndex
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class SubscriptionPoller:
+    """
+    Polls each distinct (venue_id, party_size) feed once and fans the diff out to subscribers.
+    """
+    def __init__(self, client: ResyAPIClient, index: SubscriptionIndex, email_helper: EmailHelper = None):
+        self.client = client
+        self.index = index
+        self.email_helper = email_helper or client.email_helper
+        self._last_snapshots = {}
+
+    def poll_once(self) -> int:
+        """
+        Fetch every feed once and notify the subscribers of newly available days.
+
+        A feed that fails to fetch is logged and skipped; the other feeds are still polled.
+
+        Returns:
+            int: Number of notifications sent.
+        """
+        notifications = 0
+        for venue_id, party_size, start_date, end_date in self.index.feeds():
+            key = (venue_id, party_size)
+            try:
+                availability = self.client.fetch_availability(venue_id, party_size, start_date, end_date)
+            except ValueError as e:
+                logger.error(f"Failed to fetch feed venue_id={venue_id}, party_size={party_size}: {e}")
+                continue
+
+            newly_available = get_newly_available(self._last_snapshots.get(key), availability)
+            self._last_snapshots[key] = availability
+
+            venue_name = self.index.venue_name(venue_id, party_size)
+            if newly_available:
+                slots_for = functools.cache(functools.partial(self._slots_for, venue_id, party_size))
+                for recipient, days in self.index.match(venue_id, party_size, newly_available, slots_for).items():
+                    logger.info(f"Notifying {recipient} of availability at {venue_name}: {days}")
+                    self.email_helper.check_and_notify_availability(
+                        venue_name, days, recipient, party_size=party_size
+                    )
+                    notifications += 1
+            # Matched by date only: the store ignores days a recipient was never sent, so no slots are fetched
+            for recipient, days in self.index.match(venue_id, party_size, availability).items():
+                self.email_helper.observe_availability(venue_name, days, recipient, party_size=party_size)
+        # Dates held back by the hourly email limit go out once there is room
+        self.email_helper.flush_pending()
+        return notifications
+
+    def _slots_for(self, venue_id: int, party_size: int, day: str) -> list | None:
+        """
+        Fetch a day's slots for the subscribers with a time filter.
+
+        Returns None if the slots cannot be fetched, so the day is sent unfiltered rather than lost: it would
+        not be newly available again on the next poll.
+        """
+        try:
+            return self.client.find_slots(venue_id, day, party_size)
+        except ValueError as e:
+            logger.warning(f"Could not fetch slots for venue_id={venue_id} on {day}, not filtering by time: {e}")
+            return None
+
+    def export_state(self) -> dict:
+        """
+        Returns:
+            dict: "venue_id:party_size" -> WatchState with the dates already notified for that feed.
+        """
+        return {
+            f"{venue_id}:{party_size}": WatchState(
+                day.date for day in snapshot if day.inventory.reservation == "available"
+            )
+            for (venue_id, party_size), snapshot in self._last_snapshots.items()
+        }
+
+    def restore_state(self, states: dict):
+        """Resume from `export_state` output so already notified dates are not sent again."""
+        for key, state in states.items():
+            venue_id, party_size = (int(part) for part in key.split(":"))
+            self._last_snapshots[(venue_id, party_size)] = state.snapshot()
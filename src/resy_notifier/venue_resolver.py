@@ -0,0 +1,125 @@
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.checkpoint import atomic_write_json
+from src.resy_notifier.db_manager import DatabaseManager
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class ResolveResult:
+    """
+    Outcome of one VenueResolver.resolve call.
+    """
+    def __init__(self):
+        self.resolved = {}    # url_name -> (venue_id, venue_name)
+        self.not_found = []   # Resy has no such venue (now negatively cached)
+        self.failed = {}      # url_name -> error, e.g. network errors; retried on the next run
+        self.skipped = []     # still negatively cached from an earlier run
+
+    def __repr__(self):
+        return (
+            f"ResolveResult(resolved={len(self.resolved)}, not_found={len(self.not_found)}, "
+            f"failed={len(self.failed)}, skipped={len(self.skipped)})"
+        )
+
+
+class VenueResolver:
+    """
+    Resolves venue url names through the Resy venue endpoint and bulk-upserts them into `resy.t_venue`.
+
+    Names Resy does not know are remembered for `negative_ttl` seconds, so repeated onboarding runs do not
+    look them up again. Network and server errors are not cached.
+    """
+    def __init__(self, client: ResyAPIClient, db_manager: DatabaseManager, location: str = "ny",
+                 max_workers: int = 8, negative_ttl: float = 86400.0, cache_path: str = None, clock=time.time):
+        """
+        Args:
+            client (ResyAPIClient): Used for the lookups; its connection pool is shared by the workers.
+            db_manager (DatabaseManager): Where resolved venues are written.
+            location (str): City code from the venue URLs, e.g. "ny".
+            max_workers (int): Lookups in flight at once.
+            negative_ttl (float): Seconds a name that did not resolve is skipped.
+            cache_path (str): Optional JSON file that keeps the negative cache between runs.
+            clock (callable): Wall-clock time source.
+        """
+        self.client = client
+        self.db_manager = db_manager
+        self.location = location
+        self.max_workers = max_workers
+        self.negative_ttl = negative_ttl
+        self.cache_path = cache_path
+        self.clock = clock
+        self.negative_cache = self._load_negative_cache()
+
+    def resolve(self, url_names) -> ResolveResult:
+        """
+        Look up every name concurrently and upsert the ones found in one transaction.
+
+        Args:
+            url_names (iterable<str>): Venue url names; duplicates and blanks are ignored.
+
+        Returns:
+            ResolveResult: What was resolved, missing, failed or skipped.
+        """
+        result = ResolveResult()
+        now = self.clock()
+        pending = []
+        for url_name in dict.fromkeys(name.strip() for name in url_names):
+            if not url_name:
+                continue
+            if self.negative_cache.get(url_name, 0) > now:
+                result.skipped.append(url_name)
+            else:
+                pending.append(url_name)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                lookups = executor.map(self._lookup, pending)
+                for url_name, (venue, error) in zip(pending, lookups):
+                    if error is not None:
+                        result.failed[url_name] = error
+                    elif venue is None:
+                        result.not_found.append(url_name)
+                        self.negative_cache[url_name] = now + self.negative_ttl
+                    else:
+                        result.resolved[url_name] = venue
+                        self.negative_cache.pop(url_name, None)
+
+        self.db_manager.upsert_venues([
+            (venue_id, venue_name, url_name) for url_name, (venue_id, venue_name) in result.resolved.items()
+        ])
+        self._save_negative_cache()
+        logger.info(f"Resolved venues: {result}")
+        return result
+
+    def _lookup(self, url_name: str) -> tuple:
+        try:
+            return self.client.find_venue(url_name, self.location), None
+        except ValueError as e:
+            logger.warning(f"Failed to resolve venue {url_name}: {e}")
+            return None, e
+
+    def _load_negative_cache(self) -> dict:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable venue cache {self.cache_path}: {e}")
+            return {}
+        now = self.clock()
+        return {url_name: expires_at for url_name, expires_at in entries.items() if expires_at > now}
+
+    def _save_negative_cache(self):
+        if not self.cache_path:
+            return
+        now = self.clock()
+        entries = {url_name: expires_at for url_name, expires_at in self.negative_cache.items() if expires_at > now}
+        atomic_write_json(self.cache_path, entries, ".venue-cache-")
@@ -0,0 +1,460 @@
+import logging
+import threading
+import time
+
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.checkpoint import CheckpointStore, WatchState
+from src.resy_notifier.chunking import resolve_date_range, split_date_range
+from src.resy_notifier.event_feed import EventFeed, availability_events
+from src.resy_notifier.email_helper import EmailHelper
+from src.resy_notifier.model.availability import get_newly_available
+from src.resy_notifier.model.watch import GroupWatch, Watch
+from src.resy_notifier.request_budget import BudgetAllocator
+
+logger = logging.getLogger("ResyNotifier")
+
+
+class WatchEngine:
+    """
+    Runs many watches in one process, spending a shared request budget on them by priority.
+    """
+    def __init__(self, client: ResyAPIClient, allocator: BudgetAllocator, email_helper: EmailHelper = None,
+                 sleep=None, chunked: bool = False, event_feed: EventFeed = None, checkpoint: CheckpointStore = None):
+        """
+        Args:
+            chunked (bool): Fetch through `client.iter_availability_chunks` (the client needs a chunk_sizer), so
+                near-term dates are diffed and notified before later chunks arrive. Must be set whenever the
+                client has a chunk_sizer, so the budget charges every chunk.
+            event_feed (EventFeed): If set, every change in a date's reservation status is published to it.
+            checkpoint (CheckpointStore): If set, a watch added with a checkpointed key resumes from its saved
+                snapshot and next due time, and `save_checkpoint` runs after every poll.
+        """
+        self.client = client
+        self.chunked = chunked
+        self.event_feed = event_feed
+        self.checkpoint = checkpoint
+        # Loaded states not yet claimed by a watch; kept on save, so watches added later still resume
+        self._checkpointed = checkpoint.load() if checkpoint else {}
+        self.allocator = allocator
+        self.email_helper = email_helper or client.email_helper
+        self.sleep = sleep or time.sleep
+        self.watches = {}
+        self._lock = threading.RLock()
+
+    def add_watch(self, watch: Watch):
+        """
+        Raises:
+            ValueError: If a watch with the same key is already running.
+        """
+        with self._lock:
+            if watch.key in self.watches:
+                raise ValueError(f"Watch {watch.key} already exists.")
+            due_at = self._restore(watch)
+            if not watch.paused:
+                self.allocator.add(watch.key, watch.weight, watch.request_interval, self._cost(watch), due_at)
+            self.watches[watch.key] = watch
+            self._log_intervals()
+
+    def remove_watch(self, key: str) -> Watch:
+        """
+        Raises:
+            KeyError: If there is no watch with that key.
+        """
+        with self._lock:
+            watch = self.watches.pop(key)
+            self.allocator.remove(key)
+            self._log_intervals()
+            return watch
+
+    def set_weight(self, key: str, weight: float):
+        """
+        Raises:
+            KeyError: If there is no watch with that key.
+            ValueError: If the weight is not positive.
+        """
+        with self._lock:
+            watch = self.watches[key]
+            if not watch.paused:
+                self.allocator.set_weight(key, weight)
+            elif weight <= 0:
+                raise ValueError("weight must be positive.")
+            watch.weight = weight
+            self._log_intervals()
+
+    def pause(self, key: str) -> Watch:
+        """
+        Stop polling a watch but keep it, with its snapshot, so it can be resumed. Its budget goes to the others.
+
+        Raises:
+            KeyError: If there is no watch with that key.
+        """
+        with self._lock:
+            watch = self.watches[key]
+            if not watch.paused:
+                watch.paused = True
+                self.allocator.remove(key)
+                self._log_intervals()
+            return watch
+
+    def resume(self, key: str) -> Watch:
+        """
+        Raises:
+            KeyError: If there is no watch with that key.
+        """
+        with self._lock:
+            watch = self.watches[key]
+            if watch.paused:
+                watch.paused = False
+                self.allocator.add(key, watch.weight, watch.request_interval, self._cost(watch))
+                self._log_intervals()
+            return watch
+
+    def list_watches(self) -> list[Watch]:
+        """A snapshot of the current watches, paused ones included."""
+        with self._lock:
+            return list(self.watches.values())
+
+    def effective_intervals(self) -> dict:
+        """key -> seconds between polls each watch gets under the current budget."""
+        return self.allocator.effective_intervals()
+
+    def export_state(self) -> dict:
+        """
+        Returns:
+            dict: Watch key -> WatchState with the dates already notified and the next due time. A group's
+                members are stored under "<group key>@<venue_id>".
+        """
+        states = dict(self._checkpointed)
+        for watch in self.list_watches():
+            next_due_at = watch.last_poll_at + watch.request_interval if watch.last_poll_at else None
+            if isinstance(watch, GroupWatch):
+                states[watch.key] = WatchState(next_due_at=next_due_at)
+                for venue_id, snapshot in watch.snapshots.items():
+                    states[f"{watch.key}@{venue_id}"] = WatchState(_available_dates(snapshot))
+            else:
+                states[watch.key] = WatchState(_available_dates(watch.last_snapshot), next_due_at=next_due_at)
+        return states
+
+    def save_checkpoint(self):
+        """Write every watch's state to the checkpoint, if there is one."""
+        if self.checkpoint is not None:
+            self.checkpoint.save(self.export_state())
+
+    def _restore(self, watch: Watch) -> float | None:
+        """
+        Resume a new watch from its checkpointed state, if any.
+
+        Returns:
+            float: Allocator time the watch's first poll is due, or None to poll it right away.
+        """
+        if isinstance(watch, GroupWatch):
+            for venue_id, _ in watch.members:
+                member = self._checkpointed.pop(f"{watch.key}@{venue_id}", None)
+                if member is not None:
+                    watch.snapshots[venue_id] = member.snapshot()
+        state = self._checkpointed.pop(watch.key, None)
+        if state is None:
+            return None
+        if not isinstance(watch, GroupWatch):
+            watch.last_snapshot = state.snapshot()
+        logger.info(f"Resuming {watch.key} from checkpoint: {state}")
+        if state.next_due_at is None:
+            return None
+        # Never wait longer than one interval, e.g. if the clock moved while the process was down
+        delay = min(state.next_due_at - time.time(), watch.request_interval)
+        return self.allocator.clock() + max(delay, 0)
+
+    def _log_intervals(self):
+        intervals = ", ".join(f"{key}={seconds:.1f}s" for key, seconds in self.effective_intervals().items())
+        logger.info(f"Effective poll intervals: {intervals}")
+
+    def run_once(self) -> Watch | None:
+        """
+        Wait for the next budget slot and poll the watch it was assigned to.
+
+        Returns:
+            Watch: The watch that was polled, or None if there are no watches.
+        """
+        watch = self._next_due()
+        if watch is not None:
+            self.poll(watch)
+            self.save_checkpoint()
+        return watch
+
+    def due_watches(self, loop_limit: int = None):
+        """
+        Yield each watch when its budget slot comes due, without polling it, e.g. as the source of a Pipeline.
+
+        Args:
+            loop_limit (int): Stop after this many slots (forever if None).
+
+        Yields:
+            Watch: The watch to poll now.
+        """
+        slots = 0
+        while loop_limit is None or slots < loop_limit:
+            watch = self._next_due()
+            if watch is not None:
+                yield watch
+            elif not len(self.allocator):
+                # Nothing to poll (no watches, or all paused)
+                self.sleep(self.allocator.slot_seconds)
+            slots += 1
+
+    def _next_due(self) -> Watch | None:
+        """Wait for the next budget slot and return its watch, or None if there is none."""
+        # Dates held back by the hourly email limit go out once there is room, even if nothing changes
+        self.email_helper.flush_pending()
+        slot = self.allocator.next_slot()
+        if slot is None:
+            return None
+        key, at = slot
+        delay = at - self.allocator.clock()
+        if delay > 0:
+            self.sleep(delay)
+
+        with self._lock:
+            # None if removed while we were waiting for its slot
+            return self.watches.get(key)
+
+    def poll(self, watch: Watch):
+        """
+        Fetch one watch, diff it against its last snapshot and notify newly available dates.
+
+        Fetch errors are counted on the watch and logged; they never stop the engine.
+        """
+        if isinstance(watch, GroupWatch):
+            self.poll_group(watch)
+            return
+        started = time.perf_counter()
+        availability = []
+        try:
+            diffs = iter_chunk_diffs(
+                self.client, watch.venue_id, watch.party_size, watch.start_date, watch.end_date, watch.last_snapshot,
+                chunked=self.chunked,
+            )
+            for previous, chunk, merged in diffs:
+                availability.extend(chunk)
+                self._publish(watch.venue_id, watch.venue_name, watch.party_size, previous, chunk)
+                self._notify(watch, previous, chunk)
+                watch.last_snapshot = merged
+        except ValueError as e:
+            watch.errors += 1
+            logger.error(f"Failed to poll {watch.venue_name} ({watch.key}): {e}")
+            return
+        finally:
+            watch.last_poll_at = time.time()
+            watch.last_latency_ms = (time.perf_counter() - started) * 1000
+            watch.polls += 1
+
+        if self.chunked:
+            self._refresh_cost(watch)
+        # Days that left the date range are dropped only once the whole range has been fetched
+        watch.last_snapshot = availability
+
+    def _notify(self, watch: Watch, previous: list | None, current: list):
+        newly_available = get_newly_available(previous, current)
+        if newly_available:
+            logger.info(f"Availability returned for {watch.venue_name}: {newly_available}")
+            self.email_helper.check_and_notify_availability(
+                watch.venue_name, newly_available, party_size=watch.party_size
+            )
+        # After notifying, so a date that just came back is not held back by its own poll
+        self.email_helper.observe_availability(watch.venue_name, current, party_size=watch.party_size)
+
+    def _publish(self, venue_id, venue_name, party_size, previous, current):
+        if self.event_feed is not None:
+            self.event_feed.publish(availability_events(previous, current, venue_id, venue_name, party_size))
+
+    def _cost(self, watch: Watch) -> int:
+        """
+        Requests one poll of the watch sends: one per calendar chunk when chunked, for every member of a group.
+        """
+        if not self.chunked or self.client.chunk_sizer is None:
+            return watch.cost
+        start_date, end_date = resolve_date_range(watch.start_date, watch.end_date)
+        return watch.cost * len(split_date_range(start_date, end_date, self.client.chunk_sizer.days))
+
+    def _refresh_cost(self, watch: Watch):
+        """Follow the chunk size as the ChunkSizer retunes it, so the budget matches what is sent."""
+        with self._lock:
+            if watch.key in self.watches and watch.key in self.allocator:
+                self.allocator.set_cost(watch.key, self._cost(watch))
+
+    def poll_group(self, watch: GroupWatch):
+        """
+        Fetch the members of a group watch concurrently and stop at the first venue with newly available dates.
+
+        Members are submitted in order of preference, `watch.concurrency` at a time, and their results are
+        handled in that order as well: a member that completes early waits until every member before it has
+        resolved, so the group always goes to the most preferred venue with newly available dates. Once that
+        venue is known, members still queued are cancelled and their requests are never sent, and the
+        notification, which names the matching venue, goes out before the requests already in flight are
+        waited on. Members after the match are left undiffed, so their openings are still new on the next poll.
+        A satisfied group with `stop_on_match` is removed from the engine.
+
+        A chunked engine polls the members one at a time instead, see `_poll_group_in_chunks`.
+        """
+        if self.chunked:
+            self._poll_group_in_chunks(watch)
+            return
+        started = time.perf_counter()
+        requests = [
+            (venue_id, watch.party_size, watch.start_date, watch.end_date) for venue_id, _ in watch.members
+        ]
+        matches = []
+        polled = []
+        # Results that completed ahead of a member before them, by index
+        buffered = {}
+        next_index = 0
+        results = self.client.iter_availability_many(requests, max_workers=watch.concurrency)
+        try:
+            try:
+                for result in results:
+                    buffered[result.index] = result
+                    while next_index in buffered and not matches:
+                        result = buffered.pop(next_index)
+                        next_index += 1
+                        venue_id, venue_name = watch.members[result.index]
+                        if not result.ok:
+                            watch.errors += 1
+                            logger.error(f"Failed to poll {venue_name} in group {watch.name}: {result.error}")
+                            continue
+                        previous = watch.snapshots.get(venue_id)
+                        self._publish(venue_id, venue_name, watch.party_size, previous, result.availability)
+                        newly_available = get_newly_available(previous, result.availability)
+                        watch.snapshots[venue_id] = result.availability
+                        polled.append((venue_name, result.availability))
+                        if newly_available:
+                            matches.append((venue_name, newly_available))
+                    if matches:
+                        break
+            finally:
+                watch.last_poll_at = time.time()
+                watch.last_latency_ms = (time.perf_counter() - started) * 1000
+                watch.polls += 1
+            if matches:
+                self._notify_group(watch, matches)
+            for venue_name, availability in polled:
+                self.email_helper.observe_availability(venue_name, availability, party_size=watch.party_size)
+        finally:
+            # Cancels queued members and waits for the ones in flight
+            results.close()
+
+    def _poll_group_in_chunks(self, watch: GroupWatch):
+        """
+        Poll the members of a group in order of preference, each chunk by chunk, and stop at the first chunk with
+        newly available dates.
+
+        The members' chunks are fetched concurrently instead of the members themselves, so the group is notified
+        as soon as the first near-term opening arrives, before later chunks and members are requested.
+        """
+        started = time.perf_counter()
+        matches = []
+        polled = []
+        diffs = None
+        try:
+            try:
+                for venue_id, venue_name in watch.members:
+                    availability = []
+                    diffs = iter_chunk_diffs(
+                        self.client, venue_id, watch.party_size, watch.start_date, watch.end_date,
+                        watch.snapshots.get(venue_id),
+                    )
+                    try:
+                        for previous, chunk, merged in diffs:
+                            availability.extend(chunk)
+                            self._publish(venue_id, venue_name, watch.party_size, previous, chunk)
+                            newly_available = get_newly_available(previous, chunk)
+                            watch.snapshots[venue_id] = merged
+                            polled.append((venue_name, chunk))
+                            if newly_available:
+                                matches.append((venue_name, newly_available))
+                                break
+                        else:
+                            watch.snapshots[venue_id] = availability
+                    except ValueError as e:
+                        watch.errors += 1
+                        logger.error(f"Failed to poll {venue_name} in group {watch.name}: {e}")
+                    if matches:
+                        break
+            finally:
+                watch.last_poll_at = time.time()
+                watch.last_latency_ms = (time.perf_counter() - started) * 1000
+                watch.polls += 1
+            self._refresh_cost(watch)
+            if matches:
+                self._notify_group(watch, matches)
+            for venue_name, chunk in polled:
+                self.email_helper.observe_availability(venue_name, chunk, party_size=watch.party_size)
+        finally:
+            # Cancels the matching member's chunks not yet requested and waits for the ones in flight
+            if diffs is not None:
+                diffs.close()
+
+    def _notify_group(self, watch: GroupWatch, matches: list):
+        watch.satisfied = True
+        logger.info(f"Availability returned for group {watch.name}: {[venue_name for venue_name, _ in matches]}")
+        self.email_helper.notify_group_availability(watch.name, matches, party_size=watch.party_size)
+        if watch.stop_on_match:
+            with self._lock:
+                if watch.key in self.watches:
+                    self.remove_watch(watch.key)
+
+    def run(self, loop_limit: int = None):
+        """
+        Poll until `loop_limit` polls have been made (forever if None).
+        """
+        polls = 0
+        while loop_limit is None or polls < loop_limit:
+            if self.run_once() is None and not len(self.allocator):
+                # Nothing to poll (no watches, or all paused)
+                self.sleep(self.allocator.slot_seconds)
+            polls += 1
+
+
+def iter_chunk_diffs(client: ResyAPIClient, venue_id: int, party_size: int, start_date: str, end_date: str,
+                     snapshot: list | None, chunked: bool = True):
+    """
+    Fetch a calendar and yield it chunk by chunk, nearest dates first, with the snapshot to diff each chunk against.
+
+    With `chunked`, the chunks come from `client.iter_availability_chunks` and each one is yielded as soon as it
+    and the chunks before it have arrived; otherwise the whole range is fetched as a single chunk. Closing the
+    generator early cancels the chunks not yet requested.
+
+    Args:
+        snapshot (list<Availability>): The last calendar, or None if this is the first poll.
+        chunked (bool): Fetch in chunks (the client needs a chunk_sizer to split the range).
+
+    Yields:
+        tuple: (previous, chunk, merged), where `previous` is `snapshot` with the earlier chunks merged in and
+            `merged` also has this chunk. Store `merged` once the chunk has been handled, so a later chunk that
+            fails does not make this one new again.
+
+    Raises:
+        ValueError: If a chunk cannot be fetched, after the chunks before it were yielded.
+    """
+    if chunked:
+        chunks = client.iter_availability_chunks(venue_id, party_size, start_date, end_date)
+    else:
+        chunks = iter([client.fetch_availability(venue_id, party_size, start_date, end_date)])
+    try:
+        for chunk in chunks:
+            merged = _merge_snapshot(snapshot, chunk)
+            yield snapshot, chunk, merged
+            snapshot = merged
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _available_dates(snapshot: list | None) -> list:
+    return [day.date for day in snapshot or [] if day.inventory.reservation == "available"]
+
+
+def _merge_snapshot(previous: list | None, chunk: list) -> list:
+    """Replace the days of `chunk` in a snapshot, keeping it in date order."""
+    days = {day.date: day for day in previous or []}
+    days.update((day.date, day) for day in chunk)
+    return [days[date] for date in sorted(days)]
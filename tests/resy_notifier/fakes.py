@@ -0,0 +1,20 @@
+from src.resy_notifier.model.availability import Availability, Inventory
+
+
+class FakeClock:
+    """
+    Manually advanced time source: call it for the current time, and pass `sleep` where a component waits.
+    """
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_day(date, reservation="available"):
+    """One calendar day with the given reservation status and no event or walk-in availability."""
+    return Availability(date, Inventory(reservation, "not available", "not available"))
@@ -1,5 +1,7 @@
 import unittest
-from src.resy_notifier.model.availability import Availability, Inventory, parse_response, get_available_days
+from src.resy_notifier.model.availability import (
+    Availability, Inventory, parse_response, get_available_days, get_newly_available
+)
 
 class TestAvailability(unittest.TestCase):
     def setUp(self):
@@ -142,6 +144,35 @@ class TestAvailability(unittest.TestCase):
         availabilities = []
         self.assertEqual(get_available_days(availabilities), [])
 
+    def test_availability_to_dict_round_trip(self):
+        # Test that to_dict produces entries parse_response accepts
+        result = parse_response({"scheduled": [self.availability_1.to_dict()]})
+        self.assertEqual(repr(result[0]), repr(self.availability_1))
+
+    def test_get_newly_available_first_snapshot(self):
+        """
+        Test `get_newly_available` treats every available day as new when there is no previous snapshot.
+        """
+        current = [
+            Availability(date="2024-12-01", inventory=Inventory("available", "", "")),
+            Availability(date="2024-12-02", inventory=Inventory("sold-out", "", "")),
+        ]
+        self.assertEqual([day.date for day in get_newly_available(None, current)], ["2024-12-01"])
+
+    def test_get_newly_available_diff(self):
+        """
+        Test `get_newly_available` only returns days that flipped to available.
+        """
+        previous = [
+            Availability(date="2024-12-01", inventory=Inventory("available", "", "")),
+            Availability(date="2024-12-02", inventory=Inventory("sold-out", "", "")),
+        ]
+        current = [
+            Availability(date="2024-12-01", inventory=Inventory("available", "", "")),
+            Availability(date="2024-12-02", inventory=Inventory("available", "", "")),
+        ]
+        self.assertEqual([day.date for day in get_newly_available(previous, current)], ["2024-12-02"])
+
 
 if __name__ == "__main__":
     unittest.main()
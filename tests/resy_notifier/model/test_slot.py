@@ -0,0 +1,49 @@
+import unittest
+from datetime import time
+from src.resy_notifier.model.slot import parse_slots, parse_time
+
+
+class TestSlot(unittest.TestCase):
+    def test_parse_slots(self):
+        data = {
+            "results": {
+                "venues": [{
+                    "slots": [
+                        {"config": {"token": "rgs://1", "type": "Dining Room"}, "date": {"start": "2024-12-01 18:00:00"}},
+                        {"config": {"token": "rgs://2", "type": "Bar"}, "date": {"start": "2024-12-01 21:30:00"}},
+                    ]
+                }]
+            }
+        }
+
+        slots = parse_slots(data)
+
+        self.assertEqual([slot.config_id for slot in slots], ["rgs://1", "rgs://2"])
+        self.assertEqual(slots[1].day, "2024-12-01")
+        self.assertEqual(slots[1].time, "21:30")
+        self.assertEqual(repr(slots[1]), "Slot(start=2024-12-01 21:30:00, seating_type=Bar)")
+
+    def test_parse_slots_no_venues(self):
+        self.assertEqual(parse_slots({"results": {}}), [])
+
+    def test_parse_slots_missing_results(self):
+        with self.assertRaises(ValueError) as context:
+            parse_slots({})
+        self.assertEqual(str(context.exception), "Invalid response format: 'results' key missing.")
+
+    def test_parse_slots_missing_config(self):
+        with self.assertRaises(ValueError):
+            parse_slots({"results": {"venues": [{"slots": [{"date": {"start": "2024-12-01 18:00:00"}}]}]}})
+
+    def test_parse_time(self):
+        self.assertEqual(parse_time("18:30"), time(18, 30))
+        self.assertEqual(parse_time("9:05"), time(9, 5))
+        self.assertIsNone(parse_time(None))
+        for value in ("6pm", "18:30:00", "25:00"):
+            with self.assertRaises(ValueError) as context:
+                parse_time(value)
+            self.assertEqual(str(context.exception), f"Invalid time '{value}'. Use 'HH:MM', e.g. 18:30.")
+
+
+if __name__ == "__main__":
+    unittest.main()
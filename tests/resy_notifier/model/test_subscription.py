@@ -0,0 +1,33 @@
+import unittest
+from src.resy_notifier.model.subscription import Subscription
+
+
+class TestSubscription(unittest.TestCase):
+    def test_matches_time(self):
+        subscription = Subscription(
+            "a@example.com", 1, 2, "2024-12-01", "2024-12-10", earliest_time="18:00", latest_time="20:30"
+        )
+
+        self.assertTrue(subscription.matches_time("18:00:00"))
+        self.assertTrue(subscription.matches_time("20:30"))
+        self.assertFalse(subscription.matches_time("17:45"))
+        self.assertFalse(subscription.matches_time("21:00"))
+        self.assertTrue(subscription.has_time_filter)
+        self.assertFalse(Subscription("a@example.com", 1, 2, "2024-12-01", "2024-12-10").has_time_filter)
+
+    def test_invalid_time(self):
+        with self.assertRaises(ValueError):
+            Subscription("a@example.com", 1, 2, "2024-12-01", "2024-12-10", earliest_time="6pm")
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError) as context:
+            Subscription("a@example.com", 1, 2, "2024-12-10", "2024-12-01")
+        self.assertEqual(str(context.exception), "Subscription end_date must not be before start_date.")
+
+    def test_invalid_weekday(self):
+        with self.assertRaises(ValueError):
+            Subscription("a@example.com", 1, 2, "2024-12-01", "2024-12-10", weekdays={7})
+
+
+if __name__ == "__main__":
+    unittest.main()
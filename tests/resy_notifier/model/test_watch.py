@@ -0,0 +1,33 @@
+import unittest
+from src.resy_notifier.model.watch import GroupWatch, Watch
+
+
+class TestWatch(unittest.TestCase):
+    def test_key(self):
+        watch = Watch(6066, "Una Pizza Napoletana", 4, "2024-12-01", "2024-12-07")
+        self.assertEqual(watch.key, "6066:4:2024-12-01:2024-12-07")
+
+    def test_invalid_weight(self):
+        with self.assertRaises(ValueError) as context:
+            Watch(6066, "Una Pizza Napoletana", weight=0)
+        self.assertEqual(str(context.exception), "Watch weight must be positive.")
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            Watch(6066, "Una Pizza Napoletana", request_interval=0)
+
+
+class TestGroupWatch(unittest.TestCase):
+    def test_key_and_cost(self):
+        watch = GroupWatch("Pizza", [(6066, "Una Pizza Napoletana"), (2492, "Lucali")], 4, "2024-12-06", "2024-12-06")
+        self.assertEqual(watch.key, "group:Pizza:4:2024-12-06:2024-12-06")
+        self.assertEqual(watch.cost, 2)
+        self.assertEqual(Watch(6066, "Una Pizza Napoletana").cost, 1)
+
+    def test_requires_members(self):
+        with self.assertRaises(ValueError):
+            GroupWatch("Pizza", [])
+
+
+if __name__ == "__main__":
+    unittest.main()
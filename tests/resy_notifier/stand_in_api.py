@@ -0,0 +1,81 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StandInResyAPI:
+    """
+    Minimal local stand-in for the Resy endpoints used by the notifier and auto-booker.
+
+    Tests mutate `calendar` and `slots` directly; every request is recorded in `requests`.
+    """
+    def __init__(self):
+        self.calendar = []
+        self.slots = {}
+        self.payment_method_ids = [42]
+        self.requests = []
+        self.booked = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/4"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                api.requests.append(("GET", url.path, params))
+                if url.path == "/4/venue/calendar":
+                    self._reply(200, {"scheduled": list(api.calendar)})
+                elif url.path == "/4/find":
+                    slots = [
+                        {"config": {"token": token, "type": "Dining Room"}, "date": {"start": start}}
+                        for token, start in api.slots.get(params["day"], [])
+                    ]
+                    self._reply(200, {"results": {"venues": [{"slots": slots}]}})
+                elif url.path == "/3/details":
+                    self._reply(200, {"book_token": {"value": f"book:{params['config_id']}"}})
+                elif url.path == "/2/user":
+                    self._reply(200, {"payment_methods": [{"id": i} for i in api.payment_method_ids]})
+                else:
+                    self._reply(404, {})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+                api.requests.append(("POST", self.path, form))
+                if self.path == "/3/book":
+                    api.booked.append(form["book_token"])
+                    self._reply(201, {"resy_token": f"resy:{len(api.booked)}"})
+                else:
+                    self._reply(404, {})
+
+        return Handler
@@ -0,0 +1,82 @@
+import threading
+from unittest.mock import Mock
+from urllib.parse import quote
+import httpx
+from src.resy_notifier.admin_server import AdminServer
+from src.resy_notifier.model.availability import Availability, Inventory
+from src.resy_notifier.model.watch import Watch
+from src.resy_notifier.request_budget import BudgetAllocator
+from src.resy_notifier.watch_engine import WatchEngine
+
+VENUES = {"una-pizza-napoletana": (6066, "Una Pizza Napoletana"), "lucali": (2492, "Lucali")}
+
+
+def _build_watch(entry):
+    if entry["venue"] not in VENUES:
+        raise ValueError(f"Venue '{entry['venue']}' not found in the database.")
+    return Watch(*VENUES[entry["venue"]], int(entry.get("party_size", 2)), weight=float(entry.get("weight", 1)))
+
+
+class TestAdminServer:
+    def setup_method(self):
+        client = Mock()
+        client.fetch_availability.return_value = []
+        self.engine = WatchEngine(client, BudgetAllocator(60), Mock(), sleep=Mock())
+        self.watch = Watch(6066, "Una Pizza Napoletana", 2)
+        self.watch.last_snapshot = [Availability("2024-12-01", Inventory("available", "not available", "not available"))]
+        self.engine.add_watch(self.watch)
+
+        self.server = AdminServer(self.engine, _build_watch, port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address
+        self.base_url = f"http://{host}:{port}"
+        self.key = quote(self.watch.key, safe="")
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_list_watches(self):
+        watches = httpx.get(f"{self.base_url}/watches").json()["watches"]
+
+        assert len(watches) == 1
+        assert watches[0]["key"] == self.watch.key
+        assert watches[0]["available_dates"] == ["2024-12-01"]
+        assert watches[0]["effective_interval"] == 60.0
+        assert watches[0]["paused"] is False
+
+    def test_add_watch(self):
+        response = httpx.post(f"{self.base_url}/watches", json={"venue": "lucali", "party_size": 4, "weight": 3})
+
+        assert response.status_code == 201
+        assert response.json()["key"] == "2492:4:None:None"
+        assert "2492:4:None:None" in self.engine.watches
+        assert self.engine.watches["2492:4:None:None"].weight == 3
+
+        assert httpx.post(f"{self.base_url}/watches", json={"venue": "closed-place"}).status_code == 400
+        assert httpx.post(f"{self.base_url}/watches", json={"party_size": 4}).status_code == 400
+        # Same key twice
+        assert httpx.post(f"{self.base_url}/watches", json={"venue": "lucali", "party_size": 4}).status_code == 400
+
+    def test_pause_and_resume(self):
+        response = httpx.post(f"{self.base_url}/watches/{self.key}/pause")
+
+        assert response.status_code == 200
+        assert response.json()["paused"] is True
+        assert self.watch.key not in self.engine.allocator
+        assert self.engine.run_once() is None
+
+        httpx.post(f"{self.base_url}/watches/{self.key}/resume")
+        assert self.engine.run_once() is self.watch
+
+    def test_reweight_and_remove(self):
+        response = httpx.post(f"{self.base_url}/watches/{self.key}/weight", json={"weight": 5})
+        assert response.status_code == 200
+        assert self.watch.weight == 5
+        assert httpx.post(f"{self.base_url}/watches/{self.key}/weight", json={"weight": -1}).status_code == 400
+
+        assert httpx.delete(f"{self.base_url}/watches/{self.key}").status_code == 200
+        assert self.engine.watches == {}
+        assert httpx.delete(f"{self.base_url}/watches/{self.key}").status_code == 404
+        assert httpx.post(f"{self.base_url}/watches/{self.key}/pause").status_code == 404
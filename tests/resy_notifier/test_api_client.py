@@ -1,12 +1,17 @@
+import threading
+import time
 from datetime import datetime, timedelta
 from unittest.mock import patch, Mock
 from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.chunking import ChunkSizer
 from src.resy_notifier.model.availability import Availability
+from src.resy_notifier.profiling import StageTimer
 import httpx
+import pytest
 
 class TestResyAPIClient:
     def setup_method(self):
-        self.mock_get_patcher = patch("httpx.get")
+        self.mock_get_patcher = patch("httpx.Client.get")
         self.mock_get = self.mock_get_patcher.start()
 
         self.mock_response_data = {
@@ -72,6 +77,72 @@ class TestResyAPIClient:
         assert len(result) == 2
         assert isinstance(result[0], Availability)
 
+    def test_fetch_calendar_returns_raw_json(self):
+        mock_response = Mock()
+        mock_response.json.return_value = self.mock_response_data
+        self.mock_get.return_value = mock_response
+
+        client = ResyAPIClient(api_key="test_api_key", base_url="test_base_url")
+        result = client.fetch_calendar(venue_id=12345, party_size=4, start_date="2024-12-01", end_date="2024-12-02")
+
+        assert result == self.mock_response_data
+        assert self.mock_get.call_args[1]["params"]["num_seats"] == 4
+
+    def test_fetch_availability_in_chunks(self):
+        client = ResyAPIClient(api_key="test_api_key", base_url="test_base_url")
+        client.chunk_sizer = ChunkSizer(initial_days=5, min_days=3)
+        fetched = []
+
+        def fetch_range(venue_id, party_size, start_date, end_date):
+            # The first chunk is the slowest, yet still comes back first
+            time.sleep(0.05 if start_date == "2024-12-01" else 0)
+            fetched.append(start_date)
+            return [Availability(start_date, None)]
+
+        with patch.object(client, "_fetch_range", side_effect=fetch_range):
+            result = client.fetch_availability(12345, 2, "2024-12-01", "2024-12-12")
+
+        assert [day.date for day in result] == ["2024-12-01", "2024-12-06", "2024-12-11"]
+        assert sorted(fetched) == ["2024-12-01", "2024-12-06", "2024-12-11"]
+        # Every chunk was faster than the target, so the next chunks are larger
+        assert client.chunk_sizer.days > 5
+
+    def test_iter_availability_chunks_stops_on_error(self):
+        client = ResyAPIClient(api_key="test_api_key", base_url="test_base_url")
+        client.chunk_sizer = ChunkSizer(initial_days=3, min_days=3)
+        client.chunk_workers = 1
+
+        with patch.object(client, "_fetch_range", side_effect=ValueError("Venue ID 12345 not found.")) as fetch:
+            chunks = client.iter_availability_chunks(12345, 2, "2024-12-01", "2024-12-30")
+            with pytest.raises(ValueError):
+                next(chunks)
+            chunks.close()
+
+        # Chunks still queued behind the failed one were cancelled
+        assert fetch.call_count < 10
+
+    def test_find_venue(self):
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": {"resy": 6066}, "name": "Una Pizza Napoletana"}
+        self.mock_get.return_value = mock_response
+
+        client = ResyAPIClient(api_key="test_api_key", base_url="https://api.resy.com/4")
+
+        assert client.find_venue("una-pizza-napoletana") == (6066, "Una Pizza Napoletana")
+        assert self.mock_get.call_args[0][0] == "https://api.resy.com/3/venue"
+        assert self.mock_get.call_args[1]["params"] == {"url_slug": "una-pizza-napoletana", "location": "ny"}
+
+    def test_find_venue_not_found(self):
+        mock_response = Mock()
+        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "Not Found", request=Mock(), response=Mock(status_code=404)
+        )
+        self.mock_get.return_value = mock_response
+
+        client = ResyAPIClient(api_key="test_api_key", base_url="https://api.resy.com/4")
+
+        assert client.find_venue("closed-place") is None
+
     def test_missing_api_key(self):
         mock_response = Mock()
         mock_response.json.return_value = {}
@@ -152,3 +223,76 @@ class TestResyAPIClient:
             assert False, "Expected ValueError for invalid venue ID."
         except ValueError as e:
             assert str(e) == "Venue ID 99999 not found."
+
+    def test_stage_timer_records_fetch_parse_notify(self):
+        mock_response = Mock()
+        mock_response.json.return_value = self.mock_response_data
+        mock_response.status_code = 200
+        self.mock_get.return_value = mock_response
+
+        client = ResyAPIClient(api_key="test_api_key", base_url="test_base_url")
+        client.stage_timer = StageTimer()
+        client.get_availability(venue_id=12345)
+
+        assert set(client.stage_timer.report()) == {"fetch", "parse", "notify"}
+
+    def test_get_availability_many_in_input_order_with_errors(self):
+        client = ResyAPIClient(api_key="test_api_key", base_url="test_base_url")
+
+        def fake_fetch(venue_id, party_size, start_date, end_date):
+            time.sleep(0.01 * (5 - venue_id))
+            if venue_id == 3:
+                raise ValueError(f"Venue ID {venue_id} not found.")
+            return [venue_id]
+
+        with patch.object(client, "fetch_availability", side_effect=fake_fetch):
+            results = client.get_availability_many(
+                [(venue_id, 2, "2024-12-01", "2024-12-07") for venue_id in range(1, 5)], max_workers=4
+            )
+
+        assert [result.index for result in results] == [0, 1, 2, 3]
+        assert [result.ok for result in results] == [True, True, False, True]
+        assert results[0].availability == [1]
+        assert results[0].request == (1, 2, "2024-12-01", "2024-12-07")
+        assert str(results[2].error) == "Venue ID 3 not found."
+
+    def test_get_availability_many_runs_concurrently(self):
+        client = ResyAPIClient(api_key="test_api_key", base_url="test_base_url")
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_fetch(*request):
+            with lock:
+                in_flight.append(request)
+                peak.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.remove(request)
+            return []
+
+        with patch.object(client, "fetch_availability", side_effect=fake_fetch):
+            started = time.perf_counter()
+            results = client.get_availability_many([(i, 2, None, None) for i in range(40)], max_workers=20)
+            elapsed = time.perf_counter() - started
+
+        assert len(results) == 40
+        assert max(peak) == 20
+        # Two waves of 50ms rather than forty sequential requests
+        assert elapsed < 1.0
+
+    def test_iter_availability_many_streams_in_completion_order(self):
+        client = ResyAPIClient(api_key="test_api_key", base_url="test_base_url")
+
+        def fake_fetch(venue_id, *rest):
+            time.sleep(0.1 if venue_id == 1 else 0)
+            return [venue_id]
+
+        with patch.object(client, "fetch_availability", side_effect=fake_fetch):
+            indexes = [result.index for result in client.iter_availability_many([(1, 2, None, None), (2, 2, None, None)])]
+
+        assert indexes == [1, 0]
+
+    def test_get_availability_many_empty(self):
+        client = ResyAPIClient(api_key="test_api_key", base_url="test_base_url")
+        assert client.get_availability_many([]) == []
@@ -0,0 +1,95 @@
+import threading
+import time
+import pytest
+from src.resy_notifier.availability_cache import AvailabilityCache
+from tests.resy_notifier.fakes import FakeClock
+
+
+class TestAvailabilityCache:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.calls = []
+
+    def fetch(self, venue_id, party_size):
+        self.calls.append((venue_id, party_size))
+        return f"calendar-{venue_id}-{party_size}-{len(self.calls)}"
+
+    def test_hit_until_ttl_expires(self):
+        cache = AvailabilityCache(self.fetch, ttl=30, clock=self.clock)
+
+        assert cache.get((1, 2)).value == "calendar-1-2-1"
+        self.clock.now = 29
+        assert cache.get((1, 2)).value == "calendar-1-2-1"
+        self.clock.now = 30
+        assert cache.get((1, 2)).value == "calendar-1-2-2"
+        assert cache.stats["hits"] == 1
+        assert cache.stats["upstream_fetches"] == 2
+
+    def test_lru_eviction(self):
+        cache = AvailabilityCache(self.fetch, ttl=30, max_entries=2, clock=self.clock)
+        cache.get((1, 2))
+        cache.get((2, 2))
+        cache.get((1, 2))  # (1, 2) is now most recently used
+        cache.get((3, 2))  # evicts (2, 2)
+
+        assert len(cache) == 2
+        assert cache.stats["evictions"] == 1
+        cache.get((1, 2))
+        assert self.calls.count((1, 2)) == 1
+        cache.get((2, 2))
+        assert self.calls.count((2, 2)) == 2
+
+    def test_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_fetch(venue_id, party_size):
+            calls.append(venue_id)
+            started.set()
+            release.wait(5)
+            return "calendar"
+
+        cache = AvailabilityCache(slow_fetch, ttl=30)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get((1, 2)).value)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert calls == [1]
+        assert results == ["calendar"] * 20
+
+    def test_error_without_cached_entry(self):
+        def failing_fetch(venue_id, party_size):
+            raise ValueError("Network error occurred: boom")
+
+        cache = AvailabilityCache(failing_fetch, ttl=30, clock=self.clock)
+        with pytest.raises(ValueError, match="boom"):
+            cache.get((1, 2))
+        assert cache.stats["upstream_errors"] == 1
+        assert len(cache) == 0
+
+    def test_serves_stale_entry_on_error(self):
+        responses = iter(["fresh"])
+
+        def flaky_fetch(venue_id, party_size):
+            try:
+                return next(responses)
+            except StopIteration:
+                raise ValueError("HTTP error occurred: 500")
+
+        cache = AvailabilityCache(flaky_fetch, ttl=30, clock=self.clock)
+        cache.get((1, 2))
+        self.clock.now = 60
+
+        assert cache.get((1, 2)).value == "fresh"
+        assert cache.stats["upstream_errors"] == 1
+
+    def test_invalid_max_entries(self):
+        with pytest.raises(ValueError, match="max_entries must be at least 1."):
+            AvailabilityCache(self.fetch, max_entries=0)
@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import patch
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.booking import AutoBooker, BookingConfig, BookingGuardrails
+from src.resy_notifier.model.availability import get_newly_available
+from src.resy_notifier.model.slot import Slot
+from tests.resy_notifier.stand_in_api import StandInResyAPI
+
+
+def _calendar_day(date, reservation):
+    return {"date": date, "inventory": {"reservation": reservation, "event": "not available", "walk-in": "not available"}}
+
+
+class TestBookingGuardrails:
+    def test_time_window(self):
+        guardrails = BookingGuardrails(earliest_time="18:00", latest_time="20:00")
+        assert guardrails.allows(Slot("a", "2024-12-01 18:00:00"))
+        assert not guardrails.allows(Slot("b", "2024-12-01 17:30:00"))
+        assert not guardrails.allows(Slot("c", "2024-12-01 20:15:00"))
+
+    def test_time_window_without_leading_zero(self):
+        guardrails = BookingGuardrails(earliest_time="9:00", latest_time="21:00")
+        assert guardrails.allows(Slot("a", "2024-12-01 18:00:00"))
+        assert not guardrails.allows(Slot("b", "2024-12-01 08:30:00"))
+
+    def test_invalid_time_window(self):
+        with pytest.raises(ValueError, match="Invalid time '6pm'"):
+            BookingGuardrails(earliest_time="6pm")
+        with pytest.raises(ValueError, match="earliest_time must not be after latest_time."):
+            BookingGuardrails(earliest_time="21:00", latest_time="18:00")
+
+    def test_max_bookings(self):
+        guardrails = BookingGuardrails(max_bookings=1)
+        guardrails.record()
+        assert guardrails.exhausted
+        assert not guardrails.allows(Slot("a", "2024-12-01 18:00:00"))
+
+    def test_invalid_max_bookings(self):
+        with pytest.raises(ValueError, match="max_bookings must be at least 1."):
+            BookingGuardrails(max_bookings=0)
+
+
+class TestBookingConfig:
+    @patch("src.resy_notifier.booking.load_dotenv")
+    @patch.dict("os.environ", {"RESY_AUTH_TOKEN": "token", "RESY_PAYMENT_METHOD_ID": "42"})
+    def test_from_environment(self, mock_load_dotenv):
+        config = BookingConfig()
+        assert config.auth_token == "token"
+        assert config.payment_method_id == 42
+
+    @patch("src.resy_notifier.booking.load_dotenv")
+    @patch.dict("os.environ", {}, clear=True)
+    def test_missing_credentials(self, mock_load_dotenv):
+        with pytest.raises(ValueError, match="Booking credentials are not set in environment variables."):
+            BookingConfig()
+
+
+class TestAutoBookerAgainstStandInAPI:
+    def setup_method(self):
+        self.api = StandInResyAPI().__enter__()
+        self.client = ResyAPIClient(api_key="test_api_key", base_url=self.api.base_url)
+        self.config = BookingConfig(auth_token="auth", payment_method_id=42)
+
+    def teardown_method(self):
+        self.client.close()
+        self.api.__exit__()
+
+    def test_prepare_rejects_unknown_payment_method(self):
+        booker = AutoBooker(self.client, BookingConfig("auth", 7), BookingGuardrails())
+        with pytest.raises(ValueError, match="Payment method 7 is not on the Resy profile."):
+            booker.prepare()
+
+    def test_books_first_allowed_slot_on_detection(self):
+        """Test the end-to-end path from a calendar change to a booking request."""
+        booker = AutoBooker(self.client, self.config, BookingGuardrails(max_bookings=1, earliest_time="19:00"))
+        booker.prepare()
+
+        self.api.calendar = [_calendar_day("2024-12-01", "sold-out")]
+        previous = self.client.fetch_availability(6066, 2, "2024-12-01", "2024-12-01")
+
+        self.api.calendar = [_calendar_day("2024-12-01", "available")]
+        self.api.slots["2024-12-01"] = [("cfg-1730", "2024-12-01 17:30:00"), ("cfg-1900", "2024-12-01 19:00:00")]
+        current = self.client.fetch_availability(6066, 2, "2024-12-01", "2024-12-01")
+
+        result = booker.try_book(6066, 2, get_newly_available(previous, current))
+
+        assert result.slot.config_id == "cfg-1900"
+        assert result.resy_token == "resy:1"
+        assert 0 <= result.request_latency_ms <= result.total_latency_ms
+        assert self.api.booked == ["book:cfg-1900"]
+        book_request = self.api.requests[-1]
+        assert book_request[:2] == ("POST", "/3/book")
+        assert book_request[2]["struct_payment_method"] == '{"id": 42}'
+
+        # The guardrail stops any further bookings for this watch
+        assert booker.try_book(6066, 2, get_newly_available(None, current)) is None
+        assert self.api.booked == ["book:cfg-1900"]
+
+    def test_no_allowed_slot(self):
+        booker = AutoBooker(self.client, self.config, BookingGuardrails(latest_time="18:00"))
+        self.api.calendar = [_calendar_day("2024-12-01", "available")]
+        self.api.slots["2024-12-01"] = [("cfg-2100", "2024-12-01 21:00:00")]
+
+        current = self.client.fetch_availability(6066, 2, "2024-12-01", "2024-12-01")
+
+        assert booker.try_book(6066, 2, current) is None
+        assert self.api.booked == []
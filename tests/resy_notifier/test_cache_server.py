@@ -0,0 +1,54 @@
+import threading
+import httpx
+from src.resy_notifier.availability_cache import AvailabilityCache
+from src.resy_notifier.cache_server import CacheServer
+from src.resy_notifier.model.availability import Availability, Inventory, parse_response
+
+
+class TestCacheServer:
+    def setup_method(self):
+        self.calls = []
+
+        def fetch(venue_id, party_size, start_date, end_date):
+            self.calls.append((venue_id, party_size, start_date, end_date))
+            if venue_id == 404:
+                raise ValueError("Venue ID 404 not found.")
+            return [Availability(start_date, Inventory("available", "not available", "available"))]
+
+        self.server = CacheServer(AvailabilityCache(fetch, ttl=60), port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address
+        self.base_url = f"http://{host}:{port}"
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_availability_is_served_from_cache(self):
+        params = {"venue_id": 6066, "party_size": 2, "start_date": "2024-12-01", "end_date": "2024-12-07"}
+        first = httpx.get(f"{self.base_url}/availability", params=params)
+        second = httpx.get(f"{self.base_url}/availability", params=params)
+
+        assert first.status_code == second.status_code == 200
+        assert self.calls == [(6066, 2, "2024-12-01", "2024-12-07")]
+        body = second.json()
+        assert body["venue_id"] == 6066
+        assert body["age_seconds"] >= 0
+        # The payload parses with the same code as the upstream calendar
+        assert parse_response(body)[0].inventory.walk_in == "available"
+
+        stats = httpx.get(f"{self.base_url}/stats").json()
+        assert stats["hits"] == 1
+        assert stats["upstream_fetches"] == 1
+        assert stats["entries"] == 1
+
+    def test_bad_request(self):
+        assert httpx.get(f"{self.base_url}/availability", params={"venue_id": "abc"}).status_code == 400
+        assert httpx.get(f"{self.base_url}/availability").status_code == 400
+        assert httpx.get(f"{self.base_url}/unknown").status_code == 404
+
+    def test_upstream_error(self):
+        response = httpx.get(f"{self.base_url}/availability", params={"venue_id": 404})
+        assert response.status_code == 502
+        assert response.json() == {"error": "Venue ID 404 not found."}
@@ -0,0 +1,76 @@
+import json
+import os
+from unittest.mock import patch
+import pytest
+from src.resy_notifier.checkpoint import CheckpointStore, WatchState, atomic_write_json
+from src.resy_notifier.model.availability import Availability, Inventory, get_newly_available
+
+
+class TestWatchState:
+    def test_round_trip(self):
+        state = WatchState(["2024-12-02", "2024-12-01", "2024-12-01"], True, 1700000000.5)
+        restored = WatchState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+        assert restored.available_dates == ["2024-12-01", "2024-12-02"]
+        assert restored.last_state is True
+        assert restored.next_due_at == 1700000000.5
+
+    def test_snapshot_diffs_like_the_original(self):
+        state = WatchState(["2024-12-01"])
+        current = [
+            Availability("2024-12-01", Inventory("available", "", "")),
+            Availability("2024-12-02", Inventory("available", "", "")),
+        ]
+
+        assert [day.date for day in get_newly_available(state.snapshot(), current)] == ["2024-12-02"]
+
+
+class TestCheckpointStore:
+    def test_save_and_load(self, tmp_path):
+        store = CheckpointStore(str(tmp_path / "nested" / "checkpoint.json"))
+        store.save({"6066:2": WatchState(["2024-12-01"], True, 10.0)})
+
+        states = store.load()
+
+        assert list(states) == ["6066:2"]
+        assert states["6066:2"].available_dates == ["2024-12-01"]
+        assert os.listdir(tmp_path / "nested") == ["checkpoint.json"]
+
+    def test_missing_file(self, tmp_path):
+        assert CheckpointStore(str(tmp_path / "missing.json")).load() == {}
+
+    @pytest.mark.parametrize("content", ["{not json", '{"version": 99, "watches": {}}', "[]"])
+    def test_unreadable_file_is_ignored(self, tmp_path, content):
+        path = tmp_path / "checkpoint.json"
+        path.write_text(content)
+        assert CheckpointStore(str(path)).load() == {}
+
+    def test_failed_write_keeps_previous_checkpoint(self, tmp_path):
+        path = tmp_path / "checkpoint.json"
+        store = CheckpointStore(str(path))
+        store.save({"6066:2": WatchState(["2024-12-01"])})
+
+        with patch("src.resy_notifier.checkpoint.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                store.save({"6066:2": WatchState(["2024-12-09"])})
+
+        assert store.load()["6066:2"].available_dates == ["2024-12-01"]
+        assert os.listdir(tmp_path) == ["checkpoint.json"]
+
+
+class TestAtomicWriteJson:
+    def test_data_reaches_disk_before_the_file_is_replaced(self, tmp_path):
+        path = tmp_path / "state.json"
+        calls = []
+        fsync, replace = os.fsync, os.replace
+
+        def record(name, function):
+            return lambda *args: calls.append(name) or function(*args)
+
+        with patch("src.resy_notifier.checkpoint.os.fsync", side_effect=record("fsync", fsync)), \
+                patch("src.resy_notifier.checkpoint.os.replace", side_effect=record("replace", replace)):
+            atomic_write_json(str(path), {"a": [1, 2]}, ".state-")
+
+        assert calls == ["fsync", "replace"]
+        assert json.loads(path.read_text()) == {"a": [1, 2]}
+        assert os.listdir(tmp_path) == ["state.json"]
@@ -0,0 +1,57 @@
+import pytest
+from src.resy_notifier.chunking import ChunkSizer, split_date_range
+
+
+class TestSplitDateRange:
+    def test_splits_into_consecutive_chunks(self):
+        assert split_date_range("2024-12-01", "2024-12-10", 4) == [
+            ("2024-12-01", "2024-12-04"),
+            ("2024-12-05", "2024-12-08"),
+            ("2024-12-09", "2024-12-10"),
+        ]
+
+    def test_single_day(self):
+        assert split_date_range("2024-12-01", "2024-12-01", 7) == [("2024-12-01", "2024-12-01")]
+
+    def test_crosses_month_boundary(self):
+        assert split_date_range("2024-12-30", "2025-01-02", 2) == [
+            ("2024-12-30", "2024-12-31"),
+            ("2025-01-01", "2025-01-02"),
+        ]
+
+    def test_rejects_invalid_input(self):
+        with pytest.raises(ValueError):
+            split_date_range("2024-12-01", "2024-12-10", 0)
+        with pytest.raises(ValueError):
+            split_date_range("2024-12-10", "2024-12-01", 7)
+
+
+class TestChunkSizer:
+    def test_grows_when_chunks_are_fast(self):
+        sizer = ChunkSizer(initial_days=10, target_seconds=0.5, max_days=31)
+
+        sizer.observe(10, 0.25)
+
+        # 10 days in 0.25s suggests 20 days; the size moves halfway there
+        assert sizer.days == 15
+
+    def test_shrinks_when_chunks_are_slow(self):
+        sizer = ChunkSizer(initial_days=10, target_seconds=0.5, min_days=3)
+
+        sizer.observe(10, 2.0)
+
+        assert sizer.days == 6
+
+    def test_stays_within_bounds(self):
+        sizer = ChunkSizer(initial_days=10, min_days=3, max_days=12)
+
+        for _ in range(10):
+            sizer.observe(10, 0.001)
+        assert sizer.days == 12
+        for _ in range(10):
+            sizer.observe(3, 60)
+        assert sizer.days == 3
+
+    def test_rejects_inconsistent_bounds(self):
+        with pytest.raises(ValueError):
+            ChunkSizer(min_days=10, max_days=5)
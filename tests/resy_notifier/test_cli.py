@@ -1,6 +1,14 @@
+import contextlib
+import io
+import json
+import tempfile
 import unittest
 from unittest.mock import patch, Mock, call
-from src.resy_notifier.cli import main
+from src.resy_notifier.cli import load_watches, main
+from src.resy_notifier.email_helper import EmailHelper
+from src.resy_notifier.model.availability import Availability, Inventory
+from src.resy_notifier.model.subscription import Subscription
+from src.resy_notifier.model.watch import GroupWatch, Watch
 
 class TestCLI(unittest.TestCase):
     def setUp(self):
@@ -54,3 +62,385 @@ class TestCLI(unittest.TestCase):
             call('Sending request for venue_id=12345, party_size=4, start_date=2024-12-01, end_date=2024-12-07'),
             call("Availability returned for Una Pizza Napoletana: [{'date': '2024-12-01', 'inventory': {'reservation': 'available'}}]")
         ])
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_subscriptions(self, mock_db_manager, mock_api_client):
+        mock_db_instance = Mock()
+        mock_db_instance.get_active_api_key.return_value = "test_api_key"
+        mock_db_instance.get_active_subscriptions.return_value = [
+            Subscription("a@example.com", 12345, 2, "2024-12-01", "2024-12-07"),
+            Subscription("b@example.com", 12345, 2, "2024-12-03", "2024-12-10"),
+        ]
+        mock_db_manager.return_value = mock_db_instance
+
+        mock_client_instance = Mock()
+        mock_client_instance.fetch_availability.return_value = []
+        mock_api_client.return_value = mock_client_instance
+
+        with patch("sys.argv", ["main.py", "--subscriptions", "30"]):
+            main(loop_limit=2)
+
+        self.assertEqual(mock_client_instance.fetch_availability.call_count, 2)
+        mock_client_instance.fetch_availability.assert_called_with(12345, 2, "2024-12-01", "2024-12-10")
+        self.mock_sleep.assert_called_once_with(30)
+
+    @patch("src.resy_notifier.cli.AutoBooker")
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    @patch("builtins.print")
+    def test_main_auto_book_invalid_time(self, mock_print, mock_db_manager, mock_api_client, mock_auto_booker):
+        mock_db_manager.return_value.get_venue_info.return_value = (12345, "Una Pizza Napoletana")
+
+        with patch("sys.argv", ["main.py", "una-pizza-napoletana", "2", "--auto-book", "--earliest=6pm"]):
+            with self.assertRaises(SystemExit):
+                main(loop_limit=1)
+
+        mock_print.assert_called_once_with("Invalid booking guardrails: Invalid time '6pm'. Use 'HH:MM', e.g. 18:30.")
+        mock_auto_booker.assert_not_called()
+
+    @patch("src.resy_notifier.cli.BookingConfig")
+    @patch("src.resy_notifier.cli.AutoBooker")
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_auto_book(self, mock_db_manager, mock_api_client, mock_auto_booker, mock_booking_config):
+        mock_db_instance = Mock()
+        mock_db_instance.get_active_api_key.return_value = "test_api_key"
+        mock_db_instance.get_venue_info.return_value = (12345, "Una Pizza Napoletana")
+        mock_db_manager.return_value = mock_db_instance
+
+        available = [Availability("2024-12-01", Inventory("available", "not available", "not available"))]
+        mock_client_instance = Mock()
+        mock_client_instance.fetch_availability.side_effect = [[], available, available]
+        mock_api_client.return_value = mock_client_instance
+
+        mock_booker = Mock()
+        mock_booker.guardrails.exhausted = False
+        mock_booker.try_book.return_value = None
+        mock_auto_booker.return_value = mock_booker
+
+        with patch("sys.argv", ["main.py", "una-pizza-napoletana", "2", "--auto-book", "--earliest=18:00"]):
+            main(loop_limit=3)
+
+        mock_booker.prepare.assert_called_once()
+        guardrails = mock_auto_booker.call_args[0][2]
+        self.assertEqual(guardrails.earliest_time, "18:00")
+        # Only the transition to available triggers a booking attempt
+        mock_booker.try_book.assert_called_once()
+        self.assertEqual(mock_booker.try_book.call_args[0][2], available)
+        mock_client_instance.get_availability.assert_not_called()
+        self.assertEqual(mock_client_instance.email_helper.check_and_notify_availability.call_count, 3)
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_chunked(self, mock_db_manager, mock_api_client):
+        mock_db_manager.return_value.get_venue_info.return_value = (6066, "Una Pizza Napoletana")
+        mock_client_instance = mock_api_client.return_value
+        notify = mock_client_instance.email_helper.check_and_notify_availability
+
+        def chunks(*args):
+            yield [Availability("2024-12-01", Inventory("available", "not available", "not available"))]
+            # The near-term chunk was notified before the later one arrived
+            notify.assert_called_once()
+            yield [Availability("2025-02-01", Inventory("available", "not available", "not available"))]
+        mock_client_instance.iter_availability_chunks.side_effect = chunks
+
+        with patch("sys.argv", ["main.py", "una-pizza-napoletana", "2", "2024-12-01", "2025-02-28", "--chunk-days=30"]):
+            main(loop_limit=1)
+
+        mock_client_instance.iter_availability_chunks.assert_called_once_with(6066, 2, "2024-12-01", "2025-02-28")
+        mock_client_instance.get_availability.assert_not_called()
+        self.assertEqual(
+            [[day.date for day in c.args[1]] for c in notify.call_args_list], [["2024-12-01"], ["2025-02-01"]]
+        )
+
+    @patch("src.resy_notifier.cli.Profiler")
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_profile(self, mock_db_manager, mock_api_client, mock_profiler):
+        mock_db_instance = Mock()
+        mock_db_instance.get_active_api_key.return_value = "test_api_key"
+        mock_db_instance.get_venue_info.return_value = (12345, "Una Pizza Napoletana")
+        mock_db_manager.return_value = mock_db_instance
+
+        mock_client_instance = Mock()
+        mock_client_instance.get_availability.return_value = []
+        mock_api_client.return_value = mock_client_instance
+
+        with patch("sys.argv", ["main.py", "una-pizza-napoletana", "--profile=/tmp/resy-profile", "--profile-every=5"]):
+            main(loop_limit=2)
+
+        mock_profiler.assert_called_once_with("/tmp/resy-profile", 5)
+        mock_profiler.return_value.start.assert_called_once()
+        mock_profiler.return_value.end_iteration.assert_has_calls([call(1), call(2)])
+        mock_profiler.return_value.stop.assert_called_once()
+        self.assertIsNotNone(mock_client_instance.stage_timer)
+        timing_logs = [c for c in self.mock_logger.info.call_args_list if "Stage timings" in c[0][0]]
+        self.assertEqual(len(timing_logs), 2)
+        self.assertIn("diff=", timing_logs[0][0][0])
+        self.assertIn("log=", timing_logs[0][0][0])
+
+    @patch("builtins.print")
+    def test_main_simulate(self, mock_print):
+        with patch("sys.argv", ["main.py", "--simulate", "--duration=3600", "--days=3", "--seed=1", "600"]):
+            main()
+
+        report = mock_print.call_args[0][0]
+        self.assertEqual(report.requests, 6)
+        self.assertEqual(report.simulated_seconds, 3600)
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_checkpoint_warm_restart(self, mock_db_manager, mock_api_client):
+        mock_db_instance = Mock()
+        mock_db_instance.get_active_api_key.return_value = "test_api_key"
+        mock_db_instance.get_venue_info.return_value = (12345, "Una Pizza Napoletana")
+        mock_db_manager.return_value = mock_db_instance
+
+        day_1 = Availability("2024-12-01", Inventory("available", "not available", "not available"))
+        day_2 = Availability("2024-12-02", Inventory("available", "not available", "not available"))
+        mock_client_instance = Mock()
+        mock_api_client.return_value = mock_client_instance
+        notify = mock_client_instance.email_helper.check_and_notify_availability
+
+        with tempfile.TemporaryDirectory() as directory:
+            argv = ["main.py", "una-pizza-napoletana", "4", "2024-12-01", "2024-12-07", "60",
+                    f"--checkpoint={directory}/checkpoint.json"]
+
+            mock_client_instance.fetch_availability.return_value = [day_1]
+            with patch("sys.argv", argv):
+                main(loop_limit=1)
+            self.assertEqual(notify.call_args[0][1], [day_1])
+
+            # The restarted process waits for the checkpointed due time and does not re-notify day_1
+            notify.reset_mock()
+            self.mock_sleep.reset_mock()
+            mock_client_instance.fetch_availability.return_value = [day_1, day_2]
+            with patch("sys.argv", argv):
+                main(loop_limit=1)
+
+        self.assertEqual(notify.call_args[0][1], [day_2])
+        self.assertEqual(len(self.mock_sleep.call_args_list), 1)
+        self.assertGreater(self.mock_sleep.call_args[0][0], 50)
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_watches(self, mock_db_manager, mock_api_client):
+        mock_db_instance = Mock()
+        mock_db_instance.get_active_api_key.return_value = "test_api_key"
+        mock_db_instance.get_venue_info.side_effect = lambda url_name: {
+            "una-pizza-napoletana": (6066, "Una Pizza Napoletana"),
+            "the-four-horsemen": (2492, "The Four Horsemen"),
+        }[url_name]
+        mock_db_manager.return_value = mock_db_instance
+
+        mock_client_instance = Mock()
+        mock_client_instance.fetch_availability.return_value = []
+        mock_api_client.return_value = mock_client_instance
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write('[{"venue": "una-pizza-napoletana", "party_size": 4, "weight": 3, "interval": 0.1},'
+                    ' {"venue": "the-four-horsemen", "interval": 0.1}]')
+
+        with patch("sys.argv", ["main.py", f"--watches={f.name}", "--rpm=120"]):
+            main(loop_limit=8)
+
+        venues = [c[0][0] for c in mock_client_instance.fetch_availability.call_args_list]
+        self.assertEqual(venues.count(6066), 6)
+        self.assertEqual(venues.count(2492), 2)
+        mock_client_instance.close.assert_called_once()
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_watches_checkpoint(self, mock_db_manager, mock_api_client):
+        mock_db_manager.return_value.get_venue_info.return_value = (6066, "Una Pizza Napoletana")
+        mock_client_instance = mock_api_client.return_value
+        mock_client_instance.fetch_availability.return_value = [
+            Availability("2024-12-01", Inventory("available", "not available", "not available"))
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            watches_path = f"{directory}/watches.json"
+            checkpoint_path = f"{directory}/checkpoint.json"
+            with open(watches_path, "w") as f:
+                f.write('[{"venue": "una-pizza-napoletana", "start_date": "2024-12-01", "end_date": "2024-12-07"}]')
+
+            argv = ["main.py", f"--watches={watches_path}", f"--checkpoint={checkpoint_path}"]
+            with patch("sys.argv", argv):
+                main(loop_limit=1)
+            with open(checkpoint_path) as f:
+                self.assertEqual(json.load(f)["watches"]["6066:2:2024-12-01:2024-12-07"]["dates"], ["2024-12-01"])
+
+            # After a restart the date that was already notified is not sent again
+            with patch("sys.argv", argv):
+                main(loop_limit=1)
+
+        self.assertEqual(mock_client_instance.email_helper.check_and_notify_availability.call_count, 1)
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_watches_pipeline(self, mock_db_manager, mock_api_client):
+        mock_db_instance = Mock()
+        mock_db_instance.get_active_api_key.return_value = "test_api_key"
+        mock_db_instance.get_venue_info.return_value = (6066, "Una Pizza Napoletana")
+        mock_db_manager.return_value = mock_db_instance
+
+        mock_client_instance = Mock()
+        mock_client_instance.fetch_calendar.side_effect = [
+            {"scheduled": [{"date": "2024-12-01", "inventory": {"reservation": reservation}}]}
+            for reservation in ["sold-out", "available", "available"]
+        ]
+        mock_api_client.return_value = mock_client_instance
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write('[{"venue": "una-pizza-napoletana", "interval": 0.1}]')
+
+        with patch("sys.argv", ["main.py", f"--watches={f.name}", "--rpm=600", "--pipeline=2"]):
+            main(loop_limit=3)
+
+        self.assertEqual(mock_client_instance.fetch_calendar.call_count, 3)
+        mock_client_instance.email_helper.check_and_notify_availability.assert_called_once()
+        mock_client_instance.close.assert_called_once()
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_watches_chunked(self, mock_db_manager, mock_api_client):
+        mock_db_manager.return_value.get_venue_info.return_value = (6066, "Una Pizza Napoletana")
+        mock_client_instance = mock_api_client.return_value
+        mock_client_instance.iter_availability_chunks.return_value = iter([[], []])
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write('[{"venue": "una-pizza-napoletana", "start_date": "2024-12-01", "end_date": "2025-02-28"}]')
+
+        with patch("sys.argv", ["main.py", f"--watches={f.name}", "--chunk-days=10"]):
+            main(loop_limit=1)
+
+        self.assertEqual(mock_client_instance.chunk_sizer.days, 10)
+        mock_client_instance.iter_availability_chunks.assert_called_once_with(6066, 2, "2024-12-01", "2025-02-28")
+        mock_client_instance.fetch_availability.assert_not_called()
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_watches_pipeline_ignores_chunking(self, mock_db_manager, mock_api_client):
+        mock_client_instance = mock_api_client.return_value
+
+        with patch("sys.argv", ["main.py", "--watches", "--pipeline", "--chunk-days=10"]):
+            main(loop_limit=1)
+
+        self.assertIsNone(mock_client_instance.chunk_sizer)
+
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_watches_events(self, mock_db_manager, mock_api_client):
+        mock_db_manager.return_value.get_venue_info.return_value = (6066, "Una Pizza Napoletana")
+        mock_api_client.return_value.fetch_availability.side_effect = [
+            [Availability("2024-12-01", Inventory("sold-out", "not available", "not available"))],
+            [Availability("2024-12-01", Inventory("available", "not available", "not available"))],
+        ]
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write('[{"venue": "una-pizza-napoletana", "interval": 0.1}]')
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as events:
+            pass
+
+        with patch("sys.argv", ["main.py", f"--watches={f.name}", "--rpm=600", f"--events={events.name}"]):
+            main(loop_limit=2)
+
+        with open(events.name) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["new_status"] for line in lines], ["sold-out", "available"])
+        self.assertEqual(lines[1]["venue_name"], "Una Pizza Napoletana")
+
+    @patch("smtplib.SMTP")
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    @patch.dict("os.environ", {
+        "SENDER_EMAIL": "sender@example.com",
+        "SENDER_PASSWORD": "password",
+        "RECIPIENT_EMAIL": "recipient@example.com",
+        "SMTP_SERVER": "smtp.example.com",
+        "SMTP_PORT": "587",
+    })
+    def test_main_events_on_stdout_are_only_json(self, mock_db_manager, mock_api_client, mock_smtp):
+        mock_db_manager.return_value.get_venue_info.return_value = (12345, "Una Pizza Napoletana")
+        mock_client_instance = mock_api_client.return_value
+        mock_client_instance.email_helper = EmailHelper()
+        mock_client_instance.fetch_availability.side_effect = [
+            [Availability("2024-12-01", Inventory("sold-out", "not available", "not available"))],
+            [Availability("2024-12-01", Inventory("available", "not available", "not available"))],
+        ]
+
+        stdout = io.StringIO()
+        with patch("sys.argv", ["main.py", "una-pizza-napoletana", "2", "2024-12-01", "2024-12-01", "0", "--events"]):
+            with contextlib.redirect_stdout(stdout):
+                main(loop_limit=2)
+
+        # An email went out, and nothing but events reached stdout
+        mock_smtp.return_value.__enter__.return_value.send_message.assert_called_once()
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([line["new_status"] for line in lines], ["sold-out", "available"])
+
+    @patch("src.resy_notifier.cli.AdminServer")
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    def test_main_watches_admin(self, mock_db_manager, mock_api_client, mock_admin_server):
+        mock_db_manager.return_value.get_venue_info.return_value = (6066, "Una Pizza Napoletana")
+        mock_admin_server.return_value.server_address = ("127.0.0.1", 9000)
+
+        # No file: every watch is added through the admin API
+        with patch("sys.argv", ["main.py", "--watches", "--admin=9000"]):
+            main(loop_limit=1)
+
+        engine, build_watch = mock_admin_server.call_args[0]
+        self.assertEqual(mock_admin_server.call_args[1], {"port": 9000})
+        self.assertEqual(build_watch({"venue": "una-pizza-napoletana"}).venue_id, 6066)
+        mock_admin_server.return_value.shutdown.assert_called_once()
+
+    @patch("src.resy_notifier.cli.VenueResolver")
+    @patch("src.resy_notifier.cli.ResyAPIClient")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    @patch("builtins.print")
+    def test_main_resolve_venues(self, mock_print, mock_db_manager, mock_api_client, mock_resolver):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("lucali\n\nl-industrie\n")
+
+        with patch("sys.argv", ["main.py", f"--resolve-venues={f.name}", "una-pizza-napoletana", "--location=bk"]):
+            main()
+
+        args = mock_resolver.call_args[0]
+        self.assertEqual(args[2:], ("bk", 8))
+        mock_resolver.return_value.resolve.assert_called_once_with(["una-pizza-napoletana", "lucali", "l-industrie"])
+        mock_api_client.return_value.close.assert_called_once()
+
+    @patch("src.resy_notifier.cli.MigrationRunner")
+    @patch("src.resy_notifier.cli.DatabaseManager")
+    @patch("builtins.print")
+    def test_main_migrate_dry_run(self, mock_print, mock_db_manager, mock_runner):
+        migration = Mock(version=2)
+        migration.name = "add_lookup_indexes"
+        mock_runner.return_value.migrate.return_value = [migration]
+
+        with patch("sys.argv", ["main.py", "--migrate", "--dry-run"]):
+            main()
+
+        mock_runner.return_value.migrate.assert_called_once_with(dry_run=True)
+        mock_print.assert_called_once_with("Pending: 002 add_lookup_indexes")
+
+    def test_load_watches_with_group(self):
+        db_manager = Mock()
+        db_manager.get_venue_info.side_effect = lambda url_name: {
+            "una-pizza-napoletana": (6066, "Una Pizza Napoletana"),
+            "lucali": (2492, "Lucali"),
+        }[url_name]
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write('[{"venue": "una-pizza-napoletana"},'
+                    ' {"group": "Pizza", "venues": ["una-pizza-napoletana", "lucali"], "party_size": 4,'
+                    ' "concurrency": 3}]')
+
+        single, group = load_watches(f.name, db_manager)
+
+        self.assertIsInstance(single, Watch)
+        self.assertIsInstance(group, GroupWatch)
+        self.assertEqual(group.members, [(6066, "Una Pizza Napoletana"), (2492, "Lucali")])
+        self.assertEqual((group.party_size, group.concurrency, group.stop_on_match), (4, 3, True))
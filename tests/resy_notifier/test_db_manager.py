@@ -2,7 +2,10 @@ import pytest
 from unittest.mock import patch, Mock
 from src.resy_notifier.db_manager import DatabaseManager
 from mysql.connector import Error as MySQLError
-from src.resy_notifier.constants.queries import GET_ACTIVE_API_KEY, GET_VENUE_INFO
+from src.resy_notifier.constants.queries import (
+    GET_ACTIVE_API_KEY, GET_VENUE_INFO, GET_ACTIVE_SUBSCRIPTIONS, UPSERT_VENUE
+)
+from datetime import date, timedelta
 
 class TestDatabaseManager:
     @patch("mysql.connector.connect")
@@ -115,3 +118,61 @@ class TestDatabaseManager:
         mock_connect.assert_called_once()  # Ensure the connection was made
         mock_cursor.execute.assert_called_once_with(GET_VENUE_INFO, ("test-venue",))
         mock_cursor.fetchone.assert_called_once()
+
+    @patch("mysql.connector.connect")
+    def test_get_active_subscriptions(self, mock_connect):
+        """Test converting subscription rows into Subscription objects."""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value.__enter__.return_value = mock_conn
+
+        mock_cursor.fetchall.return_value = [
+            ("a@example.com", 6066, "Una Pizza Napoletana", 2, date(2024, 12, 1), date(2024, 12, 7),
+             "4,5", timedelta(hours=18), timedelta(hours=20, minutes=30)),
+            ("b@example.com", 2492, "The Four Horsemen", 4, date(2024, 12, 1), date(2024, 12, 31),
+             None, None, None),
+        ]
+
+        db_manager = DatabaseManager()
+        subscriptions = db_manager.get_active_subscriptions()
+
+        mock_cursor.execute.assert_called_once_with(GET_ACTIVE_SUBSCRIPTIONS)
+        assert len(subscriptions) == 2
+        assert subscriptions[0].feed_key == (6066, 2)
+        assert subscriptions[0].start_date == "2024-12-01"
+        assert subscriptions[0].weekdays == {4, 5}
+        assert subscriptions[0].earliest_time == "18:00"
+        assert subscriptions[0].latest_time == "20:30"
+        assert subscriptions[1].weekdays is None
+        assert subscriptions[1].earliest_time is None
+
+    @patch("mysql.connector.connect")
+    def test_upsert_venues_in_one_transaction(self, mock_connect):
+        """Test that every venue is written by one executemany and one commit."""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        rows = [(6066, "Una Pizza Napoletana", "una-pizza-napoletana"), (2492, "Lucali", "lucali")]
+
+        assert DatabaseManager().upsert_venues(rows) == 2
+        assert DatabaseManager().upsert_venues([]) == 0
+
+        mock_cursor.executemany.assert_called_once_with(UPSERT_VENUE, rows)
+        mock_conn.commit.assert_called_once()
+
+    @patch("mysql.connector.connect")
+    def test_upsert_venues_rolls_back_on_error(self, mock_connect):
+        """Test that a failed batch leaves no partial writes."""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_cursor.executemany.side_effect = MySQLError("Deadlock")
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value.__enter__.return_value = mock_conn
+
+        with pytest.raises(MySQLError):
+            DatabaseManager().upsert_venues([(6066, "Una Pizza Napoletana", "una-pizza-napoletana")])
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
@@ -1,3 +1,4 @@
+import smtplib
 import unittest
 from unittest.mock import patch, Mock
 from src.resy_notifier.email_helper import EmailHelper
@@ -159,6 +160,94 @@ class TestEmailHelper(unittest.TestCase):
         # Assertions
         mock_smtp.assert_not_called()
 
+    @patch("smtplib.SMTP")
+    @patch("src.resy_notifier.email_helper.load_dotenv")
+    @patch.dict("os.environ", {
+        "SENDER_EMAIL": "sender@example.com",
+        "SENDER_PASSWORD": "password",
+        "RECIPIENT_EMAIL": "recipient@example.com",
+        "SMTP_SERVER": "smtp.example.com",
+        "SMTP_PORT": "587",
+    })
+    def test_check_and_notify_availability_recipient_override(self, mock_load_dotenv, mock_smtp):
+        """
+        Test check_and_notify_availability sends to the given recipient instead of RECIPIENT_EMAIL.
+        """
+        email_helper = EmailHelper()
+
+        mock_server = Mock()
+        mock_smtp.return_value.__enter__.return_value = mock_server
+
+        availabilities = [
+            Availability(date="2024-12-01", inventory=Inventory("available", "not available", "available")),
+        ]
+
+        email_helper.check_and_notify_availability("Test Venue", availabilities, "subscriber@example.com")
+
+        msg = mock_server.send_message.call_args[0][0]
+        self.assertEqual(msg["To"], "subscriber@example.com")
+
+
+    @patch("smtplib.SMTP")
+    @patch("src.resy_notifier.email_helper.load_dotenv")
+    @patch.dict("os.environ", {
+        "SENDER_EMAIL": "sender@example.com",
+        "SENDER_PASSWORD": "password",
+        "RECIPIENT_EMAIL": "recipient@example.com",
+        "SMTP_SERVER": "smtp.example.com",
+        "SMTP_PORT": "587",
+    })
+    def test_check_and_notify_availability_skips_dates_already_sent(self, mock_load_dotenv, mock_smtp):
+        """
+        Test check_and_notify_availability does not email the same available date twice.
+        """
+        email_helper = EmailHelper()
+
+        mock_server = Mock()
+        mock_smtp.return_value.__enter__.return_value = mock_server
+
+        availabilities = [
+            Availability(date="2024-12-01", inventory=Inventory("available", "not available", "available")),
+        ]
+
+        email_helper.check_and_notify_availability("Test Venue", availabilities, party_size=2)
+        email_helper.check_and_notify_availability("Test Venue", availabilities, party_size=2)
+        # A different party size is a different opening
+        email_helper.check_and_notify_availability("Test Venue", availabilities, party_size=4)
+
+        self.assertEqual(mock_server.send_message.call_count, 2)
+
+    @patch("smtplib.SMTP")
+    @patch("src.resy_notifier.email_helper.load_dotenv")
+    @patch.dict("os.environ", {
+        "SENDER_EMAIL": "sender@example.com",
+        "SENDER_PASSWORD": "password",
+        "RECIPIENT_EMAIL": "recipient@example.com",
+        "SMTP_SERVER": "smtp.example.com",
+        "SMTP_PORT": "587",
+    })
+    def test_failed_send_is_retried(self, mock_load_dotenv, mock_smtp):
+        """
+        Test a date whose email failed is not marked as sent, and goes out on the next flush.
+        """
+        email_helper = EmailHelper()
+
+        mock_server = Mock()
+        mock_server.send_message.side_effect = [smtplib.SMTPException("unavailable"), None]
+        mock_smtp.return_value.__enter__.return_value = mock_server
+
+        availabilities = [
+            Availability(date="2024-12-01", inventory=Inventory("available", "not available", "available")),
+        ]
+
+        with self.assertRaises(Exception):
+            email_helper.check_and_notify_availability("Test Venue", availabilities, party_size=2)
+        self.assertEqual(email_helper.flush_pending(), 1)
+        self.assertEqual(email_helper.flush_pending(), 0)
+
+        self.assertEqual(mock_server.send_message.call_count, 2)
+        self.assertIn("2024-12-01", mock_server.send_message.call_args[0][0].as_string())
+
 
 if __name__ == "__main__":
     unittest.main()
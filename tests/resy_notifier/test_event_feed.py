@@ -0,0 +1,140 @@
+import io
+import json
+import threading
+from unittest.mock import Mock
+import httpx
+from src.resy_notifier.event_feed import EventFeed, EventStreamServer, availability_events
+from src.resy_notifier.model.watch import Watch
+from src.resy_notifier.request_budget import BudgetAllocator
+from src.resy_notifier.watch_engine import WatchEngine
+from tests.resy_notifier.fakes import make_day
+
+
+def _events(count):
+    return availability_events(None, [make_day(f"2024-12-{day:02d}") for day in range(1, count + 1)],
+                               6066, "Una Pizza Napoletana", 2, observed_at=1733000000.0)
+
+
+class TestAvailabilityEvents:
+    def test_reports_changed_dates_only(self):
+        previous = [make_day("2024-12-01", "sold-out"), make_day("2024-12-02"), make_day("2024-12-03")]
+        current = [
+            make_day("2024-12-01"), make_day("2024-12-02"), make_day("2024-12-03", "sold-out"), make_day("2024-12-04"),
+        ]
+
+        events = availability_events(previous, current, 6066, "Una Pizza Napoletana", 4, observed_at=1.5)
+
+        assert [(event.date, event.old_status, event.new_status) for event in events] == [
+            ("2024-12-01", "sold-out", "available"),
+            ("2024-12-03", "available", "sold-out"),
+            ("2024-12-04", None, "available"),
+        ]
+        assert events[0].party_size == 4
+        assert events[0].observed_at == 1.5
+
+    def test_no_events_without_changes(self):
+        calendar = [make_day("2024-12-01"), make_day("2024-12-02", "sold-out")]
+
+        assert availability_events(calendar, list(calendar), 6066, "Una Pizza Napoletana", 2) == []
+
+
+class TestEventFeed:
+    def test_writes_ndjson(self):
+        stream = io.StringIO()
+        feed = EventFeed(stream)
+
+        feed.publish(_events(2))
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["id"] for line in lines] == [1, 2]
+        assert lines[0] == {
+            "id": 1, "venue_id": 6066, "venue_name": "Una Pizza Napoletana", "party_size": 2,
+            "date": "2024-12-01", "old_status": None, "new_status": "available", "observed_at": 1733000000.0,
+        }
+
+    def test_drops_slow_subscriber(self):
+        feed = EventFeed(max_buffer=4)
+        fast = feed.subscribe()
+        slow = feed.subscribe()
+
+        feed.publish(_events(3))
+        while fast.get(timeout=0) is not None:
+            pass
+        feed.publish(_events(3))
+
+        assert slow.closed
+        assert not fast.closed
+        assert feed.subscriber_count() == 1
+        assert feed.stats == {"published": 6, "dropped_subscribers": 1}
+        assert [fast.get(timeout=0).date for _ in range(3)] == ["2024-12-01", "2024-12-02", "2024-12-03"]
+
+    def test_broken_stream_does_not_stop_publishing(self):
+        stream = Mock()
+        stream.write.side_effect = BrokenPipeError()
+        feed = EventFeed(stream)
+        subscription = feed.subscribe()
+
+        feed.publish(_events(1))
+        feed.publish(_events(1))
+
+        assert stream.write.call_count == 1
+        assert subscription.get(timeout=0).id == 1
+
+
+class TestEventStreamServer:
+    def setup_method(self):
+        self.feed = EventFeed()
+        self.server = EventStreamServer(self.feed, port=0, heartbeat=0.05)
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        host, port = self.server.server_address
+        self.base_url = f"http://{host}:{port}"
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_streams_server_sent_events(self):
+        with httpx.stream("GET", f"{self.base_url}/events", timeout=5) as response:
+            assert response.headers["content-type"] == "text/event-stream"
+            lines = response.iter_lines()
+            assert next(lines) == ": connected"
+            self.feed.publish(_events(1))
+
+            event = {}
+            for line in lines:
+                if line.startswith(("id:", "event:", "data:")):
+                    field, value = line.split(": ", 1)
+                    event[field] = value
+                if "data" in event:
+                    break
+
+        assert event["id"] == "1"
+        assert event["event"] == "availability"
+        assert json.loads(event["data"])["date"] == "2024-12-01"
+
+    def test_stats(self):
+        self.feed.publish(_events(2))
+
+        assert httpx.get(f"{self.base_url}/stats").json() == {
+            "published": 2, "dropped_subscribers": 0, "subscribers": 0,
+        }
+
+
+class TestWatchEngineEvents:
+    def test_publishes_status_changes(self):
+        client = Mock()
+        client.fetch_availability.side_effect = [
+            [make_day("2024-12-01", "sold-out")],
+            [make_day("2024-12-01", "sold-out")],
+            [make_day("2024-12-01")],
+        ]
+        stream = io.StringIO()
+        engine = WatchEngine(client, BudgetAllocator(60), Mock(), sleep=Mock(), event_feed=EventFeed(stream))
+        engine.add_watch(Watch(6066, "Una Pizza Napoletana", 2, request_interval=0.01))
+
+        engine.run(loop_limit=3)
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [(event["old_status"], event["new_status"]) for event in events] == [
+            (None, "sold-out"), ("sold-out", "available"),
+        ]
@@ -0,0 +1,103 @@
+import os
+import tempfile
+from unittest.mock import MagicMock
+import pytest
+from src.resy_notifier.constants.queries import INDEX_EXISTS, INSERT_MIGRATION
+from src.resy_notifier.migration_runner import Migration, MigrationRunner, load_migrations
+
+
+def _write(directory, file_name, sql):
+    with open(os.path.join(directory, file_name), "w") as f:
+        f.write(sql)
+
+
+class TestMigration:
+    def test_statements_skip_comments(self):
+        migration = Migration(1, "indexes", "-- header\nCREATE INDEX A ON t (X); -- trailing\n\nCREATE INDEX B ON t (Y);\n")
+        assert migration.statements == ["CREATE INDEX A ON t (X)", "CREATE INDEX B ON t (Y)"]
+
+    def test_statements_keep_quoted_text(self):
+        migration = Migration(1, "data", "INSERT INTO t VALUES ('a -- b; c'); -- note\nUPDATE t SET X = 'it''s';")
+        assert migration.statements == ["INSERT INTO t VALUES ('a -- b; c')", "UPDATE t SET X = 'it''s'"]
+
+    def test_shipped_migrations_are_contiguous(self):
+        migrations = load_migrations()
+        assert [migration.version for migration in migrations] == list(range(1, len(migrations) + 1))
+        assert all(migration.statements for migration in migrations)
+
+    def test_duplicate_versions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            _write(directory, "001_a.sql", "SELECT 1;")
+            _write(directory, "1_b.sql", "SELECT 2;")
+            with pytest.raises(ValueError):
+                load_migrations(directory)
+
+
+class TestMigrationRunner:
+    def setup_method(self):
+        self.directory = tempfile.TemporaryDirectory()
+        _write(self.directory.name, "001_create_tables.sql", "CREATE TABLE a (X INT);\nCREATE TABLE b (Y INT);")
+        _write(self.directory.name, "002_add_indexes.sql", "CREATE INDEX IX_A ON a (X);")
+        _write(self.directory.name, "notes.txt", "not a migration")
+
+        self.conn = MagicMock()
+        self.cursor = self.conn.cursor.return_value
+        self.cursor.fetchone.return_value = (0,)
+        self.db_manager = MagicMock()
+        self.db_manager.connect.return_value.__enter__.return_value = self.conn
+        self.runner = MigrationRunner(self.db_manager, self.directory.name)
+
+    def teardown_method(self):
+        self.directory.cleanup()
+
+    def _executed(self):
+        return [c[0][0] for c in self.cursor.execute.call_args_list]
+
+    def test_applies_pending_in_order(self):
+        self.cursor.fetchall.return_value = []
+
+        applied = self.runner.migrate()
+
+        assert [migration.version for migration in applied] == [1, 2]
+        executed = self._executed()
+        assert executed[3:] == [
+            "CREATE TABLE a (X INT)", "CREATE TABLE b (Y INT)", INSERT_MIGRATION,
+            INDEX_EXISTS, "CREATE INDEX IX_A ON a (X)", INSERT_MIGRATION,
+        ]
+        assert self.cursor.execute.call_args_list[6][0][1] == (None, "a", "IX_A")
+        assert self.conn.commit.call_count == 2
+
+    def test_skips_existing_index(self):
+        first = load_migrations(self.directory.name)[0]
+        self.cursor.fetchall.return_value = [(1, first.checksum)]
+        self.cursor.fetchone.return_value = (1,)
+
+        applied = self.runner.migrate()
+
+        # Recorded as applied without failing on the duplicate index
+        assert [migration.version for migration in applied] == [2]
+        assert "CREATE INDEX IX_A ON a (X)" not in self._executed()
+        assert self._executed()[-1] == INSERT_MIGRATION
+
+    def test_skips_applied(self):
+        first = load_migrations(self.directory.name)[0]
+        self.cursor.fetchall.return_value = [(1, first.checksum)]
+
+        applied = self.runner.migrate()
+
+        assert [migration.version for migration in applied] == [2]
+        assert "CREATE TABLE a (X INT)" not in self._executed()
+
+    def test_dry_run_changes_nothing(self):
+        self.cursor.fetchall.return_value = []
+
+        assert [migration.name for migration in self.runner.migrate(dry_run=True)] == ["create_tables", "add_indexes"]
+        assert INSERT_MIGRATION not in self._executed()
+        self.conn.commit.assert_not_called()
+
+    def test_edited_migration_is_rejected(self):
+        self.cursor.fetchall.return_value = [(1, "0" * 64)]
+
+        with pytest.raises(ValueError) as e:
+            self.runner.pending()
+        assert "was changed after it was applied" in str(e.value)
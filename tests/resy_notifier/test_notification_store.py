@@ -0,0 +1,133 @@
+import os
+import tempfile
+from unittest.mock import patch
+import pytest
+from src.resy_notifier.notification_store import NotificationStore
+from tests.resy_notifier.fakes import FakeClock, make_day
+
+RECIPIENT = "a@example.com"
+
+
+def _send(store, venue, party_size, days, recipient=RECIPIENT):
+    """Admit and commit, as EmailHelper does around a successful send."""
+    admitted = store.admit(recipient, venue, party_size, days)
+    if admitted:
+        store.commit(recipient, venue, party_size, admitted)
+    return admitted
+
+
+class TestNotificationStore:
+    def setup_method(self):
+        self.clock = FakeClock(1_700_000_000.0)
+        self.store = NotificationStore(cooldown=3600, rearm_after=900, max_per_hour=None, clock=self.clock)
+
+    def _admit(self, *days, recipient=RECIPIENT, party_size=2):
+        return [day.date for day in _send(self.store, "Una Pizza Napoletana", party_size, list(days), recipient)]
+
+    def test_same_date_is_sent_once(self):
+        assert self._admit(make_day("2024-12-01"), make_day("2024-12-02", "sold-out")) == ["2024-12-01"]
+        assert self._admit(make_day("2024-12-01"), make_day("2024-12-02")) == ["2024-12-02"]
+        assert self._admit(make_day("2024-12-01"), make_day("2024-12-02")) == []
+        # Other recipients and party sizes are independent
+        assert self._admit(make_day("2024-12-01"), recipient="b@example.com") == ["2024-12-01"]
+        assert self._admit(make_day("2024-12-01"), party_size=4) == ["2024-12-01"]
+        assert self.store.stats["duplicates"] == 3
+
+    def test_staying_available_never_renotifies(self):
+        self._admit(make_day("2024-12-01"))
+        for _ in range(48):
+            self.clock.now += 300
+            assert self._admit(make_day("2024-12-01")) == []
+
+    def test_flapping_date_is_held_back_by_hysteresis(self):
+        self._admit(make_day("2024-12-01"))
+        # Comes back every 10 minutes for hours: never quiet for 15 minutes
+        for _ in range(12):
+            self.clock.now += 600
+            assert self._admit(make_day("2024-12-01")) == []
+
+        # Quiet for 15 minutes and past the cooldown: a real return
+        self.clock.now += 900
+        assert self._admit(make_day("2024-12-01")) == ["2024-12-01"]
+
+    def test_observed_days_keep_the_rearm_window_moving(self):
+        self._admit(make_day("2024-12-01"))
+        self.clock.now += 7200
+        self.store.observe(RECIPIENT, "Una Pizza Napoletana", 2, [make_day("2024-12-01"), make_day("2024-12-02")])
+        # Sold out for one poll, then back: it was seen a minute ago, so this is not a real return
+        self.clock.now += 60
+        assert self._admit(make_day("2024-12-01")) == []
+        # Days never sent to the recipient are not held back by observing them
+        assert self._admit(make_day("2024-12-02")) == ["2024-12-02"]
+
+    def test_cooldown_applies_after_a_quiet_period(self):
+        self._admit(make_day("2024-12-01"))
+        self.clock.now += 1800
+        assert self._admit(make_day("2024-12-01")) == []
+        self.clock.now += 3600
+        assert self._admit(make_day("2024-12-01")) == ["2024-12-01"]
+
+    def test_recipient_volume_is_bounded(self):
+        store = NotificationStore(max_per_hour=2, clock=self.clock)
+
+        sent = [_send(store, "Lucali", 2, [make_day(f"2024-12-0{n}")]) for n in range(1, 5)]
+        assert [len(days) for days in sent] == [1, 1, 0, 0]
+        # The queued 12-03 is offered again with 12-04 and held back once more
+        assert store.stats["rate_limited"] == 3
+        assert store.pending() == []
+
+        # Held-back dates are queued and offered again, without being reported again, once there is room
+        self.clock.now += 3600
+        assert store.pending() == [(RECIPIENT, "Lucali", 2)]
+        assert [day.date for day in _send(store, "Lucali", 2, [])] == ["2024-12-03", "2024-12-04"]
+        assert store.pending() == []
+
+    def test_failed_send_is_not_recorded(self):
+        admitted = self.store.admit(RECIPIENT, "Lucali", 2, [make_day("2024-12-01")])
+        # While being sent, a concurrent caller does not get the same date
+        assert self.store.admit(RECIPIENT, "Lucali", 2, [make_day("2024-12-01")]) == []
+
+        self.store.release(RECIPIENT, "Lucali", 2, admitted)
+
+        assert len(self.store) == 0
+        assert self.store.pending() == [(RECIPIENT, "Lucali", 2)]
+        assert [day.date for day in _send(self.store, "Lucali", 2, [])] == ["2024-12-01"]
+        assert self.store.stats["failed"] == 1
+
+    def test_stale_pending_dates_expire(self):
+        store = NotificationStore(max_per_hour=1, pending_ttl=600, clock=self.clock)
+        _send(store, "Lucali", 2, [make_day("2024-12-01")])
+        _send(store, "Lucali", 2, [make_day("2024-12-02")])
+
+        self.clock.now += 3600
+        assert store.pending() == []
+
+    def test_lru_bound(self):
+        store = NotificationStore(max_per_hour=None, max_entries=3, clock=self.clock)
+        for n in range(1, 6):
+            _send(store, "Lucali", 2, [make_day(f"2024-12-0{n}")])
+
+        assert len(store) == 3
+        # The oldest was forgotten
+        assert len(store.admit(RECIPIENT, "Lucali", 2, [make_day("2024-12-01")])) == 1
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "notifications.json")
+            _send(NotificationStore(path=path, clock=self.clock), "Lucali", 2, [make_day("2024-12-01")])
+
+            restarted = NotificationStore(path=path, clock=self.clock)
+            assert restarted.admit(RECIPIENT, "Lucali", 2, [make_day("2024-12-01")]) == []
+
+            # Entries that would be admitted again anyway are dropped on load
+            self.clock.now += 3600
+            assert len(NotificationStore(path=path, clock=self.clock)) == 0
+
+    def test_from_env(self):
+        with patch.dict(os.environ, {"NOTIFY_COOLDOWN_MINUTES": "30", "NOTIFY_MAX_PER_HOUR": "5"}):
+            store = NotificationStore.from_env()
+        assert (store.cooldown, store.rearm_after, store.max_per_hour, store.path) == (1800, 900, 5, None)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            NotificationStore(max_entries=0)
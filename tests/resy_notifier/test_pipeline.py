@@ -0,0 +1,133 @@
+import threading
+import time
+from unittest.mock import Mock
+import pytest
+from src.resy_notifier.model.availability import Availability, Inventory
+from src.resy_notifier.model.watch import Watch
+from src.resy_notifier.pipeline import Pipeline, PollItem, Stage, availability_pipeline, diff_stage
+
+
+def _calendar(*days):
+    return {"scheduled": [
+        {"date": date, "inventory": {"reservation": reservation, "event": "not available", "walk-in": "not available"}}
+        for date, reservation in days
+    ]}
+
+
+def _reject_eight(n):
+    if n == 8:
+        raise ValueError("eight")
+    return n
+
+
+class TestPipeline:
+    def test_items_flow_through_stages(self):
+        pipeline = Pipeline([
+            Stage("double", lambda n: n * 2, workers=3),
+            Stage("odd-out", lambda n: n if n % 4 == 0 else None),
+            Stage("fail-on-8", _reject_eight),
+        ])
+
+        assert sorted(pipeline.run(range(10))) == [0, 4, 12, 16]
+        report = pipeline.report()
+        assert report["double"]["processed"] == 10
+        assert report["odd-out"] == pytest.approx({"processed": 5, "dropped": 5, "errors": 0, "busy_seconds": 0}, abs=0.1)
+        assert report["fail-on-8"]["errors"] == 1
+
+    def test_slow_stage_applies_backpressure(self):
+        release = threading.Event()
+        pulled = []
+
+        def source():
+            for n in range(100):
+                pulled.append(n)
+                yield n
+
+        def slow(n):
+            release.wait()
+            return n
+
+        pipeline = Pipeline([Stage("fast", lambda n: n, buffer_size=2), Stage("slow", slow, buffer_size=2)],
+                            output_buffer=2)
+        results = pipeline.run(source())
+        consumer = threading.Thread(target=lambda: pulled.append(sum(1 for _ in results)))
+        consumer.start()
+        time.sleep(0.3)
+
+        # Bounded by the queues in front of each stage plus the items held by workers and the source
+        assert len(pulled) <= 8
+        release.set()
+        consumer.join()
+        assert pulled[-1] == 100
+
+    def test_closing_early_stops_the_stages(self):
+        pipeline = Pipeline([Stage("identity", lambda n: n, workers=2)])
+        results = pipeline.run(iter(range(1000000)))
+
+        assert next(results) is not None
+        results.close()
+        assert not [thread for thread in threading.enumerate() if thread.name.startswith("pipeline-identity")]
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            Pipeline([])
+        with pytest.raises(ValueError):
+            Stage("none", lambda n: n, workers=0)
+
+
+class TestAvailabilityPipeline:
+    def setup_method(self):
+        self.client = Mock()
+        self.email_helper = Mock()
+
+    def _item(self, venue_id=6066):
+        return PollItem(f"{venue_id}:2", venue_id, "Una Pizza Napoletana", 2, "2024-12-01", "2024-12-07")
+
+    def test_notifies_new_dates_that_pass_filters(self):
+        self.client.fetch_calendar.side_effect = [
+            _calendar(("2024-12-01", "sold-out"), ("2024-12-06", "sold-out")),
+            _calendar(("2024-12-01", "available"), ("2024-12-06", "available")),
+            _calendar(("2024-12-01", "available"), ("2024-12-06", "available")),
+        ]
+        recorded = []
+        pipeline = availability_pipeline(
+            self.client, self.email_helper, predicates=[lambda day: day.date == "2024-12-06"],
+            record=recorded.append, fetch_workers=1,
+        )
+
+        assert pipeline.drain([self._item(), self._item(), self._item()]) == 1
+
+        self.email_helper.check_and_notify_availability.assert_called_once()
+        venue_name, days, recipient = self.email_helper.check_and_notify_availability.call_args[0]
+        assert [day.date for day in days] == ["2024-12-06"]
+        assert [item.newly_available for item in recorded] == [days]
+
+    def test_fetch_errors_are_counted_on_the_watch(self):
+        watch = Mock(key="6066:2", venue_id=6066, venue_name="Una Pizza Napoletana", party_size=2,
+                     start_date=None, end_date=None, errors=0, polls=0)
+        self.client.fetch_calendar.side_effect = ValueError("Network error occurred: boom")
+        pipeline = availability_pipeline(self.client, self.email_helper)
+
+        assert pipeline.drain([PollItem.for_watch(watch)]) == 0
+        assert (watch.errors, watch.polls) == (1, 1)
+        assert pipeline.report()["fetch"]["errors"] == 1
+
+    def test_diff_uses_the_watch_snapshot(self):
+        watch = Watch(6066, "Una Pizza Napoletana", 2)
+        watch.last_snapshot = [Availability("2024-12-01", Inventory("available", "not available", "not available"))]
+        self.client.fetch_calendar.return_value = _calendar(("2024-12-01", "available"), ("2024-12-02", "available"))
+        pipeline = availability_pipeline(self.client, self.email_helper)
+
+        assert pipeline.drain([PollItem.for_watch(watch)]) == 1
+
+        days = self.email_helper.check_and_notify_availability.call_args[0][1]
+        assert [day.date for day in days] == ["2024-12-02"]
+        assert [day.date for day in watch.last_snapshot] == ["2024-12-01", "2024-12-02"]
+
+    def test_diff_drops_polls_older_than_one_already_seen(self):
+        older, newer = self._item(), self._item()
+        older.availability = newer.availability = []
+        diff = diff_stage().fn
+
+        assert diff(newer) is newer
+        assert diff(older) is None
@@ -0,0 +1,65 @@
+import os
+import pstats
+import signal
+import tracemalloc
+import pytest
+from src.resy_notifier.profiling import Profiler, StageTimer, timed
+
+
+class TestStageTimer:
+    def test_report_accumulates_and_resets(self):
+        ticks = iter([0.0, 0.5, 1.0, 1.25, 2.0, 2.5])
+        timer = StageTimer(clock=lambda: next(ticks))
+
+        with timer.stage("fetch"):
+            pass
+        with timer.stage("fetch"):
+            pass
+        with timed(timer, "notify"):
+            pass
+
+        assert timer.report() == {"fetch": 750.0, "notify": 500.0}
+        assert timer.report() == {}
+
+    def test_timed_without_timer(self):
+        with timed(None, "fetch"):
+            pass
+
+
+class TestProfiler:
+    def test_dumps_every_n_iterations(self, tmp_path):
+        profiler = Profiler(str(tmp_path), every=2)
+        profiler.start()
+        try:
+            for iteration in range(1, 5):
+                sum(range(1000))
+                profiler.end_iteration(iteration)
+        finally:
+            profiler.stop()
+
+        files = sorted(os.listdir(tmp_path))
+        assert files == [
+            "profile-000002.pstats", "profile-000004.pstats", "profile-final.pstats",
+            "tracemalloc-000002.snapshot", "tracemalloc-000004.snapshot", "tracemalloc-final.snapshot",
+        ]
+        assert pstats.Stats(str(tmp_path / "profile-000004.pstats")).total_calls > 0
+        assert tracemalloc.Snapshot.load(str(tmp_path / "tracemalloc-000002.snapshot")) is not None
+        assert not tracemalloc.is_tracing()
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="SIGUSR1 is not available")
+    def test_sigusr1_requests_dump(self, tmp_path):
+        profiler = Profiler(str(tmp_path), every=1000)
+        profiler.start()
+        try:
+            profiler.end_iteration(1)
+            assert not os.path.exists(tmp_path / "profile-000001.pstats")
+
+            os.kill(os.getpid(), signal.SIGUSR1)
+            profiler.end_iteration(2)
+            assert os.path.exists(tmp_path / "profile-000002.pstats")
+        finally:
+            profiler.stop()
+
+    def test_invalid_interval(self, tmp_path):
+        with pytest.raises(ValueError, match="Profile interval must be at least 1 iteration."):
+            Profiler(str(tmp_path), every=0)
@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from unittest.mock import Mock, patch
+import pytest
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.rate_limiter import SharedRateLimiter, fcntl
+from src.resy_notifier.simulation import CalendarTimeline, Simulator
+from tests.resy_notifier.fakes import FakeClock
+
+
+def _take_tokens(path, duration, results):
+    limiter = SharedRateLimiter(path, requests_per_minute=600, burst=2)
+    taken = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        if limiter.try_acquire() == 0:
+            taken += 1
+    results.put(taken)
+
+
+class TestSharedRateLimiter:
+    def setup_method(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "bucket")
+        self.clock = FakeClock(100.0)
+
+    def teardown_method(self):
+        self.directory.cleanup()
+
+    def _limiter(self, requests_per_minute=60, burst=2):
+        return SharedRateLimiter(self.path, requests_per_minute, burst, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_then_refill_rate(self):
+        limiter = self._limiter()
+
+        assert [limiter.try_acquire() for _ in range(3)] == [0, 0, pytest.approx(1.0)]
+        assert limiter.acquire()
+        assert self.clock.now == pytest.approx(101.0)
+        assert not limiter.acquire(timeout=0.5)
+
+    def test_instances_share_one_bucket(self):
+        first, second = self._limiter(), self._limiter()
+
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == 0
+        assert first.try_acquire() > 0
+        assert second.try_acquire() > 0
+
+    @pytest.mark.skipif(fcntl is None, reason="needs flock")
+    def test_enforced_across_processes(self):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        processes = [context.Process(target=_take_tokens, args=(self.path, 0.5, results)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        # 10 requests per second for 0.5s plus a burst of 2, however many processes compete
+        total = sum(results.get() for _ in processes)
+        assert 2 <= total <= 9
+
+    def test_acquire_overhead_is_microseconds(self):
+        limiter = SharedRateLimiter(self.path, requests_per_minute=1e9, burst=1_000_000)
+        started = time.perf_counter()
+        for _ in range(10000):
+            limiter.try_acquire()
+        assert (time.perf_counter() - started) / 10000 < 100e-6
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            SharedRateLimiter(self.path, 0)
+
+    def test_from_env(self):
+        with patch.dict(os.environ, {"RESY_SHARED_RPM": "120", "RESY_RATE_LIMIT_DIR": self.directory.name}):
+            limiter = SharedRateLimiter.from_env("test_api_key")
+        assert limiter.rate == 2.0
+        assert os.path.dirname(limiter.path) == self.directory.name
+        assert "test_api_key" not in limiter.path
+
+        with patch.dict(os.environ, {"RESY_SHARED_RPM": ""}):
+            assert SharedRateLimiter.from_env("test_api_key") is None
+
+    def test_client_limiter_can_be_turned_off(self):
+        env = {"RESY_SHARED_RPM": "120", "RESY_RATE_LIMIT_DIR": self.directory.name}
+        with patch.dict(os.environ, env):
+            client = ResyAPIClient("test_api_key", "https://api.resy.com/4", email_helper=Mock())
+            assert isinstance(client.rate_limiter, SharedRateLimiter)
+            client.close()
+            for disabled in (None, False):
+                client = ResyAPIClient("test_api_key", "https://api.resy.com/4", email_helper=Mock(),
+                                       rate_limiter=disabled)
+                assert client.rate_limiter is None
+            assert Simulator(CalendarTimeline([(0, {"scheduled": []})])).client.rate_limiter is None
+
+    @patch("httpx.Client.get")
+    def test_client_acquires_before_each_request(self, mock_get):
+        mock_get.return_value.json.return_value = {"scheduled": []}
+        limiter = Mock()
+        client = ResyAPIClient("test_api_key", "https://api.resy.com/4", email_helper=Mock(), rate_limiter=limiter)
+
+        client.fetch_availability(6066)
+        client.fetch_calendar(6066)
+
+        assert limiter.acquire.call_count == 2
@@ -0,0 +1,101 @@
+from collections import Counter
+import pytest
+from src.resy_notifier.request_budget import BudgetAllocator
+from tests.resy_notifier.fakes import FakeClock
+
+
+def _dispatch(allocator, clock, count):
+    """Take `count` slots, advancing the clock to each slot as a real engine would."""
+    dispatched = []
+    for _ in range(count):
+        key, at = allocator.next_slot()
+        clock.now = max(clock.now, at)
+        dispatched.append((key, at))
+    return dispatched
+
+
+class TestBudgetAllocator:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.allocator = BudgetAllocator(requests_per_minute=60, clock=self.clock)
+
+    def test_slots_are_shared_by_weight(self):
+        self.allocator.add("high", weight=3)
+        self.allocator.add("low-a", weight=1)
+        self.allocator.add("low-b", weight=1)
+
+        dispatched = _dispatch(self.allocator, self.clock, 500)
+
+        counts = Counter(key for key, _ in dispatched)
+        assert counts == {"high": 300, "low-a": 100, "low-b": 100}
+        # Slots are spaced by the global ceiling
+        assert [at for _, at in dispatched[:4]] == [0.0, 1.0, 2.0, 3.0]
+
+    def test_min_interval_caps_a_watch_and_frees_budget(self):
+        self.allocator.add("capped", weight=10, min_interval=10)
+        self.allocator.add("other", weight=1)
+
+        dispatched = _dispatch(self.allocator, self.clock, 100)
+
+        capped_times = [at for key, at in dispatched if key == "capped"]
+        assert all(later - earlier >= 10 for earlier, later in zip(capped_times, capped_times[1:]))
+        assert Counter(key for key, _ in dispatched) == {"capped": 10, "other": 90}
+
+    def test_waits_when_every_watch_is_inside_its_interval(self):
+        self.allocator.add("only", min_interval=30)
+
+        assert [at for _, at in _dispatch(self.allocator, self.clock, 3)] == [0.0, 30.0, 60.0]
+
+    def test_effective_intervals(self):
+        self.allocator.add("high", weight=3)
+        self.allocator.add("low", weight=1)
+        assert self.allocator.effective_intervals() == pytest.approx({"high": 4 / 3, "low": 4.0})
+
+        # A capped watch keeps its own interval and leaves the rest of the budget to others
+        self.allocator.add("slow", weight=100, min_interval=10)
+        intervals = self.allocator.effective_intervals()
+        assert intervals["slow"] == pytest.approx(10.0)
+        assert intervals["high"] == pytest.approx(1 / (0.9 * 3 / 4))
+
+    def test_cost_counts_every_request_of_a_poll(self):
+        self.allocator.add("group", cost=3)
+        self.allocator.add("single")
+
+        dispatched = _dispatch(self.allocator, self.clock, 4)
+
+        # The group's poll takes three slots, and both watches get the same share of requests
+        assert dispatched == [("group", 0.0), ("single", 3.0), ("single", 4.0), ("single", 5.0)]
+        assert self.allocator.effective_intervals() == pytest.approx({"group": 6.0, "single": 2.0})
+
+    def test_adapts_to_added_and_removed_watches(self):
+        self.allocator.add("a")
+        _dispatch(self.allocator, self.clock, 50)
+
+        # A late joiner starts at the current virtual time rather than replaying missed slots
+        self.allocator.add("b")
+        dispatched = _dispatch(self.allocator, self.clock, 10)
+        assert Counter(key for key, _ in dispatched) == {"a": 5, "b": 5}
+
+        self.allocator.remove("a")
+        assert self.allocator.effective_intervals() == {"b": 1.0}
+        assert {key for key, _ in _dispatch(self.allocator, self.clock, 5)} == {"b"}
+
+    def test_set_weight(self):
+        self.allocator.add("a")
+        self.allocator.add("b")
+        self.allocator.set_weight("a", 4)
+
+        counts = Counter(key for key, _ in _dispatch(self.allocator, self.clock, 100))
+        assert counts == {"a": 80, "b": 20}
+
+    def test_no_watches(self):
+        assert self.allocator.next_slot() is None
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            BudgetAllocator(0)
+        with pytest.raises(ValueError):
+            self.allocator.add("a", weight=0)
+        self.allocator.add("a")
+        with pytest.raises(ValueError, match="Watch a is already registered."):
+            self.allocator.add("a")
@@ -0,0 +1,118 @@
+import json
+import pytest
+from src.resy_notifier.simulation import (
+    CalendarTimeline, RecordingEmailHelper, Simulator, VirtualClock, synthetic_timeline
+)
+
+
+def _response(**days):
+    return {"scheduled": [
+        {"date": day.replace("_", "-")[1:], "inventory": {"reservation": status, "event": "", "walk-in": ""}}
+        for day, status in days.items()
+    ]}
+
+
+class TestCalendarTimeline:
+    def setup_method(self):
+        self.timeline = CalendarTimeline([
+            (0, _response(d2024_12_01="sold-out", d2024_12_02="sold-out")),
+            (100, _response(d2024_12_01="available", d2024_12_02="sold-out")),
+            (130, _response(d2024_12_01="sold-out", d2024_12_02="available")),
+        ])
+
+    def test_response_at(self):
+        assert self.timeline.response_at(99)["scheduled"][0]["inventory"]["reservation"] == "sold-out"
+        assert self.timeline.response_at(100)["scheduled"][0]["inventory"]["reservation"] == "available"
+        assert self.timeline.response_at(10_000)["scheduled"][1]["inventory"]["reservation"] == "available"
+
+    def test_openings(self):
+        assert self.timeline.openings() == [("2024-12-01", 100, 130), ("2024-12-02", 130, None)]
+
+    def test_load(self, tmp_path):
+        path = tmp_path / "timeline.ndjson"
+        path.write_text("\n".join(json.dumps({"at": at, "response": _response(d2024_12_01=status)})
+                                  for at, status in [(0, "sold-out"), (50, "available")]))
+        assert CalendarTimeline.load(str(path)).openings() == [("2024-12-01", 50, None)]
+
+    def test_empty(self):
+        with pytest.raises(ValueError, match="A timeline needs at least one calendar event."):
+            CalendarTimeline([])
+
+
+class TestSimulator:
+    def test_detection_delay_and_counts(self):
+        timeline = CalendarTimeline([
+            (0, _response(d2024_12_01="sold-out", d2024_12_02="sold-out")),
+            (100, _response(d2024_12_01="available", d2024_12_02="sold-out")),
+            (130, _response(d2024_12_01="sold-out", d2024_12_02="sold-out")),
+            (200, _response(d2024_12_01="sold-out", d2024_12_02="available")),
+        ])
+
+        report = Simulator(timeline).run(duration=300, request_interval=60)
+
+        # Polls at 0, 60, 120, 180, 240; the 12-01 opening is seen at 120, 12-02 at 240
+        assert report.requests == 5
+        assert report.detection_delays == [20, 40]
+        assert report.missed_openings == 0
+        assert report.notifications == 2
+
+    def test_notifications_go_through_the_notification_store(self):
+        timeline = CalendarTimeline([
+            (0, _response(d2024_12_01="sold-out")),
+            (100, _response(d2024_12_01="available")),
+        ])
+
+        report = Simulator(timeline).run(duration=3600, request_interval=60)
+
+        # Available on 58 polls, emailed once
+        assert report.notifications == 1
+
+    def test_missed_opening(self):
+        timeline = CalendarTimeline([
+            (0, _response(d2024_12_01="sold-out")),
+            (10, _response(d2024_12_01="available")),
+            (20, _response(d2024_12_01="sold-out")),
+        ])
+
+        report = Simulator(timeline).run(duration=120, request_interval=60)
+
+        assert report.detection_delays == []
+        assert report.missed_openings == 1
+
+    def test_client_path_matches_direct_path(self):
+        timeline = synthetic_timeline("2024-12-01", 7, 86400, openings_per_day=3, mean_open_seconds=900, seed=3)
+
+        direct = Simulator(timeline).run(86400, 120)
+        through_client = Simulator(timeline, use_client=True).run(86400, 120)
+
+        assert direct.requests == through_client.requests == 720
+        assert direct.detection_delays == through_client.detection_delays
+        assert direct.notifications == through_client.notifications
+
+    def test_strategy_and_memory_tracking(self):
+        timeline = synthetic_timeline("2024-12-01", 3, 3600, seed=1)
+        intervals = []
+
+        def strategy(now, availability):
+            intervals.append(now)
+            return 600
+
+        report = Simulator(timeline).run(3600, strategy, track_memory=True)
+
+        assert intervals == [0, 600, 1200, 1800, 2400, 3000]
+        assert report.simulated_seconds == 3600
+        assert report.peak_memory_bytes > 0
+
+
+def test_virtual_clock():
+    clock = VirtualClock()
+    clock.sleep(5)
+    clock.sleep(-1)
+    assert clock.time() == 5
+
+
+def test_recording_email_helper():
+    helper = RecordingEmailHelper(keep_messages=True)
+    helper.send_email("Subject", "Body", "someone@example.com")
+    assert helper.sent == 1
+    assert helper.messages == [("someone@example.com", "Subject", "Body")]
@@ -0,0 +1,72 @@
+import random
+import pytest
+from src.resy_notifier.model.availability import Availability, Inventory
+from src.resy_notifier.model.subscription import Subscription
+from src.resy_notifier.subscription_index import IntervalTree, SubscriptionIndex
+
+
+class TestIntervalTree:
+    def test_query_matches_brute_force(self):
+        """Test stabbing queries against a linear scan over random intervals."""
+        rng = random.Random(7)
+        intervals = []
+        for i in range(300):
+            start = rng.randint(0, 500)
+            intervals.append((start, start + rng.randint(0, 60), i))
+        tree = IntervalTree(intervals)
+
+        for point in range(-5, 570):
+            expected = sorted(item for start, end, item in intervals if start <= point <= end)
+            assert sorted(tree.query(point)) == expected
+
+    def test_empty_tree(self):
+        assert IntervalTree([]).query(10) == []
+
+
+class TestSubscriptionIndex:
+    def setup_method(self):
+        self.alice = Subscription("alice@example.com", 6066, 2, "2024-12-01", "2024-12-07", "Una Pizza Napoletana")
+        # Fridays only
+        self.bob = Subscription("bob@example.com", 6066, 2, "2024-12-05", "2024-12-20", weekdays={4})
+        self.carol = Subscription("carol@example.com", 6066, 4, "2024-12-01", "2024-12-31")
+        self.index = SubscriptionIndex([self.alice, self.bob, self.carol])
+
+    def test_feeds_cover_all_windows(self):
+        """Test that one feed is produced per (venue_id, party_size) spanning every subscriber."""
+        assert sorted(self.index.feeds()) == [
+            (6066, 2, "2024-12-01", "2024-12-20"),
+            (6066, 4, "2024-12-01", "2024-12-31"),
+        ]
+
+    def test_subscribers_for(self):
+        """Test date window and weekday filtering."""
+        assert set(self.index.subscribers_for(6066, 2, "2024-12-06")) == {self.alice, self.bob}
+        assert set(self.index.subscribers_for(6066, 2, "2024-12-05")) == {self.alice}
+        assert self.index.subscribers_for(6066, 2, "2024-12-13") == [self.bob]
+        assert self.index.subscribers_for(6066, 2, "2024-12-14") == []
+        assert self.index.subscribers_for(9999, 2, "2024-12-05") == []
+
+    def test_match(self):
+        """Test that a diff is fanned out to the interested recipients only."""
+        days = [
+            Availability("2024-12-02", Inventory("available", "", "")),
+            Availability("2024-12-06", Inventory("available", "", "")),
+        ]
+        matches = self.index.match(6066, 2, days)
+
+        assert [day.date for day in matches["alice@example.com"]] == ["2024-12-02", "2024-12-06"]
+        assert [day.date for day in matches["bob@example.com"]] == ["2024-12-06"]
+        assert "carol@example.com" not in matches
+
+    def test_remove(self):
+        """Test that removal rebuilds the feed's tree and drops empty feeds."""
+        self.index.remove(self.carol)
+        assert len(self.index) == 2
+        assert [feed[1] for feed in self.index.feeds()] == [2]
+
+        with pytest.raises(ValueError):
+            self.index.remove(self.carol)
+
+    def test_venue_name(self):
+        assert self.index.venue_name(6066, 2) == "Una Pizza Napoletana"
+        assert self.index.venue_name(6066, 4) == ""
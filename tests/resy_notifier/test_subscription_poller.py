@@ -0,0 +1,100 @@
+from unittest.mock import Mock
+from src.resy_notifier.model.slot import Slot
+from src.resy_notifier.model.subscription import Subscription
+from src.resy_notifier.subscription_index import SubscriptionIndex
+from src.resy_notifier.subscription_poller import SubscriptionPoller
+from tests.resy_notifier.fakes import make_day
+
+
+class TestSubscriptionPoller:
+    def setup_method(self):
+        self.index = SubscriptionIndex([
+            Subscription("alice@example.com", 6066, 2, "2024-12-01", "2024-12-03", "Una Pizza Napoletana"),
+            Subscription("bob@example.com", 6066, 2, "2024-12-02", "2024-12-05", "Una Pizza Napoletana"),
+        ])
+        self.client = Mock()
+        self.email_helper = Mock()
+        self.poller = SubscriptionPoller(self.client, self.index, self.email_helper)
+
+    def test_one_request_per_feed(self):
+        """Test that two subscribers on the same feed share a single request."""
+        self.client.fetch_availability.return_value = [make_day("2024-12-02", "available")]
+
+        notifications = self.poller.poll_once()
+
+        self.client.fetch_availability.assert_called_once_with(6066, 2, "2024-12-01", "2024-12-05")
+        assert notifications == 2
+        recipients = sorted(c.args[2] for c in self.email_helper.check_and_notify_availability.call_args_list)
+        assert recipients == ["alice@example.com", "bob@example.com"]
+
+    def test_only_new_availability_is_notified(self):
+        """Test that a day already seen as available is not notified again."""
+        self.client.fetch_availability.side_effect = [
+            [make_day("2024-12-01", "available"), make_day("2024-12-04", "sold-out")],
+            [make_day("2024-12-01", "available"), make_day("2024-12-04", "available")],
+        ]
+
+        self.poller.poll_once()
+        self.email_helper.reset_mock()
+        self.poller.poll_once()
+
+        days = self.email_helper.check_and_notify_availability.call_args.args[1]
+        assert self.email_helper.check_and_notify_availability.call_count == 1
+        assert self.email_helper.check_and_notify_availability.call_args.args[2] == "bob@example.com"
+        assert [day.date for day in days] == ["2024-12-04"]
+
+    def test_fetch_error_skips_feed(self):
+        """Test that a failing feed does not stop the round."""
+        self.client.fetch_availability.side_effect = ValueError("Network error occurred: boom")
+
+        assert self.poller.poll_once() == 0
+        self.email_helper.check_and_notify_availability.assert_not_called()
+
+    def test_restore_state_suppresses_already_notified_days(self):
+        """Test that a restarted poller does not re-notify dates from its checkpoint."""
+        self.client.fetch_availability.return_value = [make_day("2024-12-02", "available")]
+        self.poller.poll_once()
+        state = self.poller.export_state()
+        assert state["6066:2"].available_dates == ["2024-12-02"]
+
+        restarted = SubscriptionPoller(self.client, self.index, self.email_helper)
+        restarted.restore_state(state)
+        self.email_helper.reset_mock()
+
+        assert restarted.poll_once() == 0
+        self.email_helper.check_and_notify_availability.assert_not_called()
+
+    def test_time_filter_uses_slots(self):
+        """Test that a subscriber with a time window is only notified of days with a slot inside it."""
+        self.index.add(Subscription(
+            "carol@example.com", 6066, 2, "2024-12-01", "2024-12-05", "Una Pizza Napoletana",
+            earliest_time="19:00", latest_time="21:00",
+        ))
+        self.client.fetch_availability.return_value = [
+            make_day("2024-12-02", "available"), make_day("2024-12-04", "available"),
+        ]
+        self.client.find_slots.side_effect = lambda venue_id, day, party_size: {
+            "2024-12-02": [Slot("a", "2024-12-02 17:30:00")],
+            "2024-12-04": [Slot("b", "2024-12-04 17:30:00"), Slot("c", "2024-12-04 19:30:00")],
+        }[day]
+
+        self.poller.poll_once()
+
+        notified = {
+            c.args[2]: [day.date for day in c.args[1]]
+            for c in self.email_helper.check_and_notify_availability.call_args_list
+        }
+        assert notified["carol@example.com"] == ["2024-12-04"]
+        assert notified["bob@example.com"] == ["2024-12-02", "2024-12-04"]
+        # Slots are fetched once per day, and only because of the time filter
+        assert self.client.find_slots.call_count == 2
+
+    def test_time_filter_without_slots_notifies(self):
+        """Test that a day is still notified when its slots cannot be fetched."""
+        self.index.add(Subscription(
+            "carol@example.com", 6066, 2, "2024-12-01", "2024-12-05", earliest_time="19:00",
+        ))
+        self.client.fetch_availability.return_value = [make_day("2024-12-04", "available")]
+        self.client.find_slots.side_effect = ValueError("Network error occurred: boom")
+
+        assert self.poller.poll_once() == 2
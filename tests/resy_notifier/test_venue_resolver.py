@@ -0,0 +1,90 @@
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import Mock, patch
+import pytest
+from src.resy_notifier.venue_resolver import VenueResolver
+from tests.resy_notifier.fakes import FakeClock
+
+VENUES = {
+    "una-pizza-napoletana": (6066, "Una Pizza Napoletana"),
+    "lucali": (2492, "Lucali"),
+}
+
+
+class TestVenueResolver:
+    def setup_method(self):
+        self.clock = FakeClock(1000.0)
+        self.client = Mock()
+        self.lookups = []
+        self.lock = threading.Lock()
+
+        def find_venue(url_name, location):
+            with self.lock:
+                self.lookups.append(url_name)
+            if url_name == "flaky":
+                raise ValueError("Network error occurred: boom")
+            return VENUES.get(url_name)
+
+        self.client.find_venue.side_effect = find_venue
+        self.db_manager = Mock()
+        self.resolver = VenueResolver(self.client, self.db_manager, negative_ttl=60, clock=self.clock)
+
+    def test_resolves_and_upserts_once(self):
+        result = self.resolver.resolve(["una-pizza-napoletana", "lucali", "closed-place", "flaky", "lucali", " "])
+
+        assert result.resolved == VENUES
+        assert result.not_found == ["closed-place"]
+        assert list(result.failed) == ["flaky"]
+        self.db_manager.upsert_venues.assert_called_once_with([
+            (6066, "Una Pizza Napoletana", "una-pizza-napoletana"), (2492, "Lucali", "lucali"),
+        ])
+        assert sorted(self.lookups) == ["closed-place", "flaky", "lucali", "una-pizza-napoletana"]
+
+    def test_negative_cache_expires(self):
+        self.resolver.resolve(["closed-place", "flaky"])
+        self.lookups.clear()
+
+        result = self.resolver.resolve(["closed-place", "flaky"])
+        assert result.skipped == ["closed-place"]
+        # Errors are not cached
+        assert self.lookups == ["flaky"]
+
+        self.clock.now += 61
+        self.lookups.clear()
+        self.resolver.resolve(["closed-place"])
+        assert self.lookups == ["closed-place"]
+
+    def test_lookups_run_concurrently(self):
+        def slow_find(url_name, location):
+            time.sleep(0.1)
+            return (1, url_name)
+        self.client.find_venue.side_effect = slow_find
+
+        started = time.perf_counter()
+        result = self.resolver.resolve([f"venue-{n}" for n in range(16)])
+
+        assert len(result.resolved) == 16
+        assert time.perf_counter() - started < 0.5
+
+    def test_negative_cache_persists(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "venue-cache.json")
+            VenueResolver(self.client, self.db_manager, cache_path=path, clock=self.clock).resolve(["closed-place"])
+
+            restarted = VenueResolver(self.client, self.db_manager, cache_path=path, clock=self.clock)
+            assert restarted.resolve(["closed-place"]).skipped == ["closed-place"]
+
+    def test_failed_cache_write_keeps_previous_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "venue-cache.json")
+            VenueResolver(self.client, self.db_manager, cache_path=path, clock=self.clock).resolve(["closed-place"])
+
+            with patch("src.resy_notifier.checkpoint.os.replace", side_effect=OSError("disk full")):
+                with pytest.raises(OSError):
+                    VenueResolver(self.client, self.db_manager, cache_path=path, clock=self.clock).resolve(["gone"])
+
+            assert os.listdir(directory) == ["venue-cache.json"]
+            restarted = VenueResolver(self.client, self.db_manager, cache_path=path, clock=self.clock)
+            assert restarted.resolve(["closed-place"]).skipped == ["closed-place"]
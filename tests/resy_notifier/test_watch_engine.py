@@ -0,0 +1,379 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+import pytest
+from src.resy_notifier.api_client import ResyAPIClient
+from src.resy_notifier.checkpoint import CheckpointStore
+from src.resy_notifier.chunking import ChunkSizer
+from src.resy_notifier.model.watch import GroupWatch, Watch
+from src.resy_notifier.notification_store import NotificationStore
+from src.resy_notifier.request_budget import BudgetAllocator
+from src.resy_notifier.simulation import RecordingEmailHelper
+from src.resy_notifier.watch_engine import WatchEngine
+from tests.resy_notifier.fakes import FakeClock, make_day
+
+
+class TestWatchEngine:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.client = Mock()
+        self.email_helper = Mock()
+        self.engine = WatchEngine(
+            self.client, BudgetAllocator(60, clock=self.clock), self.email_helper, sleep=self.clock.sleep
+        )
+        self.high = Watch(6066, "Una Pizza Napoletana", 2, "2024-12-01", "2024-12-07", request_interval=1, weight=3)
+        self.low = Watch(2492, "The Four Horsemen", 2, "2024-12-01", "2024-12-07", request_interval=1, weight=1)
+
+    def test_polls_by_weight_under_budget(self):
+        self.client.fetch_availability.return_value = []
+        self.engine.add_watch(self.high)
+        self.engine.add_watch(self.low)
+
+        self.engine.run(loop_limit=40)
+
+        assert (self.high.polls, self.low.polls) == (30, 10)
+        # 40 polls at 60 requests per minute take 39 seconds of waiting
+        assert self.clock.now == 39
+        assert self.engine.effective_intervals() == pytest.approx({self.high.key: 4 / 3, self.low.key: 4.0})
+
+    def test_notifies_only_new_dates(self):
+        self.client.fetch_availability.side_effect = [
+            [make_day("2024-12-01", "sold-out")],
+            [make_day("2024-12-01")],
+            [make_day("2024-12-01")],
+        ]
+        self.engine.add_watch(self.high)
+
+        self.engine.run(loop_limit=3)
+
+        self.email_helper.check_and_notify_availability.assert_called_once()
+        venue_name, days = self.email_helper.check_and_notify_availability.call_args[0]
+        assert venue_name == "Una Pizza Napoletana"
+        assert [day.date for day in days] == ["2024-12-01"]
+
+    def test_date_that_stays_open_is_not_renotified_after_a_blip(self):
+        email_helper = RecordingEmailHelper()
+        email_helper.notification_store = NotificationStore(
+            cooldown=3600, rearm_after=900, max_per_hour=None, clock=self.clock
+        )
+        engine = WatchEngine(self.client, BudgetAllocator(60, clock=self.clock), email_helper)
+        # Open for two hours, sold out for one poll, then open again
+        calendars = (
+            [[make_day("2024-12-01")]] * 120 + [[make_day("2024-12-01", "sold-out")]] + [[make_day("2024-12-01")]] * 5
+        )
+        self.client.fetch_availability.side_effect = calendars
+
+        for _ in calendars:
+            engine.poll(self.high)
+            self.clock.now += 60
+
+        assert email_helper.sent == 1
+
+    def test_errors_do_not_stop_the_engine(self):
+        self.client.fetch_availability.side_effect = [ValueError("Network error occurred: boom"), []]
+        self.engine.add_watch(self.high)
+
+        self.engine.run(loop_limit=2)
+
+        assert self.high.errors == 1
+        assert self.high.polls == 2
+        assert self.high.last_latency_ms is not None
+
+    def test_pause_gives_budget_to_others(self):
+        self.client.fetch_availability.return_value = []
+        self.engine.add_watch(self.high)
+        self.engine.add_watch(self.low)
+
+        self.engine.pause(self.high.key)
+        self.engine.run(loop_limit=4)
+        assert (self.high.polls, self.low.polls) == (0, 4)
+
+        # Weights can change while paused, and the snapshot is kept for resume
+        self.engine.set_weight(self.high.key, 1)
+        self.engine.resume(self.high.key)
+        self.engine.run(loop_limit=4)
+        assert (self.high.polls, self.low.polls) == (2, 6)
+
+    def test_idles_when_everything_is_paused(self):
+        self.engine.add_watch(self.high)
+        self.engine.pause(self.high.key)
+
+        self.engine.run(loop_limit=3)
+
+        assert self.high.polls == 0
+        assert self.clock.now == 3
+
+    def test_add_and_remove(self):
+        self.engine.add_watch(self.high)
+        with pytest.raises(ValueError):
+            self.engine.add_watch(self.high)
+
+        assert self.engine.remove_watch(self.high.key) is self.high
+        assert self.engine.run_once() is None
+        with pytest.raises(KeyError):
+            self.engine.remove_watch(self.high.key)
+
+
+class TestWatchEngineCheckpoint:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.client = Mock()
+        self.email_helper = Mock()
+
+    def _engine(self, store):
+        return WatchEngine(
+            self.client, BudgetAllocator(60, clock=self.clock), self.email_helper, sleep=self.clock.sleep,
+            checkpoint=store,
+        )
+
+    def _watch(self):
+        return Watch(6066, "Una Pizza Napoletana", 2, "2024-12-01", "2024-12-07", request_interval=60)
+
+    def test_restart_resumes_notified_dates_and_schedule(self, tmp_path):
+        store = CheckpointStore(str(tmp_path / "checkpoint.json"))
+        self.client.fetch_availability.return_value = [make_day("2024-12-01"), make_day("2024-12-02", "sold-out")]
+        engine = self._engine(store)
+        engine.add_watch(self._watch())
+        engine.run(loop_limit=1)
+        assert self.email_helper.check_and_notify_availability.call_count == 1
+
+        restarted = self._engine(store)
+        watch = self._watch()
+        restarted.add_watch(watch)
+        started = self.clock.now
+        restarted.run(loop_limit=1)
+
+        # Waits for the checkpointed due time, and the date notified before the restart is not sent again
+        assert self.clock.now - started == pytest.approx(60, abs=1)
+        assert watch.polls == 1
+        assert self.email_helper.check_and_notify_availability.call_count == 1
+
+    def test_group_members_and_unclaimed_states_are_kept(self, tmp_path):
+        store = CheckpointStore(str(tmp_path / "checkpoint.json"))
+        group = GroupWatch("Pizza", [(6066, "Una Pizza Napoletana"), (2492, "Lucali")], 2, "2024-12-01",
+                           "2024-12-07", request_interval=60, stop_on_match=False)
+        group.snapshots[2492] = [make_day("2024-12-01")]
+        engine = self._engine(store)
+        engine.add_watch(group)
+        engine.add_watch(self._watch())
+        engine.save_checkpoint()
+
+        restarted = self._engine(store)
+        resumed = GroupWatch("Pizza", group.members, 2, "2024-12-01", "2024-12-07", request_interval=60)
+        restarted.add_watch(resumed)
+        restarted.save_checkpoint()
+
+        assert [day.date for day in resumed.snapshots[2492]] == ["2024-12-01"]
+        # The single watch was not added this time, but keeps its state for when it is
+        assert self._watch().key in store.load()
+
+
+class TestChunkedWatchEngine:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.client = Mock()
+        self.client.chunk_sizer = ChunkSizer(initial_days=7)
+        self.email_helper = Mock()
+        self.engine = WatchEngine(
+            self.client, BudgetAllocator(60, clock=self.clock), self.email_helper, sleep=self.clock.sleep,
+            chunked=True,
+        )
+        self.watch = Watch(6066, "Una Pizza Napoletana", 2, "2024-12-01", "2025-02-28", request_interval=1)
+
+    def test_notifies_each_chunk_as_it_arrives(self):
+        notified = []
+        self.email_helper.check_and_notify_availability.side_effect = (
+            lambda venue_name, days, party_size: notified.append([day.date for day in days])
+        )
+
+        def chunks(*args):
+            yield [make_day("2024-12-01")]
+            # The near-term email has gone out before the later chunk is even read
+            assert notified == [["2024-12-01"]]
+            yield [make_day("2025-02-01"), make_day("2025-02-02", "sold-out")]
+        self.client.iter_availability_chunks.side_effect = chunks
+        self.engine.add_watch(self.watch)
+
+        self.engine.run(loop_limit=1)
+
+        assert notified == [["2024-12-01"], ["2025-02-01"]]
+        assert [day.date for day in self.watch.last_snapshot] == ["2024-12-01", "2025-02-01", "2025-02-02"]
+
+    def test_failed_chunk_does_not_replay_earlier_chunks(self):
+        def failing_chunks(*args):
+            yield [make_day("2024-12-01")]
+            raise ValueError("Network error occurred: boom")
+        self.client.iter_availability_chunks.side_effect = [
+            failing_chunks(), iter([[make_day("2024-12-01")], [make_day("2025-02-01")]]),
+        ]
+        self.engine.add_watch(self.watch)
+
+        self.engine.run(loop_limit=2)
+
+        notified = [
+            [day.date for day in c.args[1]] for c in self.email_helper.check_and_notify_availability.call_args_list
+        ]
+        assert notified == [["2024-12-01"], ["2025-02-01"]]
+        assert self.watch.errors == 1
+
+    def test_budget_counts_every_chunk(self):
+        self.engine.add_watch(self.watch)
+
+        # 90 days in 7-day chunks
+        assert self.engine.allocator.effective_intervals()[self.watch.key] == pytest.approx(13)
+
+    def test_budget_follows_the_chunk_size(self):
+        self.client.iter_availability_chunks.return_value = iter([[]])
+        self.engine.add_watch(self.watch)
+        self.client.chunk_sizer = ChunkSizer(initial_days=30)
+
+        self.engine.run(loop_limit=1)
+
+        assert self.engine.allocator.effective_intervals()[self.watch.key] == pytest.approx(3)
+
+    def test_budget_counts_every_chunk_of_every_group_member(self):
+        group = GroupWatch("Pizza", [(6066, "Una Pizza Napoletana"), (2492, "Lucali")], 2, "2024-12-01", "2024-12-14",
+                           request_interval=1)
+        self.engine.add_watch(group)
+
+        # Two members, two 7-day chunks each
+        assert self.engine.allocator.effective_intervals()[group.key] == pytest.approx(4)
+
+
+    def test_group_is_notified_at_the_first_chunk_with_new_dates(self):
+        group = GroupWatch("Pizza", [(6066, "Una Pizza Napoletana"), (2492, "Lucali"), (834, "L'Industrie")], 2,
+                           "2024-12-01", "2025-02-28", request_interval=1)
+        chunks = {
+            6066: [[make_day("2024-12-01", "sold-out")], [make_day("2025-02-01", "sold-out")]],
+            2492: [[make_day("2024-12-01")], [make_day("2025-02-01")]],
+        }
+        fetched = []
+
+        def iter_chunks(venue_id, *args):
+            for chunk in chunks[venue_id]:
+                fetched.append((venue_id, chunk[0].date))
+                yield chunk
+        self.client.iter_availability_chunks.side_effect = iter_chunks
+        self.engine.add_watch(group)
+
+        self.engine.run(loop_limit=1)
+
+        # Lucali's later chunk and L'Industrie are never requested
+        assert fetched == [(6066, "2024-12-01"), (6066, "2025-02-01"), (2492, "2024-12-01")]
+        group_name, matches = self.email_helper.notify_group_availability.call_args[0]
+        assert [(venue_name, [day.date for day in days]) for venue_name, days in matches] == [
+            ("Lucali", ["2024-12-01"])
+        ]
+
+
+class TestGroupWatch:
+    MEMBERS = [(6066, "Una Pizza Napoletana"), (2492, "Lucali"), (834, "L'Industrie"), (5769, "Scarr's")]
+
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.client = ResyAPIClient("test_api_key", "https://api.resy.com/4")
+        self.email_helper = Mock()
+        self.engine = WatchEngine(
+            self.client, BudgetAllocator(600, clock=self.clock), self.email_helper, sleep=self.clock.sleep
+        )
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def teardown_method(self):
+        self.client.close()
+
+    def _fetch(self, open_venues):
+        def fetch(venue_id, party_size, start_date, end_date):
+            with self.lock:
+                self.fetched.append(venue_id)
+            return [make_day("2024-12-06", "available" if venue_id in open_venues else "sold-out")]
+        return fetch
+
+    def test_stops_at_first_available_venue(self):
+        group = GroupWatch("Pizza", self.MEMBERS, 4, "2024-12-06", "2024-12-06", concurrency=1)
+        self.engine.add_watch(group)
+
+        with patch.object(self.client, "fetch_availability", side_effect=self._fetch({2492})):
+            self.engine.run(loop_limit=1)
+
+        # Members after the match are cancelled before they are requested
+        assert self.fetched == [6066, 2492]
+        assert group.satisfied
+        assert group.key not in self.engine.watches
+        self.email_helper.notify_group_availability.assert_called_once()
+        group_name, matches = self.email_helper.notify_group_availability.call_args[0]
+        assert group_name == "Pizza"
+        assert [(venue_name, [day.date for day in days]) for venue_name, days in matches] == [
+            ("Lucali", ["2024-12-06"])
+        ]
+
+    def test_notifies_before_waiting_for_requests_in_flight(self):
+        group = GroupWatch("Pizza", self.MEMBERS[:2], 4, "2024-12-06", "2024-12-06", concurrency=2)
+        self.engine.add_watch(group)
+        slow_started = threading.Event()
+        release = threading.Event()
+        slow_finished = threading.Event()
+
+        def fetch(venue_id, party_size, start_date, end_date):
+            if venue_id == 2492:
+                slow_started.set()
+                release.wait(5)
+                slow_finished.set()
+                return [make_day("2024-12-06", "sold-out")]
+            slow_started.wait(5)
+            return [make_day("2024-12-06")]
+
+        def notify(group_name, matches, party_size):
+            assert not slow_finished.is_set()
+            release.set()
+        self.email_helper.notify_group_availability.side_effect = notify
+
+        with patch.object(self.client, "fetch_availability", side_effect=fetch):
+            self.engine.run(loop_limit=1)
+
+        self.email_helper.notify_group_availability.assert_called_once()
+        assert slow_finished.is_set()
+
+    def test_prefers_earlier_members_that_complete_later(self):
+        group = GroupWatch("Pizza", self.MEMBERS[:2], 4, "2024-12-06", "2024-12-06", concurrency=2)
+        self.engine.add_watch(group)
+        faster_finished = threading.Event()
+
+        def fetch(venue_id, party_size, start_date, end_date):
+            if venue_id == 6066:
+                # Slower than Lucali, and both are available
+                faster_finished.wait(5)
+                time.sleep(0.05)
+            else:
+                faster_finished.set()
+            return [make_day("2024-12-06")]
+
+        with patch.object(self.client, "fetch_availability", side_effect=fetch):
+            self.engine.run(loop_limit=1)
+
+        group_name, matches = self.email_helper.notify_group_availability.call_args[0]
+        assert [venue_name for venue_name, _ in matches] == ["Una Pizza Napoletana"]
+        # Lucali was not diffed, so its opening is still new if the group keeps polling
+        assert 2492 not in group.snapshots
+
+    def test_keeps_polling_until_a_venue_opens(self):
+        group = GroupWatch("Pizza", self.MEMBERS, 4, "2024-12-06", "2024-12-06", concurrency=4)
+        self.engine.add_watch(group)
+
+        with patch.object(self.client, "fetch_availability", side_effect=self._fetch(set())):
+            self.engine.run(loop_limit=2)
+
+        assert sorted(self.fetched) == sorted([venue_id for venue_id, _ in self.MEMBERS] * 2)
+        assert group.polls == 2
+        assert not group.satisfied
+        self.email_helper.notify_group_availability.assert_not_called()
+
+    def test_errors_are_counted_per_member(self):
+        group = GroupWatch("Pizza", self.MEMBERS[:2], 4, "2024-12-06", "2024-12-06", stop_on_match=False)
+        self.engine.add_watch(group)
+
+        with patch.object(self.client, "fetch_availability", side_effect=ValueError("Network error occurred: boom")):
+            self.engine.run(loop_limit=1)
+
+        assert group.errors == 2
+        assert group.key in self.engine.watches